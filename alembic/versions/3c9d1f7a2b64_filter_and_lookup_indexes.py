@@ -0,0 +1,100 @@
+"""filter and lookup indexes
+
+Revision ID: 3c9d1f7a2b64
+Revises: 65f3ee7f059e
+Create Date: 2026-10-18 10:12:31.402217
+
+"""
+
+from typing import (
+    Sequence,
+    Union,
+)
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9d1f7a2b64"
+down_revision: Union[str, None] = "65f3ee7f059e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# databases bootstrapped by create_all() already have them, hence if_not_exists
+INDEXES = [
+    (
+        "ix_policy_created_at_id",
+        "policy",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    ),
+    (
+        "ix_policy_effective_date_expiration_date",
+        "policy",
+        ["effective_date", "expiration_date"],
+    ),
+    ("ix_policy_expiration_date", "policy", ["expiration_date"]),
+    ("ix_policy_status_effective_date", "policy", ["status", "effective_date"]),
+    ("ix_policy_status_expiration_date", "policy", ["status", "expiration_date"]),
+    ("ix_policy_type_effective_date", "policy", ["type", "effective_date"]),
+    ("ix_policy_type_expiration_date", "policy", ["type", "expiration_date"]),
+    ("ix_policy_policyholder_id", "policy", ["policyholder_id"]),
+    ("ix_person_id_number", "person", ["id_number"]),
+    ("ix_address_person_id", "address", ["person_id"]),
+    ("ix_premium_policy_id", "premium", ["policy_id"]),
+    ("ix_coverage_policy_id", "coverage", ["policy_id"]),
+]
+
+
+def _drop_invalid_indexes(names: list[str]) -> None:
+    """Drop what a failed concurrent build left, if_not_exists would skip it."""
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT index.relname FROM pg_index
+            JOIN pg_class AS index ON index.oid = pg_index.indexrelid
+            WHERE NOT pg_index.indisvalid AND index.relname = ANY(:names)
+            """
+        ),
+        {"names": names},
+    )
+    for (name,) in invalid:
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # built without blocking writes to the tables, which a transaction forbids
+    with op.get_context().autocommit_block():
+        _drop_invalid_indexes(
+            [name for name, _, _ in INDEXES] + ["ix_policy_policy_number_trgm"]
+        )
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True
+            )
+        op.create_index(
+            "ix_policy_policy_number_trgm",
+            "policy",
+            ["policy_number"],
+            postgresql_using="gin",
+            postgresql_ops={"policy_number": "gin_trgm_ops"},
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_policy_policy_number_trgm",
+            "policy",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,67 @@
+"""merge duplicate persons, unique person id_number
+
+Revision ID: 8e2b5c41d7a9
+Revises: 3c9d1f7a2b64
+Create Date: 2026-10-18 21:04:12.118530
+
+"""
+
+from typing import (
+    Sequence,
+    Union,
+)
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2b5c41d7a9"
+down_revision: Union[str, None] = "3c9d1f7a2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # per id_number, keep the person of the earliest policy, like the upsert
+    # on policy creation would have
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE person_merge ON COMMIT DROP AS
+        SELECT person.id AS duplicate_id, keeper.id AS keeper_id
+        FROM person
+        JOIN (
+            SELECT DISTINCT ON (person.id_number) person.id_number, person.id
+            FROM person
+            LEFT JOIN policy ON policy.policyholder_id = person.id
+            ORDER BY person.id_number, policy.created_at NULLS LAST, person.id
+        ) AS keeper ON keeper.id_number = person.id_number
+        WHERE person.id <> keeper.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE policy SET policyholder_id = person_merge.keeper_id
+        FROM person_merge WHERE policy.policyholder_id = person_merge.duplicate_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM address USING person_merge
+        WHERE address.person_id = person_merge.duplicate_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM person USING person_merge
+        WHERE person.id = person_merge.duplicate_id
+        """
+    )
+    op.drop_index("ix_person_id_number", "person", if_exists=True)
+    op.create_index("ix_person_id_number", "person", ["id_number"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # merged persons stay merged
+    op.drop_index("ix_person_id_number", "person", if_exists=True)
+    op.create_index("ix_person_id_number", "person", ["id_number"])
@@ -0,0 +1,273 @@
+"""partition policy by expiration year
+
+Revision ID: b7e41a9c3d52
+Revises: 8e2b5c41d7a9
+Create Date: 2026-10-18 23:41:07.530912
+
+"""
+
+from typing import (
+    Sequence,
+    Union,
+)
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e41a9c3d52"
+down_revision: Union[str, None] = "8e2b5c41d7a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions created beyond the current year, like the app keeps doing
+YEARS_AHEAD = 2
+
+# indexes of the policy table, created on every partition
+INDEXES = [
+    (
+        "ix_policy_created_at_id",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        {},
+    ),
+    (
+        "ix_policy_effective_date_expiration_date",
+        ["effective_date", "expiration_date"],
+        {},
+    ),
+    ("ix_policy_expiration_date", ["expiration_date"], {}),
+    ("ix_policy_status_effective_date", ["status", "effective_date"], {}),
+    ("ix_policy_status_expiration_date", ["status", "expiration_date"], {}),
+    ("ix_policy_type_effective_date", ["type", "effective_date"], {}),
+    ("ix_policy_type_expiration_date", ["type", "expiration_date"], {}),
+    ("ix_policy_policyholder_id", ["policyholder_id"], {}),
+    (
+        "ix_policy_policy_number_trgm",
+        ["policy_number"],
+        {
+            "postgresql_using": "gin",
+            "postgresql_ops": {"policy_number": "gin_trgm_ops"},
+        },
+    ),
+]
+
+# tables referencing policy.id, by policy_key.id once policy is partitioned
+REFERENCING = ("premium", "coverage")
+
+CREATE_PARTITION = """
+CREATE FUNCTION policy_create_partition(year integer) RETURNS text
+LANGUAGE plpgsql AS $$
+DECLARE
+    name text := format('policy_y%s', year);
+    lower timestamp := make_timestamp(year, 1, 1, 0, 0, 0);
+    upper timestamp := make_timestamp(year + 1, 1, 1, 0, 0, 0);
+BEGIN
+    IF to_regclass(name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    -- the year's rows the default partition took move to the new one, which is
+    -- attached once filled, its indexes built then
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE policy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM policy_default'
+        ' WHERE expiration_date >= %L AND expiration_date < %L RETURNING *)'
+        ' INSERT INTO %I SELECT * FROM moved',
+        lower, upper, name
+    );
+    EXECUTE format(
+        'ALTER TABLE policy ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        name, lower, upper
+    );
+    RETURN name;
+END
+$$
+"""
+
+ENSURE_PARTITIONS = """
+CREATE FUNCTION policy_ensure_partitions(years_ahead integer) RETURNS SETOF text
+LANGUAGE plpgsql AS $$
+DECLARE
+    this_year integer := extract(year FROM localtimestamp);
+    year integer;
+    created text;
+BEGIN
+    FOR year IN
+        SELECT generate_series(this_year, this_year + years_ahead)
+        UNION
+        SELECT DISTINCT extract(year FROM expiration_date) FROM policy_default
+        ORDER BY 1
+    LOOP
+        created := policy_create_partition(year);
+        IF created IS NOT NULL THEN
+            RETURN NEXT created;
+        END IF;
+    END LOOP;
+END
+$$
+"""
+
+# a detached year's policies leave their keys, premiums and coverages behind,
+# deleted by this before the detached table is dropped or archived elsewhere
+PURGE_DETACHED = """
+CREATE FUNCTION policy_purge_detached(detached regclass) RETURNS bigint
+LANGUAGE plpgsql AS $$
+DECLARE
+    purged bigint;
+BEGIN
+    IF EXISTS (SELECT FROM pg_inherits WHERE inhrelid = detached) THEN
+        RAISE EXCEPTION '% is a partition of policy, detach it first', detached;
+    END IF;
+    EXECUTE format(
+        'DELETE FROM premium USING %s AS detached'
+        ' WHERE premium.policy_id = detached.id',
+        detached
+    );
+    EXECUTE format(
+        'DELETE FROM coverage USING %s AS detached'
+        ' WHERE coverage.policy_id = detached.id',
+        detached
+    );
+    EXECUTE format(
+        'DELETE FROM policy_key USING %s AS detached'
+        ' WHERE policy_key.id = detached.id',
+        detached
+    );
+    GET DIAGNOSTICS purged = ROW_COUNT;
+    RETURN purged;
+END
+$$
+"""
+
+# keys are inserted once per statement, from all of its rows
+INSERT_KEYS = """
+CREATE FUNCTION policy_insert_keys() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO policy_key (id, policy_number)
+    SELECT id, policy_number FROM inserted;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def _drop_policy_foreign_keys() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in REFERENCING:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key["constrained_columns"] == ["policy_id"]:
+                op.drop_constraint(foreign_key["name"], table, type_="foreignkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # policy ids and numbers stay unique across the partitions in policy_key,
+    # which premiums and coverages reference instead; a partitioned table's
+    # unique constraints may only cover rows of the same partition;
+    # create_all() may have created it already, empty
+    op.create_table(
+        "policy_key",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("policy_number", sa.Text(), nullable=False, unique=True),
+        if_not_exists=True,
+    )
+    op.execute(
+        """
+        INSERT INTO policy_key (id, policy_number)
+        SELECT id, policy_number FROM policy ON CONFLICT DO NOTHING
+        """
+    )
+    _drop_policy_foreign_keys()
+
+    # the heap's constraints and indexes go with it, those of the partitioned
+    # table are created once it is filled; expirations never precede their
+    # policy's effective date, which lets effective date filters prune years too
+    op.rename_table("policy", "policy_heap")
+    op.execute(
+        """
+        CREATE TABLE policy (
+            LIKE policy_heap INCLUDING DEFAULTS,
+            CONSTRAINT ck_policy_expiration_after_effective
+            CHECK (expiration_date >= effective_date)
+        )
+        PARTITION BY RANGE (expiration_date)
+        """
+    )
+    op.execute("CREATE TABLE policy_default PARTITION OF policy DEFAULT")
+    op.execute(CREATE_PARTITION)
+    op.execute(ENSURE_PARTITIONS)
+    op.execute(PURGE_DETACHED)
+    # every year from the earliest expiration on, gaps included
+    op.execute(
+        sa.text(
+            """
+            SELECT policy_create_partition(year)
+            FROM generate_series(
+                least(
+                    (SELECT extract(year FROM min(expiration_date)) FROM policy_heap),
+                    extract(year FROM localtimestamp)
+                )::integer,
+                greatest(
+                    (SELECT extract(year FROM max(expiration_date)) FROM policy_heap),
+                    extract(year FROM localtimestamp) + :years_ahead
+                )::integer
+            ) AS year
+            """
+        ).bindparams(years_ahead=YEARS_AHEAD)
+    )
+    op.execute("INSERT INTO policy SELECT * FROM policy_heap")
+    op.drop_table("policy_heap")
+
+    op.create_primary_key("policy_pkey", "policy", ["id", "expiration_date"])
+    op.create_foreign_key(
+        "policy_policyholder_id_fkey", "policy", "person", ["policyholder_id"], ["id"]
+    )
+    # a plain index for policy_number lookups, its uniqueness is policy_key's
+    op.create_index("ix_policy_policy_number", "policy", ["policy_number"])
+    for name, columns, options in INDEXES:
+        op.create_index(name, "policy", columns, **options)
+    for table in REFERENCING:
+        op.create_foreign_key(
+            f"{table}_policy_id_fkey", table, "policy_key", ["policy_id"], ["id"]
+        )
+
+    op.execute(INSERT_KEYS)
+    op.execute(
+        """
+        CREATE TRIGGER policy_insert_keys AFTER INSERT ON policy
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION policy_insert_keys()
+        """
+    )
+    op.execute("ANALYZE policy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_policy_foreign_keys()
+    op.rename_table("policy", "policy_partitioned")
+    # the heap keeps no check constraint, like before
+    op.execute("CREATE TABLE policy (LIKE policy_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO policy SELECT * FROM policy_partitioned")
+    # partitions, their indexes and the keys trigger go with it
+    op.drop_table("policy_partitioned")
+    op.execute("DROP FUNCTION policy_purge_detached(regclass)")
+    op.execute("DROP FUNCTION policy_ensure_partitions(integer)")
+    op.execute("DROP FUNCTION policy_create_partition(integer)")
+    op.execute("DROP FUNCTION policy_insert_keys()")
+
+    op.create_primary_key("policy_pkey", "policy", ["id"])
+    op.create_unique_constraint("policy_policy_number_key", "policy", ["policy_number"])
+    op.create_foreign_key(
+        "policy_policyholder_id_fkey", "policy", "person", ["policyholder_id"], ["id"]
+    )
+    for name, columns, options in INDEXES:
+        op.create_index(name, "policy", columns, **options)
+    for table in REFERENCING:
+        op.create_foreign_key(
+            f"{table}_policy_id_fkey", table, "policy", ["policy_id"], ["id"]
+        )
+    op.drop_table("policy_key")
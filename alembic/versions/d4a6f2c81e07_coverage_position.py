@@ -0,0 +1,47 @@
+"""coverage position
+
+Revision ID: d4a6f2c81e07
+Revises: b7e41a9c3d52
+Create Date: 2026-10-18 23:58:31.204617
+
+"""
+
+from typing import (
+    Sequence,
+    Union,
+)
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a6f2c81e07"
+down_revision: Union[str, None] = "b7e41a9c3d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all() may have added it already
+    op.execute(
+        "ALTER TABLE coverage ADD COLUMN IF NOT EXISTS position integer NOT NULL DEFAULT 0"
+    )
+    # the order of existing coverages is lost with their random ids, they keep
+    # the id order they were read in so far
+    op.execute(
+        """
+        UPDATE coverage SET position = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY policy_id ORDER BY id) - 1
+                AS position
+            FROM coverage
+        ) AS numbered
+        WHERE coverage.id = numbered.id AND numbered.position > 0
+        """
+    )
+    op.alter_column("coverage", "position", server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("coverage", "position")
@@ -1,7 +1,19 @@
-from fastapi import APIRouter
+from fastapi import (
+    APIRouter,
+    Depends,
+)
 
-from app.api.api_v1.endpoints import policies
+from app.api import deps
+from app.api.api_v1.endpoints import (
+    admin,
+    policies,
+)
 
 api_router = APIRouter()
 
-api_router.include_router(policies.router, tags=["policies"])
+api_router.include_router(
+    policies.router, tags=["policies"], dependencies=[Depends(deps.read_your_writes)]
+)
+api_router.include_router(
+    admin.router, tags=["admin"], dependencies=[Depends(deps.require_admin_token)]
+)
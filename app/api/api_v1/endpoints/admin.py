@@ -0,0 +1,70 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.api import deps
+from app.core.profiling import ProfileStore
+from app.schemas.HttpError import HTTPError
+from app.schemas.status import (
+    ProfileInfo,
+    SlowQueriesStatus,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/admin/slow-queries",
+    status_code=status.HTTP_200_OK,
+    summary="Slowest statement shapes of the serving worker, with their latest plans",
+    response_model=SlowQueriesStatus,
+    responses={403: {"model": HTTPError, "description": "Admin token required"}},
+)
+async def slow_queries(
+    limit: int = Query(default=10, ge=1, le=100),
+    async_db_api: deps.AsyncDBApi = Depends(deps.get_db),
+) -> dict:
+    return async_db_api.slow_queries(limit)
+
+
+@router.get(
+    "/admin/profiles",
+    status_code=status.HTTP_200_OK,
+    summary="Saved request profiles, newest first",
+    response_model=list[ProfileInfo],
+    responses={403: {"model": HTTPError, "description": "Admin token required"}},
+)
+async def list_profiles(
+    store: ProfileStore = Depends(deps.get_profile_store),
+) -> list[dict]:
+    return await run_in_threadpool(store.list)
+
+
+@router.get(
+    "/admin/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    summary="A request profile, as folded stacks for flamegraph.pl or speedscope",
+    response_class=FileResponse,
+    responses={
+        200: {"content": {"text/plain": {}}, "description": "Folded stacks"},
+        403: {"model": HTTPError, "description": "Admin token required"},
+        404: {"model": HTTPError, "description": "No such profile"},
+    },
+)
+async def get_profile(
+    profile_id: str,
+    store: ProfileStore = Depends(deps.get_profile_store),
+) -> FileResponse:
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    return FileResponse(path, media_type="text/plain", filename=path.name)
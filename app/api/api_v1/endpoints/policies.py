@@ -1,39 +1,95 @@
+import csv
+import io
+import json
 import logging
 from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+)
 
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
+    Request,
     status,
 )
-from sqlalchemy.exc import IntegrityError
+from fastapi.responses import (
+    Response,
+    StreamingResponse,
+)
+from pydantic import ValidationError
+from sqlalchemy.exc import (
+    DBAPIError,
+    IntegrityError,
+)
 
 from app.api import deps
+from app.core.etag import (
+    etag_matches,
+    make_etag,
+)
+from app.db.pagination import (
+    PageCursor,
+    PolicyVersion,
+)
 from app.models.enums import (
+    BulkItemStatus,
+    ExportFormat,
     PolicyStatus,
     PolicyType,
+    TotalCountMode,
 )
 from app.models.policy import Policy
+from app.models.policy_filter import PolicyFilter
 from app.schemas.HttpError import HTTPError
-from app.schemas.policy import FilteredPoliciesResponse
+from app.schemas.policy import (
+    BulkPoliciesResponse,
+    BulkPolicyResult,
+    FilteredPoliciesResponse,
+)
 
 LOG = logging.getLogger(__name__)
 
 
 router = APIRouter()
 
-
-@router.get(
-    "/policies",
-    status_code=status.HTTP_200_OK,
-    summary="Get all policies",
-    response_model=FilteredPoliciesResponse,
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+EXPORT_CSV_COLUMNS = (
+    "policy_number",
+    "type",
+    "status",
+    "created_at",
+    "effective_date",
+    "expiration_date",
+    "notes",
+    "policyholder.id_number",
+    "policyholder.first_name",
+    "policyholder.last_name",
+    "policyholder.date_of_birth",
+    "policyholder.email",
+    "policyholder.phone",
+    "policyholder.address.street",
+    "policyholder.address.city",
+    "policyholder.address.state",
+    "policyholder.address.zip_code",
+    "policyholder.address.country",
+    "premium.amount",
+    "premium.frequency",
+    "premium.method",
+    "premium.next_payment_date",
 )
-async def get_policies_filtered_with_pagination(
+
+
+def get_policy_filter(
     *,
-    async_db_api: deps.AsyncDBApi = Depends(deps.get_db),
     expiration_date_from: datetime = Query(
         alias="expiration-date-from",
         default=None,
@@ -54,12 +110,6 @@ async def get_policies_filtered_with_pagination(
         default=None,
         description="Effective date to which to filter policies",
     ),
-    page: int = Query(
-        alias="page", default_factory=lambda: 1, description="Page number"
-    ),
-    page_size: int = Query(
-        alias="page-size", default_factory=lambda: 10, description="Page size"
-    ),
     policyholder_id_number: str = Query(
         alias="policyholder-id-number",
         default=None,
@@ -74,22 +124,141 @@ async def get_policies_filtered_with_pagination(
     policy_type: PolicyType = Query(
         alias="policy-type", default=None, description="Policy type to filter by"
     ),
+) -> PolicyFilter:
+    return PolicyFilter(
+        expiration_date_from=expiration_date_from,
+        expiration_date_to=expiration_date_to,
+        effective_date_from=effective_date_from,
+        effective_date_to=effective_date_to,
+        policyholder_id_number=policyholder_id_number,
+        policy_number=policy_number,
+        policy_type=policy_type,
+        policy_status=policy_status,
+    )
+
+
+def get_policy_fields(
+    fields: str = Query(
+        alias="fields",
+        default=None,
+        description="Comma separated Policy fields to return, all of them by default",
+    ),
+) -> frozenset[str] | None:
+    if fields is None:
+        return None
+    requested = frozenset(field.strip() for field in fields.split(",") if field.strip())
+    unknown = requested - Policy.model_fields.keys()
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            if unknown
+            else "No fields requested",
+        )
+    return requested
+
+
+def _listing_etag(
+    version: PolicyVersion,
+    policy_filter: PolicyFilter,
+    page: int,
+    page_size: int,
+    page_cursor: PageCursor | None,
+    include_total: TotalCountMode,
+    fields: frozenset[str] | None,
+) -> str:
+    """Weak ETag of a policies page, from the filtered set's version and the query.
+
+    Policies are never updated in place, so a page changes only with the newest
+    creation time or the count of the policies it is taken from.
+    """
+    return make_etag(
+        policy_filter.model_dump_json(),
+        f"{page}:{page_size}:{page_cursor.encode() if page_cursor else ''}",
+        include_total,
+        ",".join(sorted(fields or ())),
+        f"{version.newest.isoformat() if version.newest else ''}:{version.count}",
+        weak=True,
+    )
+
+
+async def _policies_version(
+    async_db_api: deps.PolicyStorage, policy_filter: PolicyFilter
+) -> PolicyVersion | None:
+    try:
+        return await async_db_api.get_policies_version(policy_filter)
+    except Exception as e:
+        # served without a validator rather than not at all
+        LOG.error(f"Error getting policies version: {e}")
+        return None
+
+
+@router.get(
+    "/policies",
+    status_code=status.HTTP_200_OK,
+    summary="Get all policies",
+    responses={
+        304: {"description": "Not modified since the If-None-Match ETag"},
+        400: {
+            "model": HTTPError,
+            "description": "Invalid cursor or fields",
+        },
+    },
+    response_model=FilteredPoliciesResponse,
+)
+async def get_policies_filtered_with_pagination(
+    *,
+    async_db_api: deps.PolicyStorage = Depends(deps.get_db),
+    settings: deps.Settings = Depends(deps.get_settings),
+    policy_filter: PolicyFilter = Depends(get_policy_filter),
+    page: int = Query(
+        alias="page", default_factory=lambda: 1, description="Page number"
+    ),
+    page_size: int = Query(
+        alias="page-size", default_factory=lambda: 10, description="Page size"
+    ),
+    cursor: str = Query(
+        alias="cursor",
+        default=None,
+        description="Opaque next_cursor / prev_cursor from a previous page, "
+        "takes precedence over page",
+    ),
+    include_total: TotalCountMode = Query(
+        alias="include-total",
+        default=TotalCountMode.EXACT,
+        description="Whether total_count is exact, a planner estimate, or skipped",
+    ),
+    fields: frozenset[str] | None = Depends(get_policy_fields),
+    if_none_match: str = Header(alias="If-None-Match", default=None),
 ):
     try:
-        (
-            policies,
-            total_count,
-        ) = await async_db_api.get_policies_filtered_with_pagination(
-            expiration_date_from=expiration_date_from,
-            expiration_date_to=expiration_date_to,
-            effective_date_from=effective_date_from,
-            effective_date_to=effective_date_to,
+        page_cursor = PageCursor.decode(cursor) if cursor is not None else None
+    except ValueError as e:
+        LOG.debug(f"Invalid cursor {cursor}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    listing = (policy_filter, page, page_size, page_cursor, include_total, fields)
+    version = None
+    if if_none_match:
+        # revalidating costs the version query, not the page
+        version = await _policies_version(async_db_api, policy_filter)
+        if version is not None:
+            etag = _listing_etag(version, *listing)
+            if etag_matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+    try:
+        result = await async_db_api.get_policies_filtered_with_pagination(
+            policy_filter=policy_filter,
             page=page,
             page_size=page_size,
-            policy_number=policy_number,
-            policyholder_id_number=policyholder_id_number,
-            policy_type=policy_type,
-            policy_status=policy_status,
+            cursor=page_cursor,
+            include_total=include_total,
+            fields=fields,
+            read_path=settings.POLICY_LIST_READ_PATH,
         )
     except Exception as e:
         LOG.error(f"Error getting policies: {e}")
@@ -97,7 +266,105 @@ async def get_policies_filtered_with_pagination(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
         )
-    return FilteredPoliciesResponse(policies=policies, total_count=total_count)
+    # rows are trusted and policies possibly partial, skip response model
+    # validation and serialize once, straight to bytes
+    page_response = FilteredPoliciesResponse.model_construct(
+        policies=result.policies,
+        total_count=result.total_count,
+        next_cursor=result.next_cursor,
+        prev_cursor=result.prev_cursor,
+    )
+    include = None
+    if fields is not None:
+        include = {
+            "policies": {"__all__": fields},
+            "total_count": True,
+            "next_cursor": True,
+            "prev_cursor": True,
+        }
+    content = page_response.model_dump_json(include=include)
+    # the version read along with the page describes it best, when there is one
+    version = result.version or version
+    if version is None:
+        version = await _policies_version(async_db_api, policy_filter)
+    headers = {}
+    if version is not None:
+        headers["ETag"] = _listing_etag(version, *listing)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def _export_chunks(
+    policies: AsyncIterator[Policy], export_format: ExportFormat, flush_bytes: int
+) -> AsyncIterator[str]:
+    """Serialized policies, buffered into chunks of about flush_bytes."""
+    buffer = io.StringIO()
+    writer = None
+    if export_format == ExportFormat.CSV:
+        writer = csv.DictWriter(
+            buffer, fieldnames=EXPORT_CSV_COLUMNS, extrasaction="ignore"
+        )
+        writer.writeheader()
+    try:
+        async for policy in policies:
+            if writer is None:
+                buffer.write(policy.model_dump_json())
+                buffer.write("\n")
+            else:
+                writer.writerow(_flatten(policy.model_dump(mode="json")))
+            if buffer.tell() >= flush_bytes:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    except Exception as e:
+        # headers are gone already, all that's left is to cut the stream short
+        LOG.error(f"Policy export failed: {e}")
+        raise
+    yield buffer.getvalue()
+
+
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+@router.get(
+    "/policies/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export policies",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "Filtered policies, one per line",
+        }
+    },
+)
+async def export_policies(
+    *,
+    async_db_api: deps.PolicyStorage = Depends(deps.get_db),
+    settings: deps.Settings = Depends(deps.get_settings),
+    policy_filter: PolicyFilter = Depends(get_policy_filter),
+    export_format: ExportFormat = Query(
+        alias="format", default=ExportFormat.NDJSON, description="Export format"
+    ),
+):
+    policies = async_db_api.stream_policies(
+        policy_filter,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+        read_path=settings.POLICY_EXPORT_READ_PATH,
+    )
+    return StreamingResponse(
+        _export_chunks(policies, export_format, settings.EXPORT_FLUSH_BYTES),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="policies.{export_format}"'
+        },
+    )
 
 
 @router.get(
@@ -105,20 +372,27 @@ async def get_policies_filtered_with_pagination(
     status_code=status.HTTP_200_OK,
     summary="Get single policy",
     responses={
+        304: {"description": "Not modified since the If-None-Match ETag"},
+        400: {
+            "model": HTTPError,
+            "description": "Invalid fields",
+        },
         404: {
             "model": HTTPError,
             "description": "Policy not found",
-        }
+        },
     },
     response_model=Policy,
 )
 async def get_single_policy(
     *,
     policy_number: str,
-    async_db_api: deps.AsyncDBApi = Depends(deps.get_db),
+    async_db_api: deps.PolicyStorage = Depends(deps.get_db),
+    fields: frozenset[str] | None = Depends(get_policy_fields),
+    if_none_match: str = Header(alias="If-None-Match", default=None),
 ):
     try:
-        policy = await async_db_api.get_single_policy_by_number(policy_number)
+        policy = await async_db_api.get_single_policy_json(policy_number, fields)
     except Exception as e:
         LOG.error(f"Error getting policies: {e}")
         raise HTTPException(
@@ -130,7 +404,11 @@ async def get_single_policy(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Policy with number {policy_number} not found",
         )
-    return policy.to_model()
+    headers = {"ETag": policy.etag}
+    if etag_matches(if_none_match, policy.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # already serialized, possibly cached, response validation adds nothing
+    return Response(content=policy.body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -147,7 +425,7 @@ async def get_single_policy(
 async def create_policy(
     *,
     policy_request: Policy,
-    async_db_api: deps.AsyncDBApi = Depends(deps.get_db),
+    async_db_api: deps.PolicyStorage = Depends(deps.get_db),
 ):
     try:
         await async_db_api.create_insurance_policy(policy_request)
@@ -163,3 +441,150 @@ async def create_policy(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
         )
+
+
+async def _bulk_items(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """Raw items of a bulk request body, a JSON array or an NDJSON stream."""
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPES):
+        index, buffer = 0, b""
+        async for data in request.stream():
+            *lines, buffer = (buffer + data).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+    try:
+        items = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Request body is not valid JSON: {e}",
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Request body must be a JSON array of policies",
+        )
+    for index, item in enumerate(items):
+        yield index, item
+
+
+def _item_policy_number(item: Any) -> str | None:
+    """Policy number of a raw bulk item, of parsed JSON array items only."""
+    return item.get("policy_number") if isinstance(item, dict) else None
+
+
+async def _create_chunk(
+    async_db_api: deps.PolicyStorage, chunk: list[tuple[int, Policy]]
+) -> list[BulkPolicyResult]:
+    statuses = await async_db_api.bulk_create_insurance_policies(
+        [policy for _, policy in chunk]
+    )
+    return [
+        BulkPolicyResult(index=index, policy_number=policy.policy_number, status=s)
+        for (index, policy), s in zip(chunk, statuses, strict=True)
+    ]
+
+
+@router.post(
+    "/policies/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Create policies in bulk",
+    response_model=BulkPoliciesResponse,
+    responses={
+        422: {
+            "model": HTTPError,
+            "description": "Malformed request body",
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Policy"},
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/Policy"}
+                },
+            },
+        }
+    },
+)
+async def create_policies_bulk(
+    *,
+    request: Request,
+    async_db_api: deps.PolicyStorage = Depends(deps.get_db),
+    settings: deps.Settings = Depends(deps.get_settings),
+    chunk_size: int = Query(
+        alias="chunk-size",
+        default=None,
+        ge=1,
+        description="Policies validated and written per transaction",
+    ),
+):
+    chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+    results: list[BulkPolicyResult] = []
+    chunk: list[tuple[int, Policy]] = []
+    items = _bulk_items(request)
+    try:
+        async for index, item in items:
+            try:
+                if isinstance(item, bytes):
+                    policy = Policy.model_validate_json(item)
+                else:
+                    policy = Policy.model_validate(item)
+            except ValidationError as e:
+                results.append(
+                    BulkPolicyResult(
+                        index=index,
+                        policy_number=_item_policy_number(item),
+                        status=BulkItemStatus.INVALID,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+                continue
+            chunk.append((index, policy))
+            if len(chunk) >= chunk_size:
+                results.extend(await _create_chunk(async_db_api, chunk))
+                chunk = []
+        if chunk:
+            results.extend(await _create_chunk(async_db_api, chunk))
+    except HTTPException:
+        raise
+    except DBAPIError as e:
+        # earlier chunks' statuses stand, the items past the failed chunk are
+        # still read, to report every one of them as not attempted
+        LOG.error(f"Bulk policy creation failed: {e}")
+        results.extend(
+            BulkPolicyResult(
+                index=index,
+                policy_number=policy.policy_number,
+                status=BulkItemStatus.ERROR,
+            )
+            for index, policy in chunk
+        )
+        results.extend(
+            [
+                BulkPolicyResult(
+                    index=index,
+                    policy_number=_item_policy_number(item),
+                    status=BulkItemStatus.SKIPPED,
+                )
+                async for index, item in items
+            ]
+        )
+    except Exception as e:
+        LOG.error(f"Bulk policy creation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
+    results.sort(key=lambda result: result.index)
+    return BulkPoliciesResponse(results=results)
@@ -1,20 +1,93 @@
+import secrets
+from pathlib import Path
+
+from fastapi import (
+    Depends,
+    Header,
+    HTTPException,
+    status,
+)
+
 from app.core.config import (
     Settings,
     settings,
 )
-from app.db.async_db_api import AsyncDBApi
+from app.core.profiling import ProfileStore
+from app.db.async_db_api import (
+    READ_FROM_PRIMARY,
+    AsyncDBApi,
+)
+from app.db.loaders import DBLoaders
+from app.db.pool import worker_pool_limits
+from app.db.storage import PolicyStorage  # noqa F401
+
+pool_size, max_overflow = worker_pool_limits(
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
+    workers=settings.WEB_CONCURRENCY,
+    connection_budget=settings.DB_CONNECTION_BUDGET,
+    # the policy change listener holds one connection of its own
+    reserved=1 if settings.POLICY_CACHE_SIZE > 0 else 0,
+)
 
 async_db_api = AsyncDBApi(
     db_server=settings.DB_HOST,
     database=settings.DB_INSTANCE_NAME,
     user_name=settings.DB_USER,
     password=settings.DB_PASSWD,
+    replica_servers=settings.DB_REPLICA_HOSTS,
+    replica_health_check_interval=settings.DB_REPLICA_HEALTH_CHECK_INTERVAL,
+    pool_size=pool_size,
+    max_overflow=max_overflow,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+    policy_cache_size=settings.POLICY_CACHE_SIZE,
+    policy_cache_ttl=settings.POLICY_CACHE_TTL,
+    slow_query_threshold=settings.SLOW_QUERY_THRESHOLD,
+    slow_query_explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    slow_query_statements=settings.SLOW_QUERY_STATEMENTS,
 )
 
+profile_store = ProfileStore(Path(settings.PROFILE_DIR), settings.PROFILE_KEEP)
+
 
 def get_db() -> AsyncDBApi:
     return async_db_api
 
 
+def get_loaders(async_db_api: AsyncDBApi = Depends(get_db)) -> DBLoaders:
+    # dependencies are solved once per request, so are the loaders' caches
+    return DBLoaders(async_db_api)
+
+
 def get_settings() -> Settings:
     return settings
+
+
+def get_profile_store() -> ProfileStore:
+    return profile_store
+
+
+async def read_your_writes(
+    read_your_writes: bool = Header(
+        alias="X-Read-Your-Writes",
+        default=False,
+        description="Serve reads from the primary, e.g. right after a write",
+    ),
+) -> None:
+    # async, so the context var is set in the request's own context
+    READ_FROM_PRIMARY.set(read_your_writes)
+
+
+def require_admin_token(
+    admin_token: str | None = Header(alias="X-Admin-Token", default=None),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    if settings.ADMIN_TOKEN is None or not secrets.compare_digest(
+        admin_token or "", settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required"
+        )
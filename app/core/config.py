@@ -1,19 +1,92 @@
-from pydantic import ConfigDict
+import os
+import tempfile
+
+from pydantic import (
+    ConfigDict,
+    Field,
+)
 from pydantic_settings import BaseSettings
 
-from app.utils import get_version_from_pyproject
+from app.models.enums import ReadPath
+from app.utils import get_version
 
 
 class Settings(BaseSettings):
     # Application specific
     API_V1_STR: str = "/task/api/v1"
-    BACKEND_VERSION: str = get_version_from_pyproject()
+    # baked into app/build_info.json at image build time, see app.utils
+    BACKEND_VERSION: str = Field(default_factory=get_version)
 
     # Database related
     DB_HOST: str
     DB_INSTANCE_NAME: str
     DB_USER: str
     DB_PASSWD: str
+    # host:port of read replicas, as a JSON list
+    DB_REPLICA_HOSTS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    # Connection pool, per engine and worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    # prepared statements cached per connection, 0 behind transaction-mode pgbouncer
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Connections all worker processes together may open per database server,
+    # split evenly between them; unset, every worker uses the pool settings above
+    DB_CONNECTION_BUDGET: int | None = None
+    # Seconds to wait on shutdown for checked out connections to be returned
+    DB_DRAIN_TIMEOUT: float = 10.0
+    # Connections opened per pool at startup, ahead of the first requests
+    DB_POOL_PREWARM: int = 0
+    # The policy table is partitioned by expiration year; partitions are kept
+    # this many years ahead, checked at startup and every interval seconds
+    POLICY_PARTITION_YEARS_AHEAD: int = 2
+    POLICY_PARTITION_CHECK_INTERVAL: float = 24 * 60 * 60.0
+
+    # Worker processes, uvicorn's --workers defaults to it
+    WEB_CONCURRENCY: int = 1
+
+    # Serialized single policies cached per worker process, 0 disables
+    POLICY_CACHE_SIZE: int = 10000
+    POLICY_CACHE_TTL: float = 60.0
+
+    # Listing and export rows as ORM entities, or as plain Core rows skipping
+    # the identity map and unit of work
+    POLICY_LIST_READ_PATH: ReadPath = ReadPath.ORM
+    POLICY_EXPORT_READ_PATH: ReadPath = ReadPath.ORM
+
+    # Bulk ingestion
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+
+    # Export
+    EXPORT_BATCH_SIZE: int = 1000
+    EXPORT_FLUSH_BYTES: int = 64 * 1024
+
+    # Metrics; worker processes share theirs through files in METRICS_DIR every
+    # METRICS_SHARE_INTERVAL seconds and /metrics sums them all up. Unset, it
+    # shows the metrics of the worker serving it only
+    METRICS_DIR: str | None = None
+    METRICS_SHARE_INTERVAL: float = 5.0
+
+    # Statements slower than this many seconds are logged and kept per shape for
+    # /admin/slow-queries, unset disables it. A sampled fraction of the slow
+    # reads is run again in the background under EXPLAIN (ANALYZE, BUFFERS),
+    # none unless a sample rate is set: each sample runs the query twice
+    SLOW_QUERY_THRESHOLD: float | None = 1.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_STATEMENTS: int = 100
+
+    # Token the /admin endpoints require in X-Admin-Token, unset disables them
+    ADMIN_TOKEN: str | None = None
+
+    # Requests are profiled when their X-Profile header carries ADMIN_TOKEN, or
+    # this fraction of all requests at random; the newest PROFILE_KEEP profiles
+    # are kept in PROFILE_DIR for /admin/profiles
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_DIR: str = os.path.join(tempfile.gettempdir(), "homework-profiles")
+    PROFILE_KEEP: int = 50
 
     # Pydantic basesettings configuration
     model_config = ConfigDict(case_sensitive=True)
@@ -0,0 +1,22 @@
+from hashlib import blake2b
+
+
+def make_etag(*parts: bytes | str, weak: bool = False) -> str:
+    """Quoted entity tag hashing the given parts."""
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    tag = f'"{digest.hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an entity tag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
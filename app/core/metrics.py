@@ -0,0 +1,331 @@
+import fcntl
+import json
+import logging
+import os
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+
+LOG = logging.getLogger(__name__)
+
+# seconds, spanning an idle pool hit up to a pool_timeout wait
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Observation counts over fixed upper bounds, cumulative like Prometheus'."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(
+            [*map(str, self.buckets), "+Inf"], self._counts, strict=True
+        ):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class MetricFamily:
+    """Counters or histograms of one metric, one per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._buckets = buckets
+        self._children: dict[tuple[str, ...], Counter | Histogram] = {}
+
+    def labels(self, *values: str) -> Counter | Histogram:
+        child = self._children.get(values)
+        if child is None:
+            if self.kind == "histogram":
+                child = Histogram(self._buckets)
+            else:
+                child = Counter()
+            self._children[values] = child
+        return child
+
+    def snapshot(self) -> dict:
+        return family_snapshot(
+            self.kind,
+            self.documentation,
+            self.labelnames,
+            [(values, child.snapshot()) for values, child in self._children.items()],
+        )
+
+
+def family_snapshot(
+    kind: str, documentation: str, labelnames: Sequence[str], samples: Iterable
+) -> dict:
+    """JSON-able metric family, samples being (label values, value or histogram snapshot)."""
+    return {
+        "type": kind,
+        "help": documentation,
+        "labelnames": list(labelnames),
+        "samples": [[list(values), value] for values, value in samples],
+    }
+
+
+class Registry:
+    """Metric families of this process, plus collectors computing more at snapshot time."""
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+        self._collectors: list[Callable[[], dict[str, dict]]] = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        return self._register(MetricFamily(name, documentation, "counter", labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> MetricFamily:
+        return self._register(
+            MetricFamily(name, documentation, "histogram", labelnames, buckets)
+        )
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Metric {family.name} is already registered")
+        self._families[family.name] = family
+        return family
+
+    def add_collector(self, collector: Callable[[], dict[str, dict]]) -> None:
+        """Add a callable returning family snapshots by name, e.g. gauges of live state."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, dict]:
+        snapshot = {name: family.snapshot() for name, family in self._families.items()}
+        for collector in self._collectors:
+            snapshot.update(collector())
+        return snapshot
+
+
+REGISTRY = Registry()
+
+
+def merge_snapshots(snapshots: Iterable[dict[str, dict]]) -> dict[str, dict]:
+    """Families of several processes summed up by label values."""
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for values, value in family["samples"]:
+                key = tuple(values)
+                total = target["samples"].get(key)
+                if total is None:
+                    target["samples"][key] = value
+                elif isinstance(value, dict):
+                    target["samples"][key] = {
+                        "buckets": {
+                            bound: total["buckets"].get(bound, 0) + count
+                            for bound, count in value["buckets"].items()
+                        },
+                        "count": total["count"] + value["count"],
+                        "sum": total["sum"] + value["sum"],
+                    }
+                else:
+                    target["samples"][key] = total + value
+    for family in merged.values():
+        family["samples"] = [
+            [list(key), value] for key, value in family["samples"].items()
+        ]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def render(snapshot: dict[str, dict]) -> str:
+    """Families in the Prometheus text exposition format, version 0.0.4."""
+    lines = []
+    for name, family in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {_escape(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for values, value in family["samples"]:
+            pairs = list(zip(family["labelnames"], values, strict=True))
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(pairs)} {value}")
+                continue
+            for bound, count in value["buckets"].items():
+                lines.append(f"{name}_bucket{_labels([*pairs, ('le', bound)])} {count}")
+            lines.append(f"{name}_sum{_labels(pairs)} {value['sum']}")
+            lines.append(f"{name}_count{_labels(pairs)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# counters and histograms of the processes that exited, summed up
+ARCHIVE_FILE = "archived.json"
+LOCK_FILE = ".lock"
+
+# (pid, random id) of this process, new in forked children; a pid alone may
+# be reused by a later worker, which would overwrite the exited one's file
+_process: tuple[int, str] | None = None
+
+
+def _process_name() -> str:
+    global _process
+    pid = os.getpid()
+    if _process is None or _process[0] != pid:
+        _process = (pid, uuid.uuid4().hex)
+    return f"{pid}-{_process[1]}"
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # exists, only owned by another user
+        pass
+    return True
+
+
+def _exited(path: Path) -> bool:
+    """Whether the process that shared the snapshot file is gone."""
+    pid, _, _ = path.stem.partition("-")
+    if not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        # an earlier process of this pid
+        return path.stem != _process_name()
+    return not _alive(int(pid))
+
+
+def _without_gauges(snapshot: dict[str, dict]) -> dict[str, dict]:
+    return {
+        name: family for name, family in snapshot.items() if family["type"] != "gauge"
+    }
+
+
+def _write(path: Path, snapshot: dict[str, dict]) -> None:
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(snapshot))
+    temporary.replace(path)
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    """Exclusive to one process of those sharing the directory."""
+    with open(directory / LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def write_snapshot(directory: Path, snapshot: dict[str, dict]) -> None:
+    """Share this process' snapshot with the other workers, replacing its previous one."""
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(directory / f"{_process_name()}.json", snapshot)
+
+
+def _archive_exited(directory: Path) -> None:
+    """Fold the snapshots of exited processes into the archive, then delete them."""
+    exited = [path for path in directory.glob("*.json") if _exited(path)]
+    if not exited:
+        return
+    archive = directory / ARCHIVE_FILE
+    snapshots = [json.loads(archive.read_text())] if archive.exists() else []
+    for path in exited:
+        try:
+            snapshots.append(_without_gauges(json.loads(path.read_text())))
+        except ValueError:
+            # torn by a crash mid-write, there is nothing left to count
+            continue
+    _write(archive, merge_snapshots(snapshots))
+    for path in exited:
+        path.unlink(missing_ok=True)
+
+
+def read_snapshots(directory: Path) -> list[dict[str, dict]]:
+    """Snapshots the other processes shared.
+
+    Counters and histograms of exited processes still count towards the
+    totals, archived together; their gauges are left out.
+    """
+    if not directory.is_dir():
+        return []
+    own = f"{_process_name()}.json"
+    snapshots = []
+    # folding and reading by one process at a time, a snapshot is never read
+    # both from its own file and from the archive
+    with _locked(directory):
+        try:
+            _archive_exited(directory)
+        except (OSError, ValueError) as e:
+            LOG.warning(f"Archiving metrics of exited processes failed: {e}")
+        for path in directory.glob("*.json"):
+            if path.name == own:
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if _exited(path):
+                snapshot = _without_gauges(snapshot)
+            snapshots.append(snapshot)
+    return snapshots
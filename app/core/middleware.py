@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import random
+import secrets
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from app.core.config import Settings
+from app.core.metrics import REGISTRY
+from app.core.profiling import (
+    ProfileStore,
+    StackSampler,
+)
+
+LOG = logging.getLogger(__name__)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requests served", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, streamed bodies included",
+    ("method", "route"),
+)
+
+
+def _route(scope: Scope) -> str:
+    """Path template of the matched route, keeping the route label's values few."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # docs and openapi routes, fixed paths
+        return scope["path"]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Count and time the HTTP requests by method, route template and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = _route(scope)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route).observe(
+                time.perf_counter() - start
+            )
+
+
+class ProfilingMiddleware:
+    """Profile whole requests by sampling stacks, on demand or a fraction of them.
+
+    A request is profiled when its X-Profile header carries the ADMIN_TOKEN, or
+    by chance at PROFILE_SAMPLE_RATE. The event loop thread's stacks are sampled
+    until the response is sent, saved to the store as folded stacks and the
+    profile's id returned in the X-Profile-Id response header. Other requests
+    pass straight through.
+
+    Requests served concurrently show up in a profile too, so one request at a
+    time is profiled and the overlapping ones are counted in the log.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings, store: ProfileStore):
+        self.app = app
+        self.settings = settings
+        self.store = store
+        self._profiling = False
+        # requests started while profiling, whose code the profile includes
+        self._overlapping = 0
+
+    def _wanted(self, scope: Scope) -> bool:
+        token = self.settings.ADMIN_TOKEN
+        if token is not None:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    return secrets.compare_digest(value, token.encode())
+        rate = self.settings.PROFILE_SAMPLE_RATE
+        return rate > 0 and random.random() < rate  # noqa S311
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._profiling:
+            self._overlapping += 1
+            await self.app(scope, receive, send)
+            return
+        if not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        profile_id = self.store.new_id()
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        self._profiling = True
+        self._overlapping = 0
+        sampler = StackSampler(threading.get_ident())
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - start
+            self._profiling = False
+            try:
+                # the file writes and pruning stay off the event loop
+                await asyncio.to_thread(self.store.save, profile_id, sampler.folded())
+            except OSError as e:
+                LOG.warning(f"Saving profile {profile_id} failed: {e}")
+            else:
+                LOG.info(
+                    f"Profiled {scope['method']} {scope['path']} in {elapsed:.3f}s "
+                    f"as {profile_id}, {sampler.samples} samples, "
+                    f"{self._overlapping} requests overlapped"
+                )
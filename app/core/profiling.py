@@ -0,0 +1,155 @@
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import (
+    UTC,
+    datetime,
+)
+from pathlib import Path
+from types import (
+    CodeType,
+    FrameType,
+)
+
+PROFILE_ID = re.compile(r"^[0-9a-f-]+$")
+SAMPLE_INTERVAL = 0.001
+
+
+def _frame_name(code: CodeType, module: str) -> str:
+    return f"{module}:{code.co_qualname}".replace(";", ":")
+
+
+class _SwitchInterval:
+    """The interpreter's switch interval, shortened while any sampler runs.
+
+    It is process wide: overlapping samplers share the shortest one asked for,
+    the last of them to stop restores the original.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._original = sys.getswitchinterval()
+
+    def shorten(self, interval: float) -> None:
+        with self._lock:
+            if self._users == 0:
+                self._original = sys.getswitchinterval()
+            self._users += 1
+            sys.setswitchinterval(min(interval, sys.getswitchinterval()))
+
+    def restore(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                sys.setswitchinterval(self._original)
+
+
+_switch_interval = _SwitchInterval()
+
+
+class StackSampler:
+    """Stacks of one thread sampled from a background thread, e.g. the event loop's.
+
+    Samples cover everything the thread runs meanwhile: coroutines of other
+    tasks too, and the event loop itself while it waits on I/O.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter[tuple[CodeType, ...]] = Counter()
+        self._modules: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        # a busy thread only lets the sampler in at its switch interval
+        _switch_interval.shorten(self.interval)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        _switch_interval.restore()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def _sample(self, frame: FrameType | None) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code not in self._modules:
+                self._modules[code] = frame.f_globals.get("__name__", "?")
+            stack.append(code)
+            frame = frame.f_back
+        self._stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        """Stacks in the folded format of flamegraph.pl, speedscope and inferno."""
+        lines = []
+        for stack, count in self._stacks.items():
+            names = ";".join(_frame_name(code, self._modules[code]) for code in stack)
+            lines.append(f"{names} {count}\n")
+        return "".join(lines)
+
+
+class ProfileStore:
+    """Request profiles as folded stacks files in a directory, the newest ``keep``.
+
+    Workers sharing the directory see each other's profiles.
+    """
+
+    def __init__(self, directory: Path, keep: int):
+        self.directory = directory
+        self.keep = keep
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.now(UTC):%Y%m%d-%H%M%S}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, profile_id: str) -> Path | None:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        return path if path.is_file() else None
+
+    def save(self, profile_id: str, folded: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile_id}.folded"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(folded)
+        temporary.replace(path)
+        for stale in self._paths()[self.keep :]:
+            stale.unlink(missing_ok=True)
+
+    def _paths(self) -> list[Path]:
+        """Profiles, newest first."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.folded"), reverse=True)
+
+    def list(self) -> list[dict]:
+        profiles = []
+        for path in self._paths():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            profiles.append(
+                {
+                    "id": path.stem,
+                    "created_at": datetime.fromtimestamp(stat.st_mtime, UTC),
+                    "size": stat.st_size,
+                }
+            )
+        return profiles
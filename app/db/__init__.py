@@ -1,7 +1,16 @@
+from sqlalchemy import (
+    DDL,
+    event,
+)
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
+# gin_trgm_ops of the policy number index lives in pg_trgm
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
 
 class RecordAlreadyExistsError(Exception):
     pass
@@ -1,184 +1,699 @@
+import asyncio
+import itertools
 import logging
-from datetime import datetime
+import os
+from contextlib import (
+    AsyncExitStack,
+    asynccontextmanager,
+)
+from contextvars import ContextVar
+from typing import (
+    AsyncIterator,
+    Collection,
+    Iterable,
+    Sequence,
+)
 from uuid import UUID
 
+import asyncpg
 from sqlalchemy import (
-    and_,
+    ARRAY,
+    BindParameter,
+    ColumnElement,
+    Row,
+    any_,
+    bindparam,
     func,
     select,
+    text,
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import (
+    DBAPIError,
     IntegrityError,
+    ProgrammingError,
     SQLAlchemyError,
 )
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
+from app.core.cache import LRUCache
+from app.core.etag import make_etag
 from app.db import Base
+from app.db.explain import (
+    Explain,
+    plan_from_result,
+)
+from app.db.metrics import (
+    instrument_queries,
+    timed,
+)
 from app.db.models.address_dbo import AddressDBO
 from app.db.models.coverage_dbo import CoverageDBO
 from app.db.models.person_dbo import PersonDBO
 from app.db.models.policy_dbo import PolicyDBO
 from app.db.models.premium_dbo import PremiumDBO
+from app.db.pagination import (
+    PageCursor,
+    PolicyPage,
+    PolicyVersion,
+)
+from app.db.policy_queries import (
+    PolicyQueries,
+    PolicyQueryKind,
+    projection_options,
+)
+from app.db.policy_rows import (
+    COVERAGES_SELECT,
+    coverages_by_policy,
+    policy_from_row,
+    wants_coverages,
+)
+from app.db.pool import InstrumentedAsyncPool
+from app.db.slow_queries import SlowQueryLog
+from app.db.storage import SerializedPolicy
+from app.models.coverage import Coverage
 from app.models.enums import (
-    PolicyStatus,
-    PolicyType,
+    BulkItemStatus,
+    ReadPath,
+    TotalCountMode,
 )
+from app.models.person import Person
 from app.models.policy import Policy
+from app.models.policy_filter import PolicyFilter
 
 LOG = logging.getLogger(__name__)
 
+# Reads in this context go to the primary, so a caller sees its own writes
+# regardless of replication lag
+READ_FROM_PRIMARY: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+# NOTIFY channel carrying the numbers of written policies, to evict them from
+# every worker's policy cache
+POLICY_CHANGES_CHANNEL = "policy_changes"
+POLICY_LISTENER_RETRY_DELAY = 5.0
+
+
+# Advisory lock key serializing schema creation and migrations between processes
+SCHEMA_LOCK_ID = 4_172_907_305_918_264
+
+# Seconds between checks for connections still checked out while draining
+DRAIN_POLL_INTERVAL = 0.1
+
+
+def _array(values: list, column: ColumnElement) -> BindParameter:
+    """Values of a column as one array parameter, one statement for any length."""
+    return bindparam("keys", values, type_=ARRAY(column.type))
+
+
+def _page_cursor(policy: PolicyDBO | Row, backward: bool = False) -> str:
+    return PageCursor(
+        created_at=policy.created_at, id=policy.id, backward=backward
+    ).encode()
+
+
+class _Replica:
+    def __init__(self, server: str, engine: AsyncEngine):
+        self.server = server
+        self.engine = engine
+        self.async_session = _session_maker(engine)
+        self.healthy = True
+
+
+def _session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        join_transaction_mode="rollback_only",
+    )
+
 
 class AsyncDBApi:
-    def __init__(self, db_server: str, database: str, user_name: str, password: str):
+    """PolicyStorage on Postgres, with read replicas and a policy cache."""
+
+    def __init__(
+        self,
+        db_server: str,
+        database: str,
+        user_name: str,
+        password: str,
+        replica_servers: list[str] | None = None,
+        replica_health_check_interval: float = 5.0,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 3600,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 100,
+        policy_cache_size: int = 10000,
+        policy_cache_ttl: float = 60.0,
+        slow_query_threshold: float | None = None,
+        slow_query_explain_sample_rate: float = 0.0,
+        slow_query_statements: int = 100,
+    ):
         self._db_server = db_server
         self._database = database
         self._username = user_name
         self._password = password
+        self._replica_servers = replica_servers or []
+        self._replica_health_check_interval = replica_health_check_interval
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_timeout = pool_timeout
+        self._pool_recycle = pool_recycle
+        self._pool_pre_ping = pool_pre_ping
+        self._statement_cache_size = statement_cache_size
         self._engine = None
         self._async_session = None
+        self._replicas: list[_Replica] = []
+        self._replica_turn = itertools.count()
+        self._replica_monitor: asyncio.Task | None = None
         self._configs = {}
+        self._queries = PolicyQueries()
+        self._policy_cache: LRUCache[str, SerializedPolicy] = LRUCache(
+            policy_cache_size, policy_cache_ttl
+        )
+        # bumped on every eviction, so a read racing a write is not cached
+        self._policy_changes = 0
+        self._policy_listener: asyncio.Task | None = None
+        self._listening = False
+        self._slow_queries = None
+        if slow_query_threshold is not None:
+            self._slow_queries = SlowQueryLog(
+                slow_query_threshold,
+                slow_query_explain_sample_rate,
+                slow_query_statements,
+            )
+
+    def _create_engine(self, db_server: str) -> AsyncEngine:
+        sqlalchemy_database_uri = (
+            f"postgresql+asyncpg://{self._username}:{self._password}@{db_server}/{self._database}"
+            f"?prepared_statement_cache_size={self._statement_cache_size}"
+        )
+        engine = create_async_engine(
+            sqlalchemy_database_uri,
+            poolclass=InstrumentedAsyncPool,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_timeout=self._pool_timeout,
+            pool_recycle=self._pool_recycle,
+            pool_pre_ping=self._pool_pre_ping,
+            connect_args={
+                "server_settings": {"jit": "off"},
+                "statement_cache_size": self._statement_cache_size,
+            },
+        )
+        self._queries.instrument(engine.sync_engine)
+        instrument_queries(engine.sync_engine)
+        if self._slow_queries is not None:
+            self._slow_queries.instrument(engine)
+        return engine
 
     async def connect(self) -> None:
-        sqlalchemy_database_uri = f"postgresql+asyncpg://{self._username}:{self._password}@{self._db_server}/{self._database}"
         try:
-            self._engine = create_async_engine(
-                sqlalchemy_database_uri,
-                pool_recycle=3600,
-                connect_args={"server_settings": {"jit": "off"}},
-                pool_pre_ping=True,
-            )
+            self._engine = self._create_engine(self._db_server)
         except Exception as e:
             LOG.error(f"DB engine creation error: {e}.")
         try:
-            self._async_session = async_sessionmaker(
-                self._engine,
-                expire_on_commit=False,
-                class_=AsyncSession,
-                join_transaction_mode="rollback_only",
-            )
+            self._async_session = _session_maker(self._engine)
         except Exception as e:
             LOG.error(f"Creating an async_sessionmaker failed: {e}.")
+        for db_server in self._replica_servers:
+            try:
+                self._replicas.append(
+                    _Replica(db_server, self._create_engine(db_server))
+                )
+            except Exception as e:
+                LOG.error(f"Replica {db_server} engine creation error: {e}.")
+        if self._replicas:
+            await self._check_replicas()
+            self._replica_monitor = asyncio.create_task(self._monitor_replicas())
+        if self._policy_cache.maxsize > 0:
+            self._policy_listener = asyncio.create_task(
+                self._listen_for_policy_changes()
+            )
+
+    async def _check_replicas(self) -> None:
+        healthy = await asyncio.gather(
+            *(self._is_healthy(replica) for replica in self._replicas)
+        )
+        for replica, is_healthy in zip(self._replicas, healthy, strict=True):
+            if is_healthy != replica.healthy:
+                state = "back in rotation" if is_healthy else "out of rotation"
+                LOG.warning(f"Replica {replica.server} health changed, {state}")
+            replica.healthy = is_healthy
+
+    async def _is_healthy(self, replica: _Replica) -> bool:
+        try:
+            async with asyncio.timeout(self._replica_health_check_interval):
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            LOG.debug(f"Replica {replica.server} health check failed: {e}")
+            return False
+        return True
+
+    async def _monitor_replicas(self) -> None:
+        while True:
+            await asyncio.sleep(self._replica_health_check_interval)
+            await self._check_replicas()
 
-    async def close(self) -> None:
-        if self._engine:
-            await self._engine.dispose()
+    async def _listen_for_policy_changes(self) -> None:
+        """Evict the policies announced on POLICY_CHANGES_CHANNEL by any worker.
 
-    async def create_all(self) -> None:
-        async with self._engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        Notifications sent while not listening are lost, so the cache is
+        emptied and bypassed until the listening connection is back.
+        """
+        while True:
+            closed = asyncio.Event()
+            conn = None
+            try:
+                conn = await asyncpg.connect(
+                    f"postgresql://{self._username}:{self._password}@{self._db_server}/{self._database}"
+                )
+                conn.add_termination_listener(lambda _, closed=closed: closed.set())
+                await conn.add_listener(POLICY_CHANGES_CHANNEL, self._on_policy_change)
+                self._evict_policies()
+                self._listening = True
+                await closed.wait()
+                LOG.warning("Policy change listener disconnected, bypassing cache")
+            except Exception as e:
+                LOG.warning(f"Policy change listener failed: {e}")
+            finally:
+                self._listening = False
+                if conn is not None and not conn.is_closed():
+                    await conn.close(timeout=1)
+            await asyncio.sleep(POLICY_LISTENER_RETRY_DELAY)
+
+    def _on_policy_change(self, conn, pid: int, channel: str, payload: str) -> None:
+        self._evict_policies([payload])
+
+    def _evict_policies(self, policy_numbers: Iterable[str] | None = None) -> None:
+        """Drop the given policies from the cache, or all of them."""
+        self._policy_changes += 1
+        if policy_numbers is None:
+            self._policy_cache.clear()
+            return
+        for policy_number in policy_numbers:
+            self._policy_cache.pop(policy_number)
+
+    async def _announce_policy_changes(
+        self, session: AsyncSession, policy_numbers: list[str]
+    ) -> None:
+        """Queue a cache eviction notice per policy, sent when the transaction commits."""
+        if not policy_numbers:
+            return
+        numbers = _array(policy_numbers, PolicyDBO.policy_number)
+        await session.execute(
+            select(func.pg_notify(POLICY_CHANGES_CHANNEL, func.unnest(numbers)))
+        )
+
+    def _read_session(self) -> AsyncSession:
+        """Session on the next healthy replica in turn, or on the primary.
+
+        The primary serves reads when no replica is healthy or when the current
+        context asked to read its own writes (READ_FROM_PRIMARY).
+        """
+        if self._replicas and not READ_FROM_PRIMARY.get():
+            for _ in range(len(self._replicas)):
+                replica = self._replicas[next(self._replica_turn) % len(self._replicas)]
+                if replica.healthy:
+                    return replica.async_session()
+        return self._async_session()
+
+    def _engines(self) -> list[AsyncEngine]:
+        engines = [self._engine] if self._engine is not None else []
+        return engines + [replica.engine for replica in self._replicas]
+
+    async def _drain(self, timeout: float) -> None:
+        """Wait up to timeout seconds for checked out connections to be returned."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            checked_out = sum(engine.pool.checkedout() for engine in self._engines())
+            if not checked_out:
+                return
+            if loop.time() >= deadline:
+                LOG.warning(f"Closing with {checked_out} connections still in use")
+                return
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        if self._replica_monitor:
+            self._replica_monitor.cancel()
+        if self._policy_listener:
+            self._policy_listener.cancel()
+        if self._slow_queries is not None:
+            await self._slow_queries.close()
+        await self._drain(drain_timeout)
+        for engine in self._engines():
+            await engine.dispose()
+
+    @asynccontextmanager
+    async def schema_lock(self) -> AsyncIterator[AsyncConnection]:
+        """Hold the schema advisory lock, waiting for the process holding it.
+
+        Of the worker processes starting together, one at a time gets to create
+        and migrate the schema; the others find it current once they get the lock.
+        Yields the connection holding the lock, the schema work is done on it:
+        a pool of one connection has no other to spare.
+        """
+        async with self._engine.connect() as conn:
+            await conn.execute(select(func.pg_advisory_lock(SCHEMA_LOCK_ID)))
+            # a session level lock, outlives the transaction
+            await conn.commit()
+            try:
+                yield conn
+            finally:
+                await conn.rollback()
+                await conn.execute(select(func.pg_advisory_unlock(SCHEMA_LOCK_ID)))
+                await conn.commit()
+
+    @staticmethod
+    async def schema_revisions(conn: AsyncConnection) -> set[str]:
+        """Alembic revisions the database is at, none before the first migration."""
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            await conn.rollback()
+            return set()
+        revisions = set(result.scalars())
+        await conn.commit()
+        return revisions
+
+    async def prewarm(self, connections: int) -> None:
+        """Open up to the given number of connections of every pool."""
+        for engine in self._engines():
+            count = min(connections, engine.pool.size())
+            try:
+                # held together, so each checkout opens a connection of its own
+                async with AsyncExitStack() as stack:
+                    await asyncio.gather(
+                        *(
+                            stack.enter_async_context(engine.connect())
+                            for _ in range(count)
+                        )
+                    )
+            except Exception as e:
+                LOG.warning(f"Pool prewarm of {engine.url.host} failed: {e}")
+
+    @staticmethod
+    async def create_all(conn: AsyncConnection) -> None:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
 
+    @staticmethod
+    async def ensure_policy_partitions(
+        conn: AsyncConnection, years_ahead: int
+    ) -> list[str]:
+        """Create the missing yearly policy partitions, returning their names.
+
+        Partitions reach years_ahead past the current year, years whose rows the
+        default partition took get theirs too, the rows moved into it.
+        """
+        result = await conn.execute(select(func.policy_ensure_partitions(years_ahead)))
+        created = list(result.scalars())
+        await conn.commit()
+        return created
+
+    async def _upsert_persons(
+        self, session: AsyncSession, persons: Iterable[Person]
+    ) -> dict[str, UUID]:
+        """Person ids by id_number, inserting the unknown persons with their address.
+
+        Known persons are reused as they are, the details given here do not
+        overwrite theirs (nor the policies and caches showing them).
+        """
+        new: dict[str, Person] = {}
+        for person in persons:
+            new.setdefault(person.id_number, person)
+        if not new:
+            return {}
+        stmt = (
+            pg_insert(PersonDBO)
+            .on_conflict_do_nothing(index_elements=[PersonDBO.id_number])
+            .returning(PersonDBO.id_number, PersonDBO.id)
+        )
+        result = await session.execute(
+            stmt,
+            [
+                {
+                    "id_number": person.id_number,
+                    "first_name": person.first_name,
+                    "last_name": person.last_name,
+                    "date_of_birth": person.date_of_birth,
+                    "email": person.email,
+                    "phone": person.phone,
+                }
+                for person in new.values()
+            ],
+        )
+        person_ids = {row.id_number: row.id for row in result}
+        for id_number, person_id in person_ids.items():
+            address = AddressDBO.from_model(new[id_number].address)
+            address.person_id = person_id
+            session.add(address)
+        known = [id_number for id_number in new if id_number not in person_ids]
+        if known:
+            stmt = select(PersonDBO.id_number, PersonDBO.id).where(
+                PersonDBO.id_number == any_(_array(known, PersonDBO.id_number))
+            )
+            person_ids.update(
+                {row.id_number: row.id for row in await session.execute(stmt)}
+            )
+        return person_ids
+
+    async def _add_policies(
+        self, session: AsyncSession, policies: list[Policy]
+    ) -> None:
+        person_ids = await self._upsert_persons(
+            session, (policy.policyholder for policy in policies)
+        )
+        session.add_all(
+            PolicyDBO.from_model(policy, person_ids[policy.policyholder.id_number])
+            for policy in policies
+        )
+
+    @timed
     async def create_insurance_policy(self, policy: Policy) -> None:
         try:
             async with self._async_session() as session:
-                policy_dbo = PolicyDBO.from_model(policy)
-                session.add(policy_dbo)
+                await self._add_policies(session, [policy])
+                await self._announce_policy_changes(session, [policy.policy_number])
                 await session.commit()
+            self._evict_policies([policy.policy_number])
         except SQLAlchemyError as e:
             raise e
         except IntegrityError as e:
             raise e
 
+    @timed
+    async def bulk_create_insurance_policies(
+        self, policies: list[Policy]
+    ) -> list[BulkItemStatus]:
+        """Insert a batch of policies in one transaction, skipping taken numbers.
+
+        Returns a status per input policy; repeated numbers within the batch are
+        conflicts of their first occurrence, rows failing otherwise errors.
+        """
+        statuses = [BulkItemStatus.CONFLICT] * len(policies)
+        async with self._async_session() as session:
+            stmt = select(PolicyDBO.policy_number).where(
+                PolicyDBO.policy_number.in_({p.policy_number for p in policies})
+            )
+            taken = set((await session.execute(stmt)).scalars())
+            fresh: dict[str, int] = {}
+            for index, policy in enumerate(policies):
+                if policy.policy_number not in taken:
+                    fresh.setdefault(policy.policy_number, index)
+            if not fresh:
+                # every number is taken, nothing to write
+                return statuses
+            try:
+                await self._add_policies(session, [policies[i] for i in fresh.values()])
+                await self._announce_policy_changes(session, list(fresh))
+                await session.commit()
+            except DBAPIError as e:
+                # a concurrent writer took some of the numbers, or some rows
+                # fail otherwise, retry one by one
+                LOG.warning(f"Bulk insert failed, retrying row by row: {e}")
+                await session.rollback()
+                for index in list(fresh.values()):
+                    try:
+                        async with session.begin_nested():
+                            await self._add_policies(session, [policies[index]])
+                    except IntegrityError:
+                        fresh.pop(policies[index].policy_number)
+                    except DBAPIError as e:
+                        LOG.error(
+                            f"Inserting policy {policies[index].policy_number} failed: {e}"
+                        )
+                        fresh.pop(policies[index].policy_number)
+                        statuses[index] = BulkItemStatus.ERROR
+                await self._announce_policy_changes(session, list(fresh))
+                await session.commit()
+        self._evict_policies(fresh)
+        for index in fresh.values():
+            statuses[index] = BulkItemStatus.CREATED
+        return statuses
+
+    @timed
     async def get_policies_filtered_with_pagination(
         self,
-        expiration_date_from: datetime,
-        expiration_date_to: datetime,
-        effective_date_from: datetime,
-        effective_date_to: datetime,
+        policy_filter: PolicyFilter,
         page: int,
         page_size: int,
-        policy_number: str | None,
-        policyholder_id_number: str,
-        policy_type: PolicyType | None,
-        policy_status: PolicyStatus | None,
-    ) -> tuple[list, int]:
+        cursor: PageCursor | None = None,
+        include_total: TotalCountMode = TotalCountMode.EXACT,
+        fields: Collection[str] | None = None,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> PolicyPage:
         page = page - 1 if page > 0 else 0
         page_size = page_size if page_size > 0 else 10
+        # a window count rides along with the page, unless the seek predicate
+        # of a cursor would narrow it down to the rows past the cursor
+        windowed_count = include_total == TotalCountMode.EXACT and cursor is None
+        if cursor is None:
+            kind = (
+                PolicyQueryKind.PAGE_COUNTED if windowed_count else PolicyQueryKind.PAGE
+            )
+        elif cursor.backward:
+            kind = PolicyQueryKind.PAGE_BEFORE
+        else:
+            kind = PolicyQueryKind.PAGE_AFTER
+        stmt, params = self._queries.statement(kind, policy_filter, fields, read_path)
+        # one extra row tells whether there is a further page in that direction
+        page_params = {**params, "limit": page_size + 1}
+        if cursor is None:
+            page_params["offset"] = page * page_size
+        else:
+            page_params["cursor_created_at"] = cursor.created_at
+            page_params["cursor_id"] = cursor.id
         try:
-            async with self._async_session() as session:
-                count_stmt = select(func.count(PolicyDBO.id)).where(
-                    and_(
-                        PolicyDBO.effective_date >= effective_date_from
-                        if effective_date_from is not None
-                        else True,
-                        PolicyDBO.effective_date <= effective_date_to
-                        if effective_date_to is not None
-                        else True,
-                        PolicyDBO.expiration_date >= expiration_date_from
-                        if expiration_date_from is not None
-                        else True,
-                        PolicyDBO.expiration_date <= expiration_date_to
-                        if expiration_date_to is not None
-                        else True,
-                        PolicyDBO.policyholder.has(
-                            PersonDBO.id_number == policyholder_id_number
-                        )
-                        if policyholder_id_number is not None
-                        else True,
-                        PolicyDBO.policy_number.like(f"%{policy_number}%")
-                        if policy_number is not None
-                        else True,
-                        PolicyDBO.type == policy_type
-                        if policy_type is not None
-                        else True,
-                        PolicyDBO.status == policy_status
-                        if policy_status is not None
-                        else True,
+            async with self._read_session() as session:
+                result = await session.execute(stmt, page_params)
+                rows = result.all()
+                if read_path == ReadPath.CORE:
+                    policies: list[PolicyDBO | Row] = list(rows)
+                    coverages = await self._core_coverages(session, rows, fields)
+                else:
+                    policies = [row[0] for row in rows]
+                if windowed_count and rows:
+                    version = PolicyVersion(rows[0].newest, rows[0].total_count)
+                    total_count = version.count
+                else:
+                    version, total_count = await self._total_count(
+                        session, policy_filter, include_total
                     )
-                )
-                count_result = await session.execute(count_stmt)
-                total_count = count_result.scalar()
-                stmt = (
-                    select(PolicyDBO)
-                    .where(
-                        and_(
-                            PolicyDBO.effective_date >= effective_date_from
-                            if effective_date_from is not None
-                            else True,
-                            PolicyDBO.effective_date <= effective_date_to
-                            if effective_date_to is not None
-                            else True,
-                            PolicyDBO.expiration_date >= expiration_date_from
-                            if expiration_date_from is not None
-                            else True,
-                            PolicyDBO.expiration_date <= expiration_date_to
-                            if expiration_date_to is not None
-                            else True,
-                            PolicyDBO.policyholder.has(
-                                PersonDBO.id_number == policyholder_id_number
-                            )
-                            if policyholder_id_number is not None
-                            else True,
-                            PolicyDBO.policy_number.like(f"%{policy_number}%")
-                            if policy_number is not None
-                            else True,
-                            PolicyDBO.type == policy_type
-                            if policy_type is not None
-                            else True,
-                            PolicyDBO.status == policy_status
-                            if policy_status is not None
-                            else True,
-                        )
-                    )
-                    .order_by(PolicyDBO.created_at.desc())
-                    .offset(page * page_size)
-                    .limit(page_size)
-                )
-                result = await session.execute(stmt)
-                policies: list[PolicyDBO] = result.scalars().all()
         except SQLAlchemyError as e:
             LOG.error(e)
-            return [], 0
-        policies = [policy.to_model() for policy in policies]
-        return policies, total_count
+            return PolicyPage(policies=[], total_count=0)
+        has_more = len(policies) > page_size
+        policies = policies[:page_size]
+        if cursor is not None and cursor.backward:
+            policies.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = cursor is not None or page > 0, has_more
+        if read_path == ReadPath.CORE:
+            models = [
+                policy_from_row(row, fields, coverages.get(row.id)) for row in policies
+            ]
+        else:
+            models = [
+                policy.construct_model()
+                if fields is None
+                else policy.to_partial_model(fields)
+                for policy in policies
+            ]
+        return PolicyPage(
+            policies=models,
+            total_count=total_count,
+            next_cursor=_page_cursor(policies[-1]) if policies and has_next else None,
+            prev_cursor=_page_cursor(policies[0], backward=True)
+            if policies and has_prev
+            else None,
+            version=version,
+        )
+
+    @timed
+    async def get_policies_version(self, policy_filter: PolicyFilter) -> PolicyVersion:
+        """Newest creation time and count of the filtered policies."""
+        async with self._read_session() as session:
+            return await self._version(session, policy_filter)
+
+    async def _version(
+        self, session: AsyncSession, policy_filter: PolicyFilter
+    ) -> PolicyVersion:
+        stmt, params = self._queries.statement(PolicyQueryKind.VERSION, policy_filter)
+        result = await session.execute(stmt, params)
+        return PolicyVersion(*result.one())
 
+    async def _total_count(
+        self,
+        session: AsyncSession,
+        policy_filter: PolicyFilter,
+        include_total: TotalCountMode,
+    ) -> tuple[PolicyVersion | None, int | None]:
+        """Total count of the filtered policies, and their version if it came along."""
+        if include_total == TotalCountMode.EXACT:
+            version = await self._version(session, policy_filter)
+            return version, version.count
+        if include_total == TotalCountMode.ESTIMATED:
+            stmt, params = self._queries.statement(PolicyQueryKind.IDS, policy_filter)
+            result = await session.execute(Explain(stmt), params)
+            return None, plan_from_result(result.scalar())["Plan Rows"]
+        return None, None
+
+    @timed
+    async def stream_policies(
+        self,
+        policy_filter: PolicyFilter,
+        batch_size: int = 1000,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> AsyncIterator[Policy]:
+        """Filtered policies in listing order, read through a server-side cursor."""
+        stmt, params = self._queries.statement(
+            PolicyQueryKind.EXPORT, policy_filter, read_path=read_path
+        )
+        async with self._read_session() as session:
+            result = await session.stream(
+                stmt, params, execution_options={"yield_per": batch_size}
+            )
+            if read_path == ReadPath.CORE:
+                async for rows in result.partitions():
+                    coverages = await self._core_coverages(session, rows)
+                    for row in rows:
+                        yield policy_from_row(row, coverages=coverages.get(row.id))
+                return
+            async for policies in result.scalars().partitions():
+                for policy in policies:
+                    yield policy.construct_model()
+
+    async def _core_coverages(
+        self,
+        session: AsyncSession,
+        rows: Sequence[Row],
+        fields: Collection[str] | None = None,
+    ) -> dict[UUID, list[Coverage]]:
+        """Coverages of core read path policy rows, in one query."""
+        if not rows or not wants_coverages(fields):
+            return {}
+        result = await session.execute(
+            COVERAGES_SELECT, {"policy_ids": [row.id for row in rows]}
+        )
+        return coverages_by_policy(result)
+
+    @timed
     async def get_all_policies(self) -> list[PolicyDBO]:
         try:
-            async with self._async_session() as session:
+            async with self._read_session() as session:
                 stmt = select(PolicyDBO)
                 result = await session.execute(stmt)
                 policies = result.scalars().all()
@@ -187,10 +702,15 @@ class AsyncDBApi:
         else:
             return policies
 
-    async def get_single_policy_by_number(self, policy_number: str) -> PolicyDBO:
+    @timed
+    async def get_single_policy_by_number(
+        self, policy_number: str, fields: Collection[str] | None = None
+    ) -> PolicyDBO:
         try:
-            async with self._async_session() as session:
+            async with self._read_session() as session:
                 stmt = select(PolicyDBO).where(PolicyDBO.policy_number == policy_number)
+                if fields is not None:
+                    stmt = stmt.options(*projection_options(fields))
                 result = await session.execute(stmt)
                 policy = result.scalars().first()
         except SQLAlchemyError as e:
@@ -198,9 +718,38 @@ class AsyncDBApi:
         else:
             return policy
 
+    @timed
+    async def get_single_policy_json(
+        self, policy_number: str, fields: Collection[str] | None = None
+    ) -> SerializedPolicy | None:
+        """Serialized policy and its ETag, read through the in-process policy cache.
+
+        Projections to some fields only are read from the database, uncached.
+        """
+        if fields is not None:
+            policy = await self.get_single_policy_by_number(policy_number, fields)
+            if policy is None:
+                return None
+            body = policy.to_partial_model(fields).model_dump_json(include=set(fields))
+            return SerializedPolicy(body=body.encode(), etag=make_etag(body))
+        if self._listening:
+            cached = self._policy_cache.get(policy_number)
+            if cached is not None:
+                return cached
+        changes = self._policy_changes
+        policy = await self.get_single_policy_by_number(policy_number)
+        if policy is None:
+            return None
+        body = policy.construct_model().model_dump_json().encode()
+        serialized = SerializedPolicy(body=body, etag=make_etag(body))
+        if self._listening and changes == self._policy_changes:
+            self._policy_cache.set(policy_number, serialized)
+        return serialized
+
+    @timed
     async def get_single_address(self, person_id: UUID) -> AddressDBO:
         try:
-            async with self._async_session() as session:
+            async with self._read_session() as session:
                 stmt = select(AddressDBO).where(AddressDBO.person_id == person_id)
                 result = await session.execute(stmt)
                 address = result.scalars().first()
@@ -209,9 +758,10 @@ class AsyncDBApi:
         else:
             return address
 
+    @timed
     async def get_single_person(self, id_number: str) -> PersonDBO:
         try:
-            async with self._async_session() as session:
+            async with self._read_session() as session:
                 stmt = select(PersonDBO).where(PersonDBO.id_number == id_number)
                 result = await session.execute(stmt)
                 person = result.scalars().first()
@@ -220,9 +770,10 @@ class AsyncDBApi:
         else:
             return person
 
+    @timed
     async def get_single_premium(self, policy_id: UUID) -> PremiumDBO:
         try:
-            async with self._async_session() as session:
+            async with self._read_session() as session:
                 stmt = select(PremiumDBO).where(PremiumDBO.policy_id == policy_id)
                 result = await session.execute(stmt)
                 premium = result.scalars().first()
@@ -231,10 +782,15 @@ class AsyncDBApi:
         else:
             return premium
 
+    @timed
     async def get_coverages(self, policy_id) -> list[CoverageDBO]:
         try:
-            async with self._async_session() as session:
-                stmt = select(CoverageDBO).where(CoverageDBO.policy_id == policy_id)
+            async with self._read_session() as session:
+                stmt = (
+                    select(CoverageDBO)
+                    .where(CoverageDBO.policy_id == policy_id)
+                    .order_by(CoverageDBO.position)
+                )
                 result = await session.execute(stmt)
                 coverages = result.scalars().all()
         except SQLAlchemyError as e:
@@ -242,6 +798,107 @@ class AsyncDBApi:
         else:
             return coverages
 
+    @timed
+    async def get_persons_by_id_numbers(
+        self, id_numbers: list[str]
+    ) -> dict[str, PersonDBO]:
+        try:
+            async with self._read_session() as session:
+                stmt = select(PersonDBO).where(
+                    PersonDBO.id_number == any_(_array(id_numbers, PersonDBO.id_number))
+                )
+                result = await session.execute(stmt)
+                persons = result.scalars().all()
+        except SQLAlchemyError as e:
+            raise e
+        else:
+            return {person.id_number: person for person in persons}
+
+    @timed
+    async def get_addresses_by_person_ids(
+        self, person_ids: list[UUID]
+    ) -> dict[UUID, AddressDBO]:
+        try:
+            async with self._read_session() as session:
+                stmt = select(AddressDBO).where(
+                    AddressDBO.person_id
+                    == any_(_array(person_ids, AddressDBO.person_id))
+                )
+                result = await session.execute(stmt)
+                addresses = result.scalars().all()
+        except SQLAlchemyError as e:
+            raise e
+        else:
+            return {address.person_id: address for address in addresses}
+
+    @timed
+    async def get_premiums_by_policy_ids(
+        self, policy_ids: list[UUID]
+    ) -> dict[UUID, PremiumDBO]:
+        try:
+            async with self._read_session() as session:
+                stmt = select(PremiumDBO).where(
+                    PremiumDBO.policy_id
+                    == any_(_array(policy_ids, PremiumDBO.policy_id))
+                )
+                result = await session.execute(stmt)
+                premiums = result.scalars().all()
+        except SQLAlchemyError as e:
+            raise e
+        else:
+            return {premium.policy_id: premium for premium in premiums}
+
+    @timed
+    async def get_coverages_by_policy_ids(
+        self, policy_ids: list[UUID]
+    ) -> dict[UUID, list[CoverageDBO]]:
+        try:
+            async with self._read_session() as session:
+                stmt = (
+                    select(CoverageDBO)
+                    .where(
+                        CoverageDBO.policy_id
+                        == any_(_array(policy_ids, CoverageDBO.policy_id))
+                    )
+                    .order_by(CoverageDBO.policy_id, CoverageDBO.position)
+                )
+                result = await session.execute(stmt)
+                coverages = result.scalars().all()
+        except SQLAlchemyError as e:
+            raise e
+        else:
+            by_policy = {policy_id: [] for policy_id in policy_ids}
+            for coverage in coverages:
+                by_policy[coverage.policy_id].append(coverage)
+            return by_policy
+
+    def pool_status(self) -> dict:
+        """Connection usage and checkout waits of this process' pools."""
+        status = {"pid": os.getpid(), "replicas": {}}
+        if self._engine is not None:
+            status["primary"] = self._engine.pool.stats()
+        for replica in self._replicas:
+            status["replicas"][replica.server] = replica.engine.pool.stats()
+        return status
+
+    def query_cache_status(self) -> dict:
+        """Reuse of the canonical policy listing statements and policy cache hits."""
+        return {
+            "pid": os.getpid(),
+            **self._queries.stats(),
+            "policy_cache": {**self._policy_cache.stats(), "live": self._listening},
+        }
+
+    def slow_queries(self, limit: int) -> dict:
+        """The slowest statement shapes this process has run, with their latest plans."""
+        if self._slow_queries is None:
+            return {"pid": os.getpid(), "threshold_seconds": None, "statements": []}
+        return {
+            "pid": os.getpid(),
+            "threshold_seconds": self._slow_queries.threshold,
+            "statements": self._slow_queries.top(limit),
+        }
+
     def get_engine(self) -> AsyncEngine:
         if self._engine is None:
             raise ValueError("Engine is not initialized.")
@@ -0,0 +1,33 @@
+import json
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import (
+    ClauseElement,
+    Executable,
+)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, executable like the statement itself."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def explain_from_result(value: str | list) -> dict:
+    """``EXPLAIN (FORMAT JSON)`` result value: the plan, plus timings when analyzed."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value[0]
+
+
+def plan_from_result(value: str | list) -> dict:
+    """Top-level plan node of an ``EXPLAIN (FORMAT JSON)`` result value."""
+    return explain_from_result(value)["Plan"]
@@ -0,0 +1,89 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    TypeVar,
+)
+from uuid import UUID
+
+from app.db.async_db_api import AsyncDBApi
+from app.db.models.address_dbo import AddressDBO
+from app.db.models.coverage_dbo import CoverageDBO
+from app.db.models.person_dbo import PersonDBO
+from app.db.models.premium_dbo import PremiumDBO
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Loads keys through one batch call per event loop tick, caching the results.
+
+    Keys requested by any coroutine before the loop gets to the scheduled
+    dispatch share one call of batch_fn, which maps the keys it found to their
+    values. Missing keys load as None, failed batches are not cached.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]]):
+        self._batch_fn = batch_fn
+        self._cache: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+        self._batches: set[asyncio.Task] = set()
+        self.batch_count = 0
+
+    def load(self, key: K) -> Awaitable[V | None]:
+        future = self._cache.get(key)
+        if future is None or future.cancelled():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        self.batch_count += 1
+        task = asyncio.create_task(self._load_batch(keys))
+        # the loop only keeps weak references to tasks
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _load_batch(self, keys: list[K]) -> None:
+        try:
+            values = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+class DBLoaders:
+    """Batching loaders of one request, see deps.get_loaders."""
+
+    def __init__(self, async_db_api: AsyncDBApi):
+        self.person: BatchLoader[str, PersonDBO] = BatchLoader(
+            async_db_api.get_persons_by_id_numbers
+        )
+        self.address: BatchLoader[UUID, AddressDBO] = BatchLoader(
+            async_db_api.get_addresses_by_person_ids
+        )
+        self.premium: BatchLoader[UUID, PremiumDBO] = BatchLoader(
+            async_db_api.get_premiums_by_policy_ids
+        )
+        self.coverages: BatchLoader[UUID, list[CoverageDBO]] = BatchLoader(
+            async_db_api.get_coverages_by_policy_ids
+        )
@@ -0,0 +1,271 @@
+"""PolicyStorage kept in process memory, with secondary indexes.
+
+Hermetic stand-in for AsyncDBApi in tests and benchmarks, and a reference
+to diff its results against: filtering, ordering, pagination and write
+conflicts follow the Postgres implementation.
+"""
+
+import bisect
+from collections import defaultdict
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Collection,
+    Hashable,
+    NamedTuple,
+    Sequence,
+)
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.etag import make_etag
+from app.db.pagination import (
+    PageCursor,
+    PolicyPage,
+    PolicyVersion,
+)
+from app.db.storage import SerializedPolicy
+from app.models.enums import (
+    BulkItemStatus,
+    ReadPath,
+    TotalCountMode,
+)
+from app.models.person import Person
+from app.models.policy import Policy
+from app.models.policy_filter import PolicyFilter
+
+# sorts after every id, for inclusive upper bounds on (date, id) keys
+_LAST_ID = UUID(int=(1 << 128) - 1)
+
+
+class _Key(NamedTuple):
+    value: datetime
+    id: UUID
+
+
+class _SortedIndex:
+    """(value, id) keys in ascending order, for range lookups."""
+
+    def __init__(self):
+        self.keys: list[_Key] = []
+
+    def add(self, keys: Sequence[_Key]) -> None:
+        if len(keys) == 1:
+            # shifts the keys after it only, where a sort would compare them all
+            bisect.insort(self.keys, keys[0])
+            return
+        # sorted once for the batch, appended runs are merged in linear time
+        self.keys.extend(keys)
+        self.keys.sort()
+
+    def between(self, low: datetime | None, high: datetime | None) -> set[UUID]:
+        start = 0 if low is None else bisect.bisect_left(self.keys, (low,))
+        end = (
+            len(self.keys)
+            if high is None
+            else bisect.bisect_right(self.keys, (high, _LAST_ID))
+        )
+        return {key.id for key in self.keys[start:end]}
+
+
+class _HashIndex:
+    """Ids by an exact value."""
+
+    def __init__(self):
+        self.ids: defaultdict[Hashable, set[UUID]] = defaultdict(set)
+
+    def add(self, value: Hashable, policy_id: UUID) -> None:
+        self.ids[value].add(policy_id)
+
+    def get(self, value: Hashable) -> set[UUID]:
+        return self.ids.get(value, set())
+
+
+class InMemoryPolicyStorage:
+    """PolicyStorage in process memory, see the module docstring.
+
+    Range filters are answered from sorted indexes on the effective, expiration
+    and creation dates, equality filters from hash indexes on status, type and
+    policyholder id_number; the policy_number substring filter scans the
+    numbers. The smallest candidate set is intersected with the others, the
+    unfiltered listing walks the creation date index directly.
+    """
+
+    def __init__(self):
+        self._policies: dict[UUID, Policy] = {}
+        self._created_keys: dict[UUID, _Key] = {}
+        self._by_number: dict[str, UUID] = {}
+        self._persons: dict[str, Person] = {}
+        self._by_created = _SortedIndex()
+        self._by_effective = _SortedIndex()
+        self._by_expiration = _SortedIndex()
+        self._by_status = _HashIndex()
+        self._by_type = _HashIndex()
+        self._by_holder = _HashIndex()
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._policies)
+
+    def _add(self, policies: list[Policy]) -> None:
+        """Index policies whose numbers are known to be free."""
+        added = []
+        for policy in policies:
+            # known persons are reused as they are, like AsyncDBApi's upsert
+            holder = self._persons.setdefault(
+                policy.policyholder.id_number, policy.policyholder
+            )
+            if holder is not policy.policyholder:
+                policy = policy.model_copy(update={"policyholder": holder})
+            policy_id = uuid4()
+            self._policies[policy_id] = policy
+            self._by_number[policy.policy_number] = policy_id
+            self._created_keys[policy_id] = _Key(policy.created_at, policy_id)
+            self._by_status.add(policy.status, policy_id)
+            self._by_type.add(policy.type, policy_id)
+            self._by_holder.add(holder.id_number, policy_id)
+            added.append((policy_id, policy))
+        self._by_created.add([self._created_keys[policy_id] for policy_id, _ in added])
+        self._by_effective.add([_Key(p.effective_date, i) for i, p in added])
+        self._by_expiration.add([_Key(p.expiration_date, i) for i, p in added])
+
+    async def create_insurance_policy(self, policy: Policy) -> None:
+        if policy.policy_number in self._by_number:
+            raise IntegrityError(
+                "INSERT INTO policy",
+                {"policy_number": policy.policy_number},
+                ValueError(f"Policy number {policy.policy_number} is taken"),
+            )
+        self._add([policy])
+
+    async def bulk_create_insurance_policies(
+        self, policies: list[Policy]
+    ) -> list[BulkItemStatus]:
+        statuses = [BulkItemStatus.CONFLICT] * len(policies)
+        fresh: dict[str, int] = {}
+        for index, policy in enumerate(policies):
+            if policy.policy_number not in self._by_number:
+                fresh.setdefault(policy.policy_number, index)
+        self._add([policies[index] for index in fresh.values()])
+        for index in fresh.values():
+            statuses[index] = BulkItemStatus.CREATED
+        return statuses
+
+    def _matching(self, policy_filter: PolicyFilter) -> set[UUID] | None:
+        """Ids of the filtered policies, None when nothing is filtered."""
+        f = policy_filter
+        candidates: list[set[UUID]] = []
+        if f.effective_date_from is not None or f.effective_date_to is not None:
+            candidates.append(
+                self._by_effective.between(f.effective_date_from, f.effective_date_to)
+            )
+        if f.expiration_date_from is not None or f.expiration_date_to is not None:
+            candidates.append(
+                self._by_expiration.between(
+                    f.expiration_date_from, f.expiration_date_to
+                )
+            )
+        if f.policy_status is not None:
+            candidates.append(self._by_status.get(f.policy_status))
+        if f.policy_type is not None:
+            candidates.append(self._by_type.get(f.policy_type))
+        if f.policyholder_id_number is not None:
+            candidates.append(self._by_holder.get(f.policyholder_id_number))
+        if f.policy_number is not None:
+            candidates.append(
+                {
+                    policy_id
+                    for number, policy_id in self._by_number.items()
+                    if f.policy_number in number
+                }
+            )
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def _ordered_keys(self, matching: set[UUID] | None) -> list[_Key]:
+        """Creation keys of the matching policies, ascending."""
+        if matching is None:
+            return self._by_created.keys
+        return sorted(self._created_keys[policy_id] for policy_id in matching)
+
+    async def get_policies_filtered_with_pagination(
+        self,
+        policy_filter: PolicyFilter,
+        page: int,
+        page_size: int,
+        cursor: PageCursor | None = None,
+        include_total: TotalCountMode = TotalCountMode.EXACT,
+        fields: Collection[str] | None = None,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> PolicyPage:
+        page = page - 1 if page > 0 else 0
+        page_size = page_size if page_size > 0 else 10
+        matching = self._matching(policy_filter)
+        keys = self._ordered_keys(matching)
+        if cursor is None:
+            end = len(keys) - page * page_size
+            selected = keys[max(end - page_size, 0) : max(end, 0)][::-1]
+            has_prev, has_next = page > 0, end - page_size > 0
+        else:
+            position = (cursor.created_at, cursor.id)
+            if cursor.backward:
+                start = bisect.bisect_right(keys, position)
+                selected = keys[start : start + page_size][::-1]
+                has_prev, has_next = start + page_size < len(keys), True
+            else:
+                end = bisect.bisect_left(keys, position)
+                selected = keys[max(end - page_size, 0) : end][::-1]
+                has_prev, has_next = True, end - page_size > 0
+        total_count = None
+        if include_total != TotalCountMode.NONE:
+            total_count = len(keys)
+        return PolicyPage(
+            version=_version(keys),
+            policies=[self._policies[key.id] for key in selected],
+            total_count=total_count,
+            next_cursor=_page_cursor(selected[-1]) if selected and has_next else None,
+            prev_cursor=_page_cursor(selected[0], backward=True)
+            if selected and has_prev
+            else None,
+        )
+
+    async def get_policies_version(self, policy_filter: PolicyFilter) -> PolicyVersion:
+        return _version(self._ordered_keys(self._matching(policy_filter)))
+
+    async def stream_policies(
+        self,
+        policy_filter: PolicyFilter,
+        batch_size: int = 1000,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> AsyncIterator[Policy]:
+        for key in reversed(self._ordered_keys(self._matching(policy_filter))):
+            yield self._policies[key.id]
+
+    async def get_single_policy_json(
+        self, policy_number: str, fields: Collection[str] | None = None
+    ) -> SerializedPolicy | None:
+        policy_id = self._by_number.get(policy_number)
+        if policy_id is None:
+            return None
+        include = set(fields) if fields is not None else None
+        body = self._policies[policy_id].model_dump_json(include=include).encode()
+        return SerializedPolicy(body=body, etag=make_etag(body))
+
+
+def _version(keys: list[_Key]) -> PolicyVersion:
+    return PolicyVersion(keys[-1].value if keys else None, len(keys))
+
+
+def _page_cursor(key: _Key, backward: bool = False) -> str:
+    return PageCursor(created_at=key.value, id=key.id, backward=backward).encode()
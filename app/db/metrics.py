@@ -0,0 +1,148 @@
+import functools
+import inspect
+import re
+import time
+from contextlib import aclosing
+
+from sqlalchemy import (
+    Engine,
+    event,
+)
+
+from app.core.metrics import (
+    REGISTRY,
+    family_snapshot,
+)
+from app.db.policy_queries import SHAPE_OPTION
+
+DB_CALL_SECONDS = REGISTRY.histogram(
+    "db_call_duration_seconds", "Latency of the storage methods", ("method",)
+)
+DB_CALL_ERRORS = REGISTRY.counter(
+    "db_call_errors_total",
+    "Storage method calls that raised, by exception type",
+    ("method", "error"),
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "Statement execution time by shape", ("shape",)
+)
+
+_VERB_TABLE = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE)\b(?:.*?\b(?:FROM|INTO)\s+|\s+)\"?(\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def timed(method):
+    """Record the latency and errors of a storage coroutine or async generator method.
+
+    Async generators are timed until exhausted or closed.
+    """
+    name = method.__name__
+    if inspect.isasyncgenfunction(method):
+
+        @functools.wraps(method)
+        async def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                async with aclosing(method(*args, **kwargs)) as items:
+                    async for item in items:
+                        yield item
+            except Exception as e:
+                DB_CALL_ERRORS.labels(name, type(e).__name__).inc()
+                raise
+            finally:
+                DB_CALL_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception as e:
+            DB_CALL_ERRORS.labels(name, type(e).__name__).inc()
+            raise
+        finally:
+            DB_CALL_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=512)
+def statement_shape(statement: str) -> str:
+    """Verb and first table of a SQL statement, e.g. ``insert policy``."""
+    match = _VERB_TABLE.match(statement)
+    if match is None:
+        return "other"
+    return f"{match[1].lower()} {match[2].lower()}"
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Time the statements executed on an engine, labelled by their shape.
+
+    Canonical policy listing statements are labelled by their PolicyQueries
+    shape, the selectin loads of their coverages included, any other by
+    statement_shape.
+    """
+    event.listen(engine, "before_cursor_execute", _start_query)
+    event.listen(engine, "after_cursor_execute", _observe_query)
+
+
+def _start_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def _observe_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "metrics_started", None)
+    if started is None:
+        return
+    shape = context.execution_options.get(SHAPE_OPTION) or statement_shape(statement)
+    DB_QUERY_SECONDS.labels(shape).observe(time.perf_counter() - started)
+
+
+def pool_families(status: dict) -> dict[str, dict]:
+    """Metric families of an AsyncDBApi.pool_status(), engines labelled primary or by server."""
+    pools = {}
+    if status.get("primary") is not None:
+        pools["primary"] = status["primary"]
+    pools.update(status.get("replicas", {}))
+    engine = ("engine",)
+    return {
+        "db_pool_size": family_snapshot(
+            "gauge",
+            "Connections the pool keeps open",
+            engine,
+            [((name,), pool["size"]) for name, pool in pools.items()],
+        ),
+        "db_pool_max_overflow": family_snapshot(
+            "gauge",
+            "Connections the pool may open beyond its size",
+            engine,
+            [((name,), pool["max_overflow"]) for name, pool in pools.items()],
+        ),
+        "db_pool_connections": family_snapshot(
+            "gauge",
+            "Pool connections by state",
+            ("engine", "state"),
+            [
+                ((name, state), pool[state])
+                for name, pool in pools.items()
+                for state in ("checked_out", "idle", "overflow")
+            ],
+        ),
+        "db_pool_checkout_timeouts_total": family_snapshot(
+            "counter",
+            "Checkouts that gave up waiting for a connection",
+            engine,
+            [((name,), pool["checkout_timeouts"]) for name, pool in pools.items()],
+        ),
+        "db_pool_checkout_wait_seconds": family_snapshot(
+            "histogram",
+            "Time to check out a connection, waiting and pre-ping included",
+            engine,
+            [((name,), pool["checkout_wait_seconds"]) for name, pool in pools.items()],
+        ),
+    }
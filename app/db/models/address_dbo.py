@@ -27,7 +27,7 @@ class AddressDBO(Base):
     zip_code: Mapped[str] = mapped_column(Text, nullable=False)
     country: Mapped[str] = mapped_column(Text, nullable=False)
     person_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("person.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("person.id"), nullable=False, index=True
     )
 
     def to_model(self) -> Address:
@@ -39,6 +39,16 @@ class AddressDBO(Base):
             country=self.country,
         )
 
+    def construct_model(self) -> Address:
+        """Address from trusted row data, skipping validation."""
+        return Address.model_construct(
+            street=self.street,
+            city=self.city,
+            state=self.state,
+            zip_code=self.zip_code,
+            country=self.country,
+        )
+
     @classmethod
     def from_model(cls, address: Address) -> "AddressDBO":
         return cls(
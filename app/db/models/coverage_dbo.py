@@ -4,6 +4,7 @@ from sqlalchemy import (
     UUID,
     Float,
     ForeignKey,
+    Integer,
     Text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -13,6 +14,7 @@ from sqlalchemy.orm import (
 )
 
 from app.db import Base
+from app.db.models.policy_key_dbo import PolicyKeyDBO  # noqa F401
 from app.models.coverage import Coverage
 
 
@@ -29,8 +31,10 @@ class CoverageDBO(Base):
     deductible: Mapped[float] = mapped_column(Float, nullable=False)
     exclusions: Mapped[list] = mapped_column(JSONB, nullable=False)
     policy_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("policy.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("policy_key.id"), nullable=False, index=True
     )
+    # of the coverage in its policy's list, ids being random
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     def to_model(self) -> Coverage:
         return Coverage(
@@ -40,3 +44,24 @@ class CoverageDBO(Base):
             deductible=self.deductible,
             exclusions=self.exclusions,
         )
+
+    def construct_model(self) -> Coverage:
+        """Coverage from trusted row data, skipping validation."""
+        return Coverage.model_construct(
+            type=self.type,
+            description=self.description,
+            limit=self.limit,
+            deductible=self.deductible,
+            exclusions=self.exclusions,
+        )
+
+    @classmethod
+    def from_model(cls, coverage: Coverage, position: int = 0) -> "CoverageDBO":
+        return cls(
+            position=position,
+            type=coverage.type,
+            description=coverage.description,
+            limit=coverage.limit,
+            deductible=coverage.deductible,
+            exclusions=coverage.exclusions,
+        )
@@ -24,7 +24,9 @@ class PersonDBO(Base):
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    id_number: Mapped[str] = mapped_column(Text, nullable=False)
+    id_number: Mapped[str] = mapped_column(
+        Text, nullable=False, index=True, unique=True
+    )
     first_name: Mapped[str] = mapped_column(Text, nullable=False)
     last_name: Mapped[str] = mapped_column(Text, nullable=False)
     date_of_birth: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -44,6 +46,18 @@ class PersonDBO(Base):
             address=self.address.to_model(),
         )
 
+    def construct_model(self) -> Person:
+        """Person from trusted row data, skipping validation."""
+        return Person.model_construct(
+            id_number=self.id_number,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            date_of_birth=self.date_of_birth,
+            email=self.email,
+            phone=self.phone,
+            address=self.address.construct_model(),
+        )
+
     @classmethod
     def from_model(cls, person: Person) -> "PersonDBO":
         return cls(
@@ -1,20 +1,26 @@
 import uuid
 from datetime import datetime
+from typing import Collection
 
 from sqlalchemy import (
     UUID,
+    CheckConstraint,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Text,
+    text,
 )
 from sqlalchemy.orm import (
     Mapped,
+    foreign,
     mapped_column,
     relationship,
 )
 
 from app.db import Base
+from app.db.models.coverage_dbo import CoverageDBO
 from app.db.models.person_dbo import PersonDBO
 from app.db.models.premium_dbo import PremiumDBO
 from app.models.enums import (
@@ -25,26 +31,72 @@ from app.models.policy import Policy
 
 
 class PolicyDBO(Base):
+    # range partitioned by expiration year once migrated, ids and policy numbers
+    # kept unique across the partitions by the policy_key table; a partitioned
+    # table's primary key includes the partition key
     __tablename__ = "policy"
-    __table_args__ = {}
+    __table_args__ = (
+        # lets effective date filters prune the expiration year partitions
+        CheckConstraint(
+            "expiration_date >= effective_date",
+            name="ck_policy_expiration_after_effective",
+        ),
+        Index("ix_policy_policy_number", "policy_number"),
+        # listing order and keyset pagination
+        Index("ix_policy_created_at_id", text("created_at DESC"), text("id DESC")),
+        # date range filters, alone or combined with status / type
+        Index(
+            "ix_policy_effective_date_expiration_date",
+            "effective_date",
+            "expiration_date",
+        ),
+        Index("ix_policy_expiration_date", "expiration_date"),
+        Index("ix_policy_status_effective_date", "status", "effective_date"),
+        Index("ix_policy_status_expiration_date", "status", "expiration_date"),
+        Index("ix_policy_type_effective_date", "type", "effective_date"),
+        Index("ix_policy_type_expiration_date", "type", "expiration_date"),
+        # policy_number LIKE '%...%'
+        Index(
+            "ix_policy_policy_number_trgm",
+            "policy_number",
+            postgresql_using="gin",
+            postgresql_ops={"policy_number": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    policy_number: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    policy_number: Mapped[str] = mapped_column(Text, nullable=False)
     type: Mapped[PolicyType] = mapped_column(Enum(PolicyType), nullable=False)
     status: Mapped[PolicyStatus] = mapped_column(Enum(PolicyStatus), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     effective_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    expiration_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expiration_date: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, nullable=False
+    )
     policyholder_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("person.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("person.id"), nullable=False, index=True
     )
     notes: Mapped[str] = mapped_column(Text, nullable=True)
 
     policyholder: Mapped[PersonDBO] = relationship("PersonDBO", lazy="joined")
+    # premiums and coverages reference policy_key, not policy
     premium: Mapped[PremiumDBO] = relationship(
-        "PremiumDBO", lazy="joined", cascade="all, delete-orphan", uselist=False
+        "PremiumDBO",
+        primaryjoin=lambda: PolicyDBO.id == foreign(PremiumDBO.policy_id),
+        lazy="joined",
+        cascade="all, delete-orphan",
+        uselist=False,
+    )
+    # one IN (...) query per batch of loaded policies, joining would repeat
+    # each policy row once per coverage
+    coverages: Mapped[list[CoverageDBO]] = relationship(
+        "CoverageDBO",
+        primaryjoin=lambda: PolicyDBO.id == foreign(CoverageDBO.policy_id),
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        order_by="CoverageDBO.position",
     )
 
     def to_model(self) -> Policy:
@@ -56,12 +108,61 @@ class PolicyDBO(Base):
             effective_date=self.effective_date,
             expiration_date=self.expiration_date,
             policyholder=self.policyholder.to_model() if self.policyholder else None,
+            coverages=[coverage.to_model() for coverage in self.coverages],
             premium=self.premium.to_model() if self.premium else None,
             notes=self.notes,
         )
 
+    def construct_model(self) -> Policy:
+        """Policy from trusted row data, skipping validation.
+
+        Rows were validated on their way in, revalidating them on every read
+        costs more than serializing them.
+        """
+        return Policy.model_construct(
+            policy_number=self.policy_number,
+            type=self.type,
+            status=self.status,
+            created_at=self.created_at,
+            effective_date=self.effective_date,
+            expiration_date=self.expiration_date,
+            policyholder=self.policyholder.construct_model()
+            if self.policyholder
+            else None,
+            coverages=[coverage.construct_model() for coverage in self.coverages],
+            premium=self.premium.construct_model() if self.premium else None,
+            notes=self.notes,
+        )
+
+    def to_partial_model(self, fields: Collection[str]) -> Policy:
+        """Unvalidated Policy with only the given fields set, for sparse fieldsets.
+
+        Only these fields may have been loaded, serialize it with include=fields.
+        """
+        # created_at is always loaded, giving it and coverages values spares
+        # model_construct their slow default factories
+        values = {"created_at": self.created_at, "coverages": []}
+        for field in fields:
+            if field in ("policyholder", "premium"):
+                related = getattr(self, field)
+                values[field] = related.construct_model() if related else None
+            elif field == "coverages":
+                values[field] = [
+                    coverage.construct_model() for coverage in self.coverages
+                ]
+            else:
+                values[field] = getattr(self, field)
+        return Policy.model_construct(set(fields), **values)
+
     @classmethod
-    def from_model(cls, policy: Policy) -> "PolicyDBO":
+    def from_model(
+        cls, policy: Policy, policyholder_id: uuid.UUID | None = None
+    ) -> "PolicyDBO":
+        """New policy row, with a new policyholder unless an existing one's id is given."""
+        if policyholder_id is not None:
+            holder = {"policyholder_id": policyholder_id}
+        else:
+            holder = {"policyholder": PersonDBO.from_model(policy.policyholder)}
         return cls(
             policy_number=policy.policy_number,
             type=policy.type,
@@ -69,6 +170,11 @@ class PolicyDBO(Base):
             created_at=policy.created_at,
             effective_date=policy.effective_date,
             expiration_date=policy.expiration_date,
-            policyholder=PersonDBO.from_model(policy.policyholder),
+            **holder,
+            coverages=[
+                CoverageDBO.from_model(coverage, position)
+                for position, coverage in enumerate(policy.coverages)
+            ],
+            premium=PremiumDBO.from_model(policy.premium) if policy.premium else None,
             notes=policy.notes,
         )
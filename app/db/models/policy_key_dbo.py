@@ -0,0 +1,21 @@
+from sqlalchemy import (
+    UUID,
+    Text,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db import Base
+
+
+class PolicyKeyDBO(Base):
+    # ids and policy numbers unique across the policy table's partitions,
+    # premiums and coverages reference it; rows are inserted by a trigger on
+    # policy once migrated
+    __tablename__ = "policy_key"
+    __table_args__ = {}
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    policy_number: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
@@ -1,4 +1,10 @@
+import calendar
 import uuid
+from datetime import (
+    UTC,
+    date,
+    datetime,
+)
 
 from sqlalchemy import (
     UUID,
@@ -13,6 +19,7 @@ from sqlalchemy.orm import (
 )
 
 from app.db import Base
+from app.db.models.policy_key_dbo import PolicyKeyDBO  # noqa F401
 from app.models.enums import (
     PaymentFrequency,
     PaymentMethod,
@@ -20,6 +27,13 @@ from app.models.enums import (
 from app.models.premium import Premium
 
 
+def payment_date(timestamp: int | None) -> date | None:
+    """Date stored as the unix timestamp of its UTC midnight."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, UTC).date()
+
+
 class PremiumDBO(Base):
     __tablename__ = "premium"
     __table_args__ = {}
@@ -34,7 +48,7 @@ class PremiumDBO(Base):
     method: Mapped[PaymentMethod] = mapped_column(Enum(PaymentMethod), nullable=False)
     next_payment_date: Mapped[int] = mapped_column(BigInteger, nullable=True)
     policy_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("policy.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("policy_key.id"), nullable=False, index=True
     )
 
     def to_model(self) -> Premium:
@@ -44,3 +58,22 @@ class PremiumDBO(Base):
             method=self.method,
             next_payment_date=self.next_payment_date,
         )
+
+    def construct_model(self) -> Premium:
+        """Premium from trusted row data, skipping validation."""
+        return Premium.model_construct(
+            amount=self.amount,
+            frequency=self.frequency,
+            method=self.method,
+            next_payment_date=payment_date(self.next_payment_date),
+        )
+
+    @classmethod
+    def from_model(cls, premium: Premium) -> "PremiumDBO":
+        return cls(
+            amount=premium.amount,
+            frequency=premium.frequency,
+            method=premium.method,
+            # stored as the unix timestamp of the date's UTC midnight
+            next_payment_date=calendar.timegm(premium.next_payment_date.timetuple()),
+        )
@@ -0,0 +1,55 @@
+import binascii
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.policy import Policy
+
+
+class PageCursor(BaseModel):
+    """Keyset position within the ``created_at desc, id desc`` policy ordering.
+
+    ``backward`` cursors select the rows preceding the position (previous page),
+    forward ones the rows following it (next page).
+    """
+
+    created_at: datetime
+    id: UUID
+    backward: bool = False
+
+    def encode(self) -> str:
+        return urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        try:
+            raw = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"Malformed cursor: {e}")
+        return cls.model_validate_json(raw)
+
+
+class PolicyVersion(NamedTuple):
+    """Newest creation time and count of the filtered policies.
+
+    Policies are never updated in place, so together they change whenever the
+    filtered set does.
+    """
+
+    newest: datetime | None
+    count: int
+
+
+class PolicyPage(NamedTuple):
+    policies: list[Policy]
+    total_count: int | None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    # of the filtered set, when reading the page came up with it
+    version: PolicyVersion | None = None
@@ -0,0 +1,228 @@
+from enum import StrEnum
+from typing import (
+    Any,
+    Callable,
+    Collection,
+)
+
+from sqlalchemy import (
+    BindParameter,
+    ColumnElement,
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    event,
+    func,
+    select,
+    tuple_,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import (
+    load_only,
+    noload,
+)
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.db.models.person_dbo import PersonDBO
+from app.db.models.policy_dbo import PolicyDBO
+from app.db.policy_rows import core_select
+from app.models.enums import ReadPath
+from app.models.policy_filter import PolicyFilter
+
+# execution option naming the canonical shape a statement was built for
+SHAPE_OPTION = "policy_query_shape"
+
+# WHERE term of each PolicyFilter field, on a bound parameter named after it
+_FILTER_TERMS: dict[str, Callable[[BindParameter], ColumnElement[bool]]] = {
+    # policies expire after they take effect, the implied expiration_date term
+    # prunes the partitions of the years before
+    "effective_date_from": lambda value: and_(
+        PolicyDBO.effective_date >= value, PolicyDBO.expiration_date >= value
+    ),
+    "effective_date_to": lambda value: PolicyDBO.effective_date <= value,
+    "expiration_date_from": lambda value: PolicyDBO.expiration_date >= value,
+    "expiration_date_to": lambda value: PolicyDBO.expiration_date <= value,
+    "policyholder_id_number": lambda value: PolicyDBO.policyholder.has(
+        PersonDBO.id_number == value
+    ),
+    "policy_number": lambda value: PolicyDBO.policy_number.like(value),
+    "policy_type": lambda value: PolicyDBO.type == value,
+    "policy_status": lambda value: PolicyDBO.status == value,
+}
+
+
+# Policy fields loaded through a relationship, the others are PolicyDBO columns
+_RELATIONSHIP_FIELDS = {
+    "policyholder": PolicyDBO.policyholder,
+    "coverages": PolicyDBO.coverages,
+    "premium": PolicyDBO.premium,
+}
+_COLUMN_FIELDS = {
+    "policy_number",
+    "type",
+    "status",
+    "created_at",
+    "effective_date",
+    "expiration_date",
+    "notes",
+}
+
+
+def projection_options(fields: Collection[str]) -> list[ORMOption]:
+    """Loader options restricting a PolicyDBO select to the given Policy fields.
+
+    created_at and id stay loaded for the keyset cursors, relationships not
+    asked for are neither joined nor loaded.
+    """
+    columns = [getattr(PolicyDBO, field) for field in fields if field in _COLUMN_FIELDS]
+    options: list[ORMOption] = [load_only(PolicyDBO.created_at, *columns)]
+    for field, relationship in _RELATIONSHIP_FIELDS.items():
+        if field not in fields:
+            options.append(noload(relationship))
+    return options
+
+
+def _contains(value: str) -> str:
+    """LIKE pattern of the value anywhere, its % and _ taken literally.
+
+    Backslash is Postgres' default LIKE escape, the in-memory storage matches
+    substrings alike.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class PolicyQueryKind(StrEnum):
+    PAGE = "page"
+    PAGE_COUNTED = "page_counted"
+    PAGE_AFTER = "page_after"
+    PAGE_BEFORE = "page_before"
+    COUNT = "count"
+    IDS = "ids"
+    VERSION = "version"
+    EXPORT = "export"
+
+
+def _build(
+    kind: PolicyQueryKind,
+    present: tuple[str, ...],
+    projected: tuple[str, ...] | None = None,
+    read_path: ReadPath = ReadPath.ORM,
+) -> Select:
+    conditions = [_FILTER_TERMS[name](bindparam(name)) for name in present]
+    if kind == PolicyQueryKind.COUNT:
+        return select(func.count(PolicyDBO.id)).where(*conditions)
+    if kind == PolicyQueryKind.IDS:
+        return select(PolicyDBO.id).where(*conditions)
+    if kind == PolicyQueryKind.VERSION:
+        return select(
+            func.max(PolicyDBO.created_at).label("newest"),
+            func.count(PolicyDBO.id).label("total_count"),
+        ).where(*conditions)
+    if read_path == ReadPath.CORE:
+        stmt = core_select(projected).where(*conditions)
+    else:
+        stmt = select(PolicyDBO).where(*conditions)
+        if projected is not None:
+            stmt = stmt.options(*projection_options(projected))
+    newest_first = (PolicyDBO.created_at.desc(), PolicyDBO.id.desc())
+    if kind == PolicyQueryKind.EXPORT:
+        return stmt.order_by(*newest_first)
+    keyset = tuple_(PolicyDBO.created_at, PolicyDBO.id)
+    position = tuple_(bindparam("cursor_created_at"), bindparam("cursor_id"))
+    if kind == PolicyQueryKind.PAGE_AFTER:
+        stmt = stmt.where(keyset < position).order_by(*newest_first)
+    elif kind == PolicyQueryKind.PAGE_BEFORE:
+        stmt = stmt.where(keyset > position).order_by(
+            PolicyDBO.created_at.asc(), PolicyDBO.id.asc()
+        )
+    else:
+        if kind == PolicyQueryKind.PAGE_COUNTED:
+            stmt = stmt.add_columns(
+                func.count().over().label("total_count"),
+                func.max(PolicyDBO.created_at).over().label("newest"),
+            )
+        stmt = stmt.order_by(*newest_first).offset(bindparam("offset", type_=Integer))
+    return stmt.limit(bindparam("limit", type_=Integer))
+
+
+class PolicyQueries:
+    """Cache of the policy listing statements, one per canonical shape.
+
+    A shape is the query kind plus the set of filters present, the projected
+    fields and the read path of the policy rows; filter values,
+    cursor position, offset and limit are all bound parameters. Requests with
+    the same shape share one statement object and hence one SQLAlchemy compiled
+    cache entry and one asyncpg prepared statement per connection, whatever the
+    values. There are at most ``2 ** len(PolicyFilter.model_fields)`` shapes
+    per kind, only the ones in use get built.
+    """
+
+    def __init__(self):
+        self._statements: dict[
+            tuple[PolicyQueryKind, tuple[str, ...], tuple[str, ...] | None, ReadPath],
+            Select,
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+
+    def statement(
+        self,
+        kind: PolicyQueryKind,
+        policy_filter: PolicyFilter,
+        fields: Collection[str] | None = None,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> tuple[Select, dict[str, Any]]:
+        """Statement of the given kind for the filter, with its filter parameters.
+
+        Policy rows are restricted to the given fields, if any, and are PolicyDBO
+        entities or, on the core read path, policy_rows.core_select rows. Pagination
+        parameters (offset, limit, cursor_created_at, cursor_id) are left to the
+        caller.
+        """
+        params = policy_filter.model_dump(exclude_none=True)
+        if "policy_number" in params:
+            params["policy_number"] = _contains(params["policy_number"])
+        present = tuple(name for name in _FILTER_TERMS if name in params)
+        projected = tuple(sorted(fields)) if fields is not None else None
+        key = (kind, present, projected, read_path)
+        stmt = self._statements.get(key)
+        if stmt is None:
+            self.misses += 1
+            stmt = _build(kind, present, projected, read_path)
+            shape = f"{read_path}:{kind}:{','.join(present)}"
+            if projected is not None:
+                shape += f":{','.join(projected)}"
+            stmt = stmt.execution_options(**{SHAPE_OPTION: shape})
+            self._statements[key] = stmt
+        else:
+            self.hits += 1
+        return stmt, params
+
+    def instrument(self, engine: Engine) -> None:
+        """Count SQLAlchemy compiled cache hits of these statements on an engine."""
+        event.listen(engine, "before_cursor_execute", self._count_compilation)
+
+    def _count_compilation(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if context is None or SHAPE_OPTION not in context.execution_options:
+            return
+        if context.cache_hit == CacheStats.CACHE_HIT:
+            self.compiled_hits += 1
+        else:
+            self.compiled_misses += 1
+
+    def stats(self) -> dict:
+        return {
+            "shapes": len(self._statements),
+            "statement_cache": {"hits": self.hits, "misses": self.misses},
+            "compiled_cache": {
+                "hits": self.compiled_hits,
+                "misses": self.compiled_misses,
+            },
+        }
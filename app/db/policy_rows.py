@@ -0,0 +1,171 @@
+"""Policy listing read as plain Core rows, without ORM entities.
+
+The select names every column it needs and joins the one-to-one
+relationships by hand; rows map straight into unvalidated response models.
+"""
+
+from typing import (
+    Collection,
+    Iterable,
+)
+from uuid import UUID
+
+from sqlalchemy import (
+    ARRAY,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    select,
+)
+
+from app.db.models.address_dbo import AddressDBO
+from app.db.models.coverage_dbo import CoverageDBO
+from app.db.models.person_dbo import PersonDBO
+from app.db.models.policy_dbo import PolicyDBO
+from app.db.models.premium_dbo import (
+    PremiumDBO,
+    payment_date,
+)
+from app.models.address import Address
+from app.models.coverage import Coverage
+from app.models.person import Person
+from app.models.policy import Policy
+from app.models.premium import Premium
+
+_policy = PolicyDBO.__table__
+_person = PersonDBO.__table__
+_address = AddressDBO.__table__
+_premium = PremiumDBO.__table__
+_coverage = CoverageDBO.__table__
+
+POLICY_COLUMN_FIELDS = (
+    "policy_number",
+    "type",
+    "status",
+    "effective_date",
+    "expiration_date",
+    "notes",
+)
+_POLICYHOLDER_COLUMNS = (
+    _person.c.id_number,
+    _person.c.first_name,
+    _person.c.last_name,
+    _person.c.date_of_birth,
+    _person.c.email,
+    _person.c.phone,
+    _address.c.street.label("address_street"),
+    _address.c.city.label("address_city"),
+    _address.c.state.label("address_state"),
+    _address.c.zip_code.label("address_zip_code"),
+    _address.c.country.label("address_country"),
+)
+_PREMIUM_COLUMNS = (
+    _premium.c.amount.label("premium_amount"),
+    _premium.c.frequency.label("premium_frequency"),
+    _premium.c.method.label("premium_method"),
+    _premium.c.next_payment_date.label("premium_next_payment_date"),
+)
+
+
+def _wants(fields: Collection[str] | None, field: str) -> bool:
+    return fields is None or field in fields
+
+
+def core_select(fields: Collection[str] | None = None) -> Select:
+    """Columns of the policies, or of the given Policy fields, joined by hand.
+
+    id and created_at are always selected, for the keyset cursors.
+    """
+    columns = [_policy.c.id, _policy.c.created_at]
+    columns += [
+        _policy.c[field] for field in POLICY_COLUMN_FIELDS if _wants(fields, field)
+    ]
+    joined = _policy
+    if _wants(fields, "policyholder"):
+        columns += _POLICYHOLDER_COLUMNS
+        joined = joined.join(
+            _person, _person.c.id == _policy.c.policyholder_id
+        ).outerjoin(_address, _address.c.person_id == _person.c.id)
+    if _wants(fields, "premium"):
+        columns += _PREMIUM_COLUMNS
+        joined = joined.outerjoin(_premium, _premium.c.policy_id == _policy.c.id)
+    return select(*columns).select_from(joined)
+
+
+# coverages of the policies given as the policy_ids array parameter
+COVERAGES_SELECT = (
+    select(
+        _coverage.c.policy_id,
+        _coverage.c.type,
+        _coverage.c.description,
+        _coverage.c.limit,
+        _coverage.c.deductible,
+        _coverage.c.exclusions,
+    )
+    .where(
+        _coverage.c.policy_id
+        == any_(bindparam("policy_ids", type_=ARRAY(_coverage.c.policy_id.type)))
+    )
+    .order_by(_coverage.c.policy_id, _coverage.c.position)
+)
+
+
+def wants_coverages(fields: Collection[str] | None) -> bool:
+    return _wants(fields, "coverages")
+
+
+def coverages_by_policy(rows: Iterable[Row]) -> dict[UUID, list[Coverage]]:
+    """Coverages of COVERAGES_SELECT rows, per policy id."""
+    coverages: dict[UUID, list[Coverage]] = {}
+    for row in rows:
+        coverages.setdefault(row.policy_id, []).append(
+            Coverage.model_construct(
+                type=row.type,
+                description=row.description,
+                limit=row.limit,
+                deductible=row.deductible,
+                exclusions=row.exclusions,
+            )
+        )
+    return coverages
+
+
+def policy_from_row(
+    row: Row,
+    fields: Collection[str] | None = None,
+    coverages: list[Coverage] | None = None,
+) -> Policy:
+    """Unvalidated Policy of a core_select row, see PolicyDBO.construct_model."""
+    values = {"created_at": row.created_at, "coverages": coverages or []}
+    for field in POLICY_COLUMN_FIELDS:
+        if _wants(fields, field):
+            values[field] = getattr(row, field)
+    if _wants(fields, "policyholder"):
+        values["policyholder"] = Person.model_construct(
+            id_number=row.id_number,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            date_of_birth=row.date_of_birth,
+            email=row.email,
+            phone=row.phone,
+            address=Address.model_construct(
+                street=row.address_street,
+                city=row.address_city,
+                state=row.address_state,
+                zip_code=row.address_zip_code,
+                country=row.address_country,
+            ),
+        )
+    if _wants(fields, "premium"):
+        values["premium"] = None
+        if row.premium_amount is not None:
+            values["premium"] = Premium.model_construct(
+                amount=row.premium_amount,
+                frequency=row.premium_frequency,
+                method=row.premium_method,
+                next_payment_date=payment_date(row.premium_next_payment_date),
+            )
+    if fields is None:
+        return Policy.model_construct(**values)
+    return Policy.model_construct(set(fields), **values)
@@ -0,0 +1,71 @@
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long checkouts take, waiting and pre-ping included."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        pool = super().recreate()
+        pool.checkout_wait = self.checkout_wait
+        pool.checkout_timeouts = self.checkout_timeouts
+        return pool
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            # negative while the pool itself is not full yet
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+        }
+
+
+def worker_pool_limits(
+    pool_size: int,
+    max_overflow: int,
+    workers: int,
+    connection_budget: int | None,
+    reserved: int = 0,
+) -> tuple[int, int]:
+    """Pool size and overflow of one worker process, within a share of the budget.
+
+    Each of the workers gets an even share of connection_budget, the connections
+    per database server all of them may open together. reserved of the share
+    are kept for connections outside the pool. Without a budget the configured
+    values are used as they are. A share without room for a pooled connection
+    besides the reserved ones is a ValueError.
+    """
+    if connection_budget is None:
+        return pool_size, max_overflow
+    share = connection_budget // max(workers, 1) - reserved
+    if share < 1:
+        raise ValueError(
+            f"A connection budget of {connection_budget} leaves no pooled connection"
+            f" to each of {workers} workers besides {reserved} reserved, raise it to"
+            f" at least {(reserved + 1) * max(workers, 1)}"
+        )
+    pool_size = min(pool_size, share)
+    return pool_size, min(max_overflow, share - pool_size)
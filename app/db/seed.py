@@ -0,0 +1,492 @@
+"""Synthetic policies loaded with COPY, for scale testing the listing and lookups.
+
+python -m app.db.seed --policies 1000000 --seed 1 --workers 8
+
+The same seed and chunk size always produce the same rows, whatever the number
+of workers. Chunks are generated and copied in parallel processes, each in its
+own transaction, into the database of the DB_* settings.
+"""
+
+import argparse
+import asyncio
+import calendar
+import itertools
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import asyncpg
+
+from app.models.enums import (
+    PaymentFrequency,
+    PaymentMethod,
+    PolicyStatus,
+    PolicyType,
+)
+
+LOG = logging.getLogger(__name__)
+
+# statuses are derived from the dates relative to this, not to the clock
+SEED_NOW = datetime(2026, 1, 1)
+SEED_HISTORY_DAYS = 8 * 365
+# days between a policy's creation and its effective date, at most
+MAX_EFFECTIVE_DELAY_DAYS = 60
+DEFAULT_CHUNK_SIZE = 10000
+# policies per holder are Pareto distributed: most hold one or two,
+# fleets and businesses up to this many
+MAX_POLICIES_PER_HOLDER = 500
+HOLDER_SKEW = 2.0
+
+TYPE_WEIGHTS = {
+    PolicyType.AUTO: 40,
+    PolicyType.HOME: 25,
+    PolicyType.HEALTH: 15,
+    PolicyType.LIFE: 8,
+    PolicyType.TRAVEL: 7,
+    PolicyType.BUSINESS: 5,
+}
+# term length in days and median yearly premium per policy type
+TERM_DAYS = {
+    PolicyType.AUTO: (182, 365),
+    PolicyType.HOME: (365,),
+    PolicyType.HEALTH: (365,),
+    PolicyType.LIFE: (3650, 7300, 10950),
+    PolicyType.TRAVEL: (7, 14, 30),
+    PolicyType.BUSINESS: (365, 730),
+}
+YEARLY_PREMIUM = {
+    PolicyType.AUTO: 1100.0,
+    PolicyType.HOME: 900.0,
+    PolicyType.HEALTH: 4800.0,
+    PolicyType.LIFE: 600.0,
+    PolicyType.TRAVEL: 60.0,
+    PolicyType.BUSINESS: 7500.0,
+}
+FREQUENCY_WEIGHTS = {
+    PaymentFrequency.MONTHLY: 50,
+    PaymentFrequency.QUARTERLY: 15,
+    PaymentFrequency.SEMI_ANNUAL: 10,
+    PaymentFrequency.ANNUAL: 20,
+    PaymentFrequency.ONE_TIME: 5,
+}
+FREQUENCY_DAYS = {
+    PaymentFrequency.MONTHLY: 30,
+    PaymentFrequency.QUARTERLY: 91,
+    PaymentFrequency.SEMI_ANNUAL: 182,
+    PaymentFrequency.ANNUAL: 365,
+    PaymentFrequency.ONE_TIME: 0,
+}
+METHOD_WEIGHTS = {
+    PaymentMethod.CREDIT_CARD: 40,
+    PaymentMethod.BANK_TRANSFER: 35,
+    PaymentMethod.PAYPAL: 15,
+    PaymentMethod.CHECK: 7,
+    PaymentMethod.CASH: 3,
+}
+# coverage type, description and the limits and deductibles to pick from
+COVERAGES = {
+    PolicyType.AUTO: (
+        ("liability", "Bodily injury and property damage liability", (50000.0, 100000.0, 300000.0), (0.0, 250.0, 500.0)),
+        ("collision", "Damage to the insured vehicle from collisions", (15000.0, 30000.0, 60000.0), (500.0, 1000.0)),
+        ("comprehensive", "Theft, fire, vandalism and weather damage", (15000.0, 30000.0, 60000.0), (250.0, 500.0)),
+        ("roadside", "Towing and roadside assistance", (500.0, 1000.0), (0.0,)),
+    ),
+    PolicyType.HOME: (
+        ("dwelling", "Damage to the structure of the home", (200000.0, 350000.0, 600000.0), (1000.0, 2500.0)),
+        ("contents", "Personal property inside the home", (50000.0, 100000.0), (500.0, 1000.0)),
+        ("liability", "Injuries to visitors and damage to others' property", (100000.0, 300000.0), (0.0,)),
+    ),
+    PolicyType.HEALTH: (
+        ("hospital", "Inpatient hospital care", (1000000.0, 2000000.0), (1500.0, 3000.0, 6000.0)),
+        ("outpatient", "Doctor visits and outpatient procedures", (50000.0, 100000.0), (0.0, 250.0)),
+        ("dental", "Preventive and basic dental care", (1500.0, 3000.0), (50.0, 100.0)),
+    ),
+    PolicyType.LIFE: (
+        ("death", "Death benefit paid to the beneficiaries", (100000.0, 250000.0, 500000.0, 1000000.0), (0.0,)),
+        ("disability", "Waiver of premium on disability", (50000.0, 100000.0), (0.0,)),
+    ),
+    PolicyType.TRAVEL: (
+        ("medical", "Emergency medical treatment abroad", (50000.0, 100000.0), (0.0, 100.0)),
+        ("cancellation", "Trip cancellation and interruption", (2500.0, 5000.0), (0.0,)),
+        ("baggage", "Lost or delayed baggage", (1000.0, 2000.0), (50.0,)),
+    ),
+    PolicyType.BUSINESS: (
+        ("general_liability", "Third party injury and property damage", (1000000.0, 2000000.0), (1000.0, 5000.0)),
+        ("property", "Business premises and equipment", (250000.0, 1000000.0), (2500.0, 5000.0)),
+        ("interruption", "Lost income while operations are suspended", (100000.0, 500000.0), (5000.0,)),
+        ("cyber", "Data breaches and cyber attacks", (250000.0, 1000000.0), (10000.0,)),
+    ),
+}  # fmt: skip
+EXCLUSIONS = (
+    "war",
+    "nuclear",
+    "intentional damage",
+    "wear and tear",
+    "pre-existing conditions",
+    "racing",
+    "flood",
+)
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Carlos", "Maria", "Wei", "Mei", "Ahmed", "Fatima", "Jan", "Eva",
+)  # fmt: skip
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor",
+    "Thomas", "Moore", "Jackson", "Martin", "Lee", "Nguyen", "Chen", "Novak", "Kowalski",
+)  # fmt: skip
+# city, state, first digits of the zip code; earlier cities are more populous
+CITIES = (
+    ("New York", "NY", "100"),
+    ("Los Angeles", "CA", "900"),
+    ("Chicago", "IL", "606"),
+    ("Houston", "TX", "770"),
+    ("Phoenix", "AZ", "850"),
+    ("Philadelphia", "PA", "191"),
+    ("San Antonio", "TX", "782"),
+    ("San Diego", "CA", "921"),
+    ("Dallas", "TX", "752"),
+    ("Austin", "TX", "787"),
+    ("Seattle", "WA", "981"),
+    ("Denver", "CO", "802"),
+    ("Boston", "MA", "021"),
+    ("Portland", "OR", "972"),
+    ("Anytown", None, "123"),
+)
+STREETS = (
+    "Main St",
+    "Oak Ave",
+    "Maple Dr",
+    "Cedar Ln",
+    "Park Rd",
+    "Elm St",
+    "Lake Blvd",
+)
+
+PERSON_COLUMNS = (
+    "id",
+    "id_number",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "email",
+    "phone",
+)
+ADDRESS_COLUMNS = ("id", "street", "city", "state", "zip_code", "country", "person_id")
+POLICY_COLUMNS = (
+    "id",
+    "policy_number",
+    "type",
+    "status",
+    "created_at",
+    "effective_date",
+    "expiration_date",
+    "policyholder_id",
+    "notes",
+)
+PREMIUM_COLUMNS = (
+    "id",
+    "amount",
+    "frequency",
+    "method",
+    "next_payment_date",
+    "policy_id",
+)
+COVERAGE_COLUMNS = (
+    "id",
+    "type",
+    "description",
+    "limit",
+    "deductible",
+    "exclusions",
+    "position",
+    "policy_id",
+)
+# in foreign key order
+TABLES = (
+    ("person", PERSON_COLUMNS),
+    ("address", ADDRESS_COLUMNS),
+    ("policy", POLICY_COLUMNS),
+    ("premium", PREMIUM_COLUMNS),
+    ("coverage", COVERAGE_COLUMNS),
+)
+
+
+@dataclass
+class SeedChunk:
+    """COPY records of one chunk of policies, per table."""
+
+    person: list[tuple] = field(default_factory=list)
+    address: list[tuple] = field(default_factory=list)
+    policy: list[tuple] = field(default_factory=list)
+    premium: list[tuple] = field(default_factory=list)
+    coverage: list[tuple] = field(default_factory=list)
+
+
+def _cumulative(weights: dict) -> tuple[list, list[int]]:
+    """Population and cumulative weights for random.choices."""
+    return list(weights), list(itertools.accumulate(weights.values()))
+
+
+_TYPES = _cumulative(TYPE_WEIGHTS)
+_FREQUENCIES = _cumulative(FREQUENCY_WEIGHTS)
+_METHODS = _cumulative(METHOD_WEIGHTS)
+
+
+def _choice(rng: random.Random, cumulative: tuple[list, list[int]]):
+    population, cum_weights = cumulative
+    return rng.choices(population, cum_weights=cum_weights)[0]
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _status(rng: random.Random, effective: datetime, expiration: datetime) -> str:
+    if effective > SEED_NOW:
+        return PolicyStatus.PENDING
+    if expiration <= SEED_NOW:
+        return PolicyStatus.LAPSED if rng.random() < 0.1 else PolicyStatus.EXPIRED
+    return PolicyStatus.CANCELED if rng.random() < 0.05 else PolicyStatus.ACTIVE
+
+
+def _add_person(chunk: SeedChunk, rng: random.Random, id_number: str) -> uuid.UUID:
+    person_id = _uuid(rng)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    city, state, zip_prefix = CITIES[min(int(rng.expovariate(0.25)), len(CITIES) - 1)]
+    chunk.person.append(
+        (
+            person_id,
+            id_number,
+            first_name,
+            last_name,
+            datetime(1940, 1, 1) + timedelta(days=rng.randrange(65 * 365)),
+            f"{first_name}.{last_name}.{id_number}@example.com".lower(),
+            f"555-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}",
+        )
+    )
+    chunk.address.append(
+        (
+            _uuid(rng),
+            f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}",
+            city,
+            state,
+            f"{zip_prefix}{rng.randrange(100):02d}",
+            "US",
+            person_id,
+        )
+    )
+    return person_id
+
+
+def _add_policy(
+    chunk: SeedChunk, rng: random.Random, index: int, holder_id: uuid.UUID
+) -> None:
+    policy_id = _uuid(rng)
+    policy_type = _choice(rng, _TYPES)
+    # more policies were written recently than years ago
+    created_at = SEED_NOW - timedelta(
+        seconds=int(SEED_HISTORY_DAYS * 86400 * rng.random() ** 1.5)
+    )
+    effective = (
+        created_at + timedelta(days=rng.randrange(MAX_EFFECTIVE_DELAY_DAYS))
+    ).replace(hour=0, minute=0, second=0, microsecond=0)
+    term_days = rng.choice(TERM_DAYS[policy_type])
+    expiration = effective + timedelta(days=term_days)
+    chunk.policy.append(
+        (
+            policy_id,
+            f"POL-{index:09d}-{policy_type[0]}",
+            policy_type,
+            _status(rng, effective, expiration),
+            created_at,
+            effective,
+            expiration,
+            holder_id,
+            "Seeded" if rng.random() < 0.1 else None,
+        )
+    )
+    if rng.random() < 0.95:
+        frequency = _choice(rng, _FREQUENCIES)
+        yearly = YEARLY_PREMIUM[policy_type] * rng.lognormvariate(0, 0.4)
+        if frequency is PaymentFrequency.ONE_TIME:
+            amount = yearly * max(term_days, 365) / 365
+        else:
+            amount = yearly * FREQUENCY_DAYS[frequency] / 365
+        next_payment = effective + timedelta(days=FREQUENCY_DAYS[frequency] or 1)
+        chunk.premium.append(
+            (
+                _uuid(rng),
+                round(amount, 2),
+                frequency,
+                _choice(rng, _METHODS),
+                # stored as the unix timestamp of the date's UTC midnight
+                calendar.timegm(next_payment.timetuple()),
+                policy_id,
+            )
+        )
+    catalog = COVERAGES[policy_type]
+    for position, (kind, description, limits, deductibles) in enumerate(
+        rng.sample(catalog, rng.randint(1, len(catalog)))
+    ):
+        exclusions = rng.sample(EXCLUSIONS, min(int(rng.expovariate(1.0)), 3))
+        chunk.coverage.append(
+            (
+                _uuid(rng),
+                kind,
+                description,
+                rng.choice(limits),
+                rng.choice(deductibles),
+                json.dumps(exclusions),
+                position,
+                policy_id,
+            )
+        )
+
+
+def generate_chunk(seed: int, number: int, chunk_size: int, total: int) -> SeedChunk:
+    """Records of policies ``number * chunk_size`` on, up to ``total``.
+
+    Holders are created along with their policies, never shared between chunks.
+    """
+    rng = random.Random(f"{seed}:{number}")  # noqa S311
+    chunk = SeedChunk()
+    index = number * chunk_size
+    end = min(index + chunk_size, total)
+    while index < end:
+        count = min(int(rng.paretovariate(HOLDER_SKEW)), MAX_POLICIES_PER_HOLDER)
+        id_number = f"S{seed}-{number:06d}-{len(chunk.person):05d}"
+        holder_id = _add_person(chunk, rng, id_number)
+        for policy_index in range(index, min(index + count, end)):
+            _add_policy(chunk, rng, policy_index, holder_id)
+        index += count
+    return chunk
+
+
+async def _copy_chunk(dsn: str, chunk: SeedChunk) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        # a lost chunk is simply seeded again
+        await conn.execute("SET synchronous_commit = off")
+        async with conn.transaction():
+            for table, columns in TABLES:
+                await conn.copy_records_to_table(
+                    table, records=getattr(chunk, table), columns=columns
+                )
+    finally:
+        await conn.close()
+
+
+def load_chunk(dsn: str, seed: int, number: int, chunk_size: int, total: int) -> int:
+    """Generate and COPY one chunk, in a worker process. Returns its policy count."""
+    chunk = generate_chunk(seed, number, chunk_size, total)
+    asyncio.run(_copy_chunk(dsn, chunk))
+    return len(chunk.policy)
+
+
+def expiration_years() -> range:
+    """Years the expiration dates of the seeded policies fall in."""
+    longest = max(max(terms) for terms in TERM_DAYS.values())
+    first = SEED_NOW - timedelta(days=SEED_HISTORY_DAYS)
+    last = SEED_NOW + timedelta(days=MAX_EFFECTIVE_DELAY_DAYS + longest)
+    return range(first.year, last.year + 1)
+
+
+async def _prepare(dsn: str, truncate: bool) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        if truncate:
+            # policy_key holds the numbers of the policies, see the policy
+            # partitioning migration
+            await conn.execute(
+                f"TRUNCATE policy_key, {', '.join(t for t, _ in TABLES)}"  # noqa S608
+            )
+        # rows are copied straight into their year's partition, not the default
+        years = expiration_years()
+        await conn.execute(
+            "SELECT policy_create_partition(year)"
+            " FROM generate_series($1::integer, $2) AS year",
+            years.start,
+            years.stop - 1,
+        )
+    finally:
+        await conn.close()
+
+
+async def _analyze(dsn: str) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        for table in ("policy_key", *(table for table, _ in TABLES)):
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+
+def seed(
+    dsn: str,
+    policies: int,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+    truncate: bool = False,
+) -> None:
+    """Load ``policies`` synthetic policies, chunks copied by ``workers`` processes."""
+    start = time.perf_counter()
+    asyncio.run(_prepare(dsn, truncate))
+    chunks = -(-policies // chunk_size)
+    loaded = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(load_chunk, dsn, seed, number, chunk_size, policies)
+            for number in range(chunks)
+        ]
+        for future in as_completed(futures):
+            loaded += future.result()
+            elapsed = time.perf_counter() - start
+            LOG.info(
+                f"Seeded {loaded}/{policies} policies in {elapsed:.1f} s "
+                f"({loaded / elapsed:.0f}/s)"
+            )
+    asyncio.run(_analyze(dsn))
+    LOG.info(f"Seeding done in {time.perf_counter() - start:.1f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policies", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Parallel processes"
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="Empty the policy tables first"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    from app.core.config import settings
+
+    dsn = f"postgresql://{settings.DB_USER}:{settings.DB_PASSWD}@{settings.DB_HOST}/{settings.DB_INSTANCE_NAME}"
+    seed(dsn, args.policies, args.seed, args.chunk_size, args.workers, args.truncate)
+
+
+if __name__ == "__main__":
+    main()
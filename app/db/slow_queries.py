@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from datetime import (
+    UTC,
+    datetime,
+)
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import Base
+from app.db.explain import explain_from_result
+from app.db.metrics import statement_shape
+from app.db.policy_queries import SHAPE_OPTION
+
+LOG = logging.getLogger(__name__)
+
+# execution option keeping a statement, e.g. the EXPLAIN itself, out of the log
+UNLOGGED_OPTION = "slow_query_log_skip"
+# EXPLAIN ANALYZE runs the statement again, never let many of them pile up
+MAX_CONCURRENT_EXPLAINS = 2
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+def redact_parameters(parameters: Any) -> str:
+    """Types of the bound parameters, never their values."""
+    if isinstance(parameters, (list, tuple)) and parameters:
+        if isinstance(parameters[0], (list, tuple)):
+            # executemany
+            return f"{len(parameters)} x {redact_parameters(parameters[0])}"
+        return f"({', '.join(type(value).__name__ for value in parameters)})"
+    if isinstance(parameters, dict):
+        return f"{{{', '.join(f'{k}: {type(v).__name__}' for k, v in parameters.items())}}}"
+    return "()"
+
+
+def redact_plan(plan: Any) -> Any:
+    """Plan with the literals in its conditions, i.e. the parameter values, replaced."""
+    if isinstance(plan, dict):
+        return {key: redact_plan(value) for key, value in plan.items()}
+    if isinstance(plan, list):
+        return [redact_plan(value) for value in plan]
+    if isinstance(plan, str):
+        return _STRING_LITERAL.sub("'?'", plan)
+    return plan
+
+
+def _explainable(statement: str) -> bool:
+    """A read of our own tables only, which EXPLAIN ANALYZE may safely run again."""
+    verb, _, table = statement_shape(statement).partition(" ")
+    return verb == "select" and table in Base.metadata.tables
+
+
+@dataclass
+class SlowStatement:
+    shape: str
+    statement: str
+    parameters: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    last_seen: datetime | None = None
+    # EXPLAIN (ANALYZE, BUFFERS) output, literals redacted
+    plan: dict | None = None
+    plan_captured_at: datetime | None = None
+
+
+class SlowQueryLog:
+    """Statements slower than a threshold, logged and kept per statement shape.
+
+    A sampled fraction of the slow reads is EXPLAIN (ANALYZE, BUFFERS)ed in
+    the background, on a connection of its own. The log keeps the slowest
+    max_statements shapes; canonical policy listing statements are kept per
+    PolicyQueries shape, any other per SQL text.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        explain_sample_rate: float = 0.0,
+        max_statements: int = 100,
+        explain_timeout: float = 30.0,
+    ):
+        self.threshold = threshold
+        self.explain_sample_rate = explain_sample_rate
+        self.max_statements = max_statements
+        self.explain_timeout = explain_timeout
+        self._statements: dict[str, SlowStatement] = {}
+        self._explaining: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        def start(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context.slow_query_started = time.perf_counter()
+
+        def observe(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "slow_query_started", None)
+            if started is None or context.execution_options.get(UNLOGGED_OPTION):
+                return
+            elapsed = time.perf_counter() - started
+            if elapsed < self.threshold:
+                return
+            shape = context.execution_options.get(SHAPE_OPTION)
+            if self.record(shape, statement, parameters, elapsed):
+                self._explain_later(engine, shape or statement, statement, parameters)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", start)
+        event.listen(engine.sync_engine, "after_cursor_execute", observe)
+
+    def record(
+        self, shape: str | None, statement: str, parameters: Any, elapsed: float
+    ) -> bool:
+        """Log a slow statement and keep it. Returns whether to EXPLAIN it."""
+        label = shape or statement_shape(statement)
+        redacted = redact_parameters(parameters)
+        LOG.warning(
+            f"Slow query {elapsed * 1000:.0f} ms, shape {label}, parameters "
+            f"{redacted}: {statement}"
+        )
+        key = shape or statement
+        slow = self._statements.get(key)
+        if slow is None:
+            if len(self._statements) >= self.max_statements:
+                fastest = min(
+                    self._statements, key=lambda k: self._statements[k].max_seconds
+                )
+                if self._statements[fastest].max_seconds >= elapsed:
+                    return False
+                del self._statements[fastest]
+            slow = self._statements[key] = SlowStatement(label, statement, redacted)
+        slow.statement = statement
+        slow.parameters = redacted
+        slow.count += 1
+        slow.total_seconds += elapsed
+        slow.max_seconds = max(slow.max_seconds, elapsed)
+        slow.last_seconds = elapsed
+        slow.last_seen = datetime.now(UTC)
+        return (
+            _explainable(statement)
+            and key not in self._explaining
+            and len(self._explaining) < MAX_CONCURRENT_EXPLAINS
+            and random.random() < self.explain_sample_rate  # noqa S311
+        )
+
+    def _explain_later(
+        self, engine: AsyncEngine, key: str, statement: str, parameters: Any
+    ) -> None:
+        self._explaining.add(key)
+        task = asyncio.get_running_loop().create_task(
+            self._explain(engine, key, statement, parameters)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(
+        self, engine: AsyncEngine, key: str, statement: str, parameters: Any
+    ) -> None:
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(**{UNLOGGED_OPTION: True})
+                # rolled back when the connection is returned
+                await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(self.explain_timeout * 1000)}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+                )
+                plan = explain_from_result(result.scalar())
+        except Exception as e:
+            LOG.warning(f"EXPLAIN of a slow query failed: {e}")
+        else:
+            slow = self._statements.get(key)
+            if slow is not None:
+                slow.plan = redact_plan(plan)
+                slow.plan_captured_at = datetime.now(UTC)
+        finally:
+            self._explaining.discard(key)
+
+    def top(self, limit: int) -> list[dict]:
+        """The slowest statements first, by their slowest execution."""
+        slowest = sorted(
+            self._statements.values(), key=lambda s: s.max_seconds, reverse=True
+        )
+        return [asdict(slow) for slow in slowest[:limit]]
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,75 @@
+from typing import (
+    AsyncIterator,
+    Collection,
+    NamedTuple,
+    Protocol,
+)
+
+from app.db.pagination import (
+    PageCursor,
+    PolicyPage,
+    PolicyVersion,
+)
+from app.models.enums import (
+    BulkItemStatus,
+    ReadPath,
+    TotalCountMode,
+)
+from app.models.policy import Policy
+from app.models.policy_filter import PolicyFilter
+
+
+class SerializedPolicy(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class PolicyStorage(Protocol):
+    """Policy operations the API is served from.
+
+    AsyncDBApi implements them on Postgres, InMemoryPolicyStorage in process
+    memory. Policies are listed newest first, ``created_at desc, id desc``.
+    """
+
+    async def connect(self) -> None: ...
+
+    async def close(self, drain_timeout: float = 0.0) -> None: ...
+
+    async def create_insurance_policy(self, policy: Policy) -> None:
+        """Store a policy, raises sqlalchemy's IntegrityError if its number is taken."""
+        ...
+
+    async def bulk_create_insurance_policies(
+        self, policies: list[Policy]
+    ) -> list[BulkItemStatus]:
+        """Store the policies whose numbers are free, with a status per input policy.
+
+        Raises sqlalchemy's DBAPIError if the batch fails as a whole.
+        """
+        ...
+
+    async def get_policies_filtered_with_pagination(
+        self,
+        policy_filter: PolicyFilter,
+        page: int,
+        page_size: int,
+        cursor: PageCursor | None = None,
+        include_total: TotalCountMode = TotalCountMode.EXACT,
+        fields: Collection[str] | None = None,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> PolicyPage: ...
+
+    async def get_policies_version(
+        self, policy_filter: PolicyFilter
+    ) -> PolicyVersion: ...
+
+    def stream_policies(
+        self,
+        policy_filter: PolicyFilter,
+        batch_size: int = 1000,
+        read_path: ReadPath = ReadPath.ORM,
+    ) -> AsyncIterator[Policy]: ...
+
+    async def get_single_policy_json(
+        self, policy_number: str, fields: Collection[str] | None = None
+    ) -> SerializedPolicy | None: ...
@@ -1,5 +1,8 @@
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import AsyncGenerator
 
 from fastapi import (
@@ -7,52 +10,153 @@ from fastapi import (
     status,
 )
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.ext.asyncio import AsyncEngine
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from alembic import command
-from alembic import config as alembic_config
 from app.api.api_v1 import api_router
-from app.api.deps import get_db
+from app.api.deps import (
+    get_db,
+    profile_store,
+)
 from app.core.config import settings
+from app.core.metrics import (
+    REGISTRY,
+    merge_snapshots,
+    read_snapshots,
+    render,
+    write_snapshot,
+)
+from app.core.middleware import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+)
 from app.db.async_db_api import AsyncDBApi
+from app.db.metrics import pool_families
+from app.schemas.status import (
+    DBPoolsStatus,
+    QueryCacheStatus,
+)
+from app.utils import get_alembic_heads
 
 LOG = logging.getLogger(__name__)
 
+REGISTRY.add_collector(lambda: pool_families(get_db().pool_status()))
+
+
+async def run_migrations(conn: AsyncConnection):
+    # alembic is only needed when the schema is behind, import it then
+    from alembic import command
+    from alembic import config as alembic_config
 
-async def run_migrations(engine: AsyncEngine):
     alembic_cfg = alembic_config.Config("alembic.ini")
 
     url = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWD}@{settings.DB_HOST}/{settings.DB_INSTANCE_NAME}"
     alembic_cfg.set_main_option("sqlalchemy.url", url)
 
-    async with engine.begin() as conn:
-        await conn.run_sync(
-            lambda sync_conn: alembic_cfg.attributes.__setitem__(
-                "connection", sync_conn
+    await conn.run_sync(
+        lambda sync_conn: alembic_cfg.attributes.__setitem__("connection", sync_conn)
+    )
+    await conn.run_sync(lambda sync_conn: command.upgrade(alembic_cfg, "head"))
+    await conn.commit()
+
+
+async def migrate_schema(async_db_api: AsyncDBApi) -> None:
+    # workers start together, one at a time creates and migrates the schema
+    async with async_db_api.schema_lock() as conn:
+        if await async_db_api.schema_revisions(conn) == get_alembic_heads():
+            LOG.info("Schema is current, skipping migrations")
+            return
+        await async_db_api.create_all(conn)
+        LOG.info("Running alembic upgrade head")
+        try:
+            await run_migrations(conn)
+        except Exception as e:
+            LOG.exception(f"Error running migrations: {e}")
+        LOG.info("Migrations complete")
+
+
+async def ensure_partitions(async_db_api: AsyncDBApi) -> None:
+    # one worker at a time, the others find the partitions there
+    try:
+        async with async_db_api.schema_lock() as conn:
+            created = await async_db_api.ensure_policy_partitions(
+                conn, settings.POLICY_PARTITION_YEARS_AHEAD
             )
-        )
-        await conn.run_sync(lambda sync_conn: command.upgrade(alembic_cfg, "head"))
+    except Exception as e:
+        LOG.warning(f"Creating policy partitions failed: {e}")
+        return
+    if created:
+        LOG.info(f"Created policy partitions {', '.join(created)}")
+
+
+async def maintain_partitions(async_db_api: AsyncDBApi, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await ensure_partitions(async_db_api)
+
+
+async def share_metrics(directory: Path, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            write_snapshot(directory, REGISTRY.snapshot())
+        except OSError as e:
+            LOG.warning(f"Sharing metrics in {directory} failed: {e}")
+
+
+def share_final_metrics(directory: Path) -> None:
+    """Leave this worker's counters to the others, its gauges go with it."""
+    snapshot = {
+        name: family
+        for name, family in REGISTRY.snapshot().items()
+        if family["type"] != "gauge"
+    }
+    try:
+        write_snapshot(directory, snapshot)
+    except OSError as e:
+        LOG.warning(f"Sharing metrics in {directory} failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Setup
     LOG.info(f"Backend version: {settings.BACKEND_VERSION}")
+    started = time.perf_counter()
     async_db_api: AsyncDBApi = get_db()
     await async_db_api.connect()
-    await async_db_api.create_all()
-    LOG.info("Running alembic upgrade head")
-    try:
-        await run_migrations(async_db_api.get_engine())
-    except Exception as e:
-        LOG.exception(f"Error running migrations: {e}")
-    LOG.info("Migrations complete")
+    connected = time.perf_counter()
+    await migrate_schema(async_db_api)
+    await ensure_partitions(async_db_api)
+    migrated = time.perf_counter()
+    if settings.DB_POOL_PREWARM > 0:
+        await async_db_api.prewarm(settings.DB_POOL_PREWARM)
+    prewarmed = time.perf_counter()
+    LOG.info(
+        f"Startup took {prewarmed - started:.3f}s: connect {connected - started:.3f}s,"
+        f" schema {migrated - connected:.3f}s, prewarm {prewarmed - migrated:.3f}s"
+    )
+
+    partition_maintenance = asyncio.create_task(
+        maintain_partitions(async_db_api, settings.POLICY_PARTITION_CHECK_INTERVAL)
+    )
+    metrics_sharing = None
+    if settings.METRICS_DIR:
+        metrics_sharing = asyncio.create_task(
+            share_metrics(Path(settings.METRICS_DIR), settings.METRICS_SHARE_INTERVAL)
+        )
+    elif settings.WEB_CONCURRENCY > 1:
+        LOG.warning("METRICS_DIR is not set, /metrics shows the serving worker's only")
 
     # Run
     yield
 
-    # Teardown
-    await async_db_api.close()
+    partition_maintenance.cancel()
+    if metrics_sharing is not None:
+        metrics_sharing.cancel()
+        share_final_metrics(Path(settings.METRICS_DIR))
+    # Teardown, uvicorn has finished the in-flight requests by now; streamed
+    # responses may still hold connections
+    await async_db_api.close(drain_timeout=settings.DB_DRAIN_TIMEOUT)
 
 
 app = FastAPI(
@@ -74,6 +178,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    ProfilingMiddleware,
+    settings=settings,
+    store=profile_store,
+)
+# outermost, timing the other middleware too
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/task/api/v1/status", status_code=status.HTTP_200_OK, summary="Health check")
@@ -81,6 +192,43 @@ async def healthcheck() -> dict:
     return {"msg": "OK"}
 
 
+@app.get(
+    "/task/api/v1/status/pool",
+    status_code=status.HTTP_200_OK,
+    summary="DB connection pool status of the serving worker",
+    response_model=DBPoolsStatus,
+)
+async def pool_status() -> dict:
+    return get_db().pool_status()
+
+
+@app.get(
+    "/task/api/v1/status/query-cache",
+    status_code=status.HTTP_200_OK,
+    summary="Policy query statement cache counters of the serving worker",
+    response_model=QueryCacheStatus,
+)
+async def query_cache_status() -> dict:
+    return get_db().query_cache_status()
+
+
+@app.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Prometheus metrics, of all worker processes sharing METRICS_DIR",
+    response_class=PlainTextResponse,
+)
+async def metrics() -> PlainTextResponse:
+    snapshot = REGISTRY.snapshot()
+    if settings.METRICS_DIR:
+        snapshot = merge_snapshots(
+            [snapshot, *read_snapshots(Path(settings.METRICS_DIR))]
+        )
+    return PlainTextResponse(
+        render(snapshot), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
     LOG.error(f"Validation error, request: {request}, error: {exc.errors()}")
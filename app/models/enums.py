@@ -32,3 +32,28 @@ class PaymentMethod(StrEnum):
     CHECK = "CHECK"
     CASH = "CASH"
     PAYPAL = "PAYPAL"
+
+
+class TotalCountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class BulkItemStatus(StrEnum):
+    CREATED = "created"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+    ERROR = "error"
+    # not attempted, an earlier chunk of the request failed
+    SKIPPED = "skipped"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ReadPath(StrEnum):
+    ORM = "orm"
+    CORE = "core"
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.models.enums import (
+    PolicyStatus,
+    PolicyType,
+)
+
+
+class PolicyFilter(BaseModel):
+    expiration_date_from: datetime | None = None
+    expiration_date_to: datetime | None = None
+    effective_date_from: datetime | None = None
+    effective_date_to: datetime | None = None
+    policyholder_id_number: str | None = None
+    policy_number: str | None = None
+    policy_type: PolicyType | None = None
+    policy_status: PolicyStatus | None = None
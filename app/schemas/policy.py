@@ -1,8 +1,24 @@
+from typing import Any
+
 from pydantic import BaseModel
 
+from app.models.enums import BulkItemStatus
 from app.models.policy import Policy
 
 
 class FilteredPoliciesResponse(BaseModel):
     policies: list[Policy]
-    total_count: int
+    total_count: int | None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class BulkPolicyResult(BaseModel):
+    index: int
+    policy_number: str | None = None
+    status: BulkItemStatus
+    errors: list[dict[str, Any]] | None = None
+
+
+class BulkPoliciesResponse(BaseModel):
+    results: list[BulkPolicyResult]
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStatus(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkout_timeouts: int
+    checkout_wait_seconds: HistogramSnapshot
+
+
+class DBPoolsStatus(BaseModel):
+    pid: int
+    primary: PoolStatus | None = None
+    replicas: dict[str, PoolStatus] = {}
+
+
+class CacheCounters(BaseModel):
+    hits: int
+    misses: int
+
+
+class PolicyCacheStatus(CacheCounters):
+    size: int
+    maxsize: int
+    evictions: int
+    # False while cross-worker invalidation is down and the cache is bypassed
+    live: bool
+
+
+class QueryCacheStatus(BaseModel):
+    pid: int
+    shapes: int
+    statement_cache: CacheCounters
+    compiled_cache: CacheCounters
+    policy_cache: PolicyCacheStatus
+
+
+class SlowStatement(BaseModel):
+    # PolicyQueries shape, or verb and first table
+    shape: str
+    statement: str
+    # types of the latest bound parameters
+    parameters: str
+    count: int
+    total_seconds: float
+    max_seconds: float
+    last_seconds: float
+    last_seen: datetime | None
+    plan: dict | None
+    plan_captured_at: datetime | None
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    created_at: datetime
+    size: int
+
+
+class SlowQueriesStatus(BaseModel):
+    pid: int
+    threshold_seconds: float | None
+    statements: list[SlowStatement]
@@ -1,3 +1,5 @@
+import functools
+import json
 import logging
 import os
 import re
@@ -34,3 +36,50 @@ def get_version_from_pyproject():
     except Exception as e:
         LOG.error(f"Error reading version from pyproject.toml: {e}")
         return os.environ.get("MAIN_BACKEND_VERSION", "unknown")
+
+
+# Written at image build time by write_build_info, read instead of parsing
+# pyproject.toml and the alembic scripts on every start
+BUILD_INFO_PATH = Path(__file__).parent / "build_info.json"
+
+
+@functools.cache
+def read_build_info() -> dict:
+    try:
+        return json.loads(BUILD_INFO_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        LOG.warning(f"Ignoring unreadable {BUILD_INFO_PATH}: {e}")
+        return {}
+
+
+def get_version() -> str:
+    return read_build_info().get("version") or get_version_from_pyproject()
+
+
+def get_alembic_heads() -> set[str]:
+    """Revisions the schema is at once migrated, from the build info if baked."""
+    heads = read_build_info().get("alembic_heads")
+    if heads:
+        return set(heads)
+    # alembic is only imported when the heads were not baked
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config("alembic.ini")).get_heads())
+
+
+def write_build_info() -> None:
+    read_build_info.cache_clear()
+    BUILD_INFO_PATH.unlink(missing_ok=True)
+    build_info = {
+        "version": get_version_from_pyproject(),
+        "alembic_heads": sorted(get_alembic_heads()),
+    }
+    BUILD_INFO_PATH.write_text(json.dumps(build_info))
+    read_build_info.cache_clear()
+
+
+if __name__ == "__main__":
+    write_build_info()
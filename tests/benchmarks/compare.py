@@ -0,0 +1,51 @@
+"""Compare two benchmark result files, exiting non-zero on regressions.
+
+python -m tests.benchmarks.compare .benchmarks/<base>.json .benchmarks/<head>.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(base: dict, head: dict, metric: str, threshold: float) -> list[str]:
+    """Names of the benchmarks whose metric grew by more than threshold times."""
+    regressions = []
+    print(f"{'benchmark':<70} {'base':>9} {'head':>9} {'ratio':>6}")
+    for name, result in head["results"].items():
+        before = base["results"].get(name)
+        if before is None or not before[metric]:
+            print(f"{name:<70} {'-':>9} {result[metric]:>9.3f}")
+            continue
+        ratio = result[metric] / before[metric]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = " REGRESSION"
+        print(
+            f"{name:<70} {before[metric]:>9.3f} {result[metric]:>9.3f} {ratio:>6.2f}{flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument(
+        "--threshold", type=float, default=1.2, help="Allowed head/base ratio"
+    )
+    args = parser.parse_args()
+    base, head = (json.loads(path.read_text()) for path in (args.base, args.head))
+    print(f"{base['commit']} -> {head['commit']}, {args.metric}")
+    regressions = compare(base, head, args.metric, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressions over {args.threshold}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Benchmark fixtures: a seeded in-memory backend and a JSON results file.
+
+Run with ``pytest -m benchmark``; results go to ``BENCHMARK_OUTPUT``, by default
+``.benchmarks/<commit>.json``, compare two with ``python -m tests.benchmarks.compare``.
+"""
+
+import os
+import random
+from pathlib import Path
+
+import pytest
+from httpx import (
+    ASGITransport,
+    AsyncClient,
+)
+
+from app.db.memory_storage import InMemoryPolicyStorage
+from tests.benchmarks.harness import (
+    BENCHMARK_POLICIES,
+    BenchmarkResults,
+    build_policy,
+    commit,
+)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    results = BenchmarkResults()
+    yield results
+    if results.results:
+        path = Path(
+            os.environ.get("BENCHMARK_OUTPUT") or f".benchmarks/{commit()}.json"
+        )
+        results.write(path)
+        print(f"\nBenchmark results written to {path}")
+
+
+@pytest.fixture(scope="session")
+async def bench_storage() -> InMemoryPolicyStorage:
+    rng = random.Random(20240101)  # noqa S311
+    storage = InMemoryPolicyStorage()
+    await storage.bulk_create_insurance_policies(
+        [build_policy(index, rng) for index in range(BENCHMARK_POLICIES)]
+    )
+    return storage
+
+
+@pytest.fixture(scope="session")
+async def bench_client(bench_storage: InMemoryPolicyStorage):
+    """Client of the API served from the seeded storage, without lifespan.
+
+    The storage replaces the deps singleton rather than going through
+    dependency_overrides, which FastAPI resolves anew on every request.
+    """
+    from app.main import app
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("app.api.deps.async_db_api", bench_storage)
+        async with AsyncClient(  # noqa S113
+            transport=ASGITransport(app=app), base_url="http://localhost"
+        ) as ac:
+            yield ac
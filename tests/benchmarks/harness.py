@@ -0,0 +1,140 @@
+"""Seed data and result recording shared by the benchmarks."""
+
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import (
+    datetime,
+    timedelta,
+)
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+from app.models.enums import (
+    PaymentFrequency,
+    PaymentMethod,
+    PolicyStatus,
+    PolicyType,
+)
+from app.models.policy import Policy
+
+BENCHMARK_POLICIES = int(os.environ.get("BENCHMARK_POLICIES", 5000))
+BENCHMARK_ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", 200))
+SEED_START = datetime(2024, 1, 1)
+
+
+def build_policy(index: int, rng: random.Random) -> Policy:
+    """Validated policy, the same for the same index and generator state."""
+    effective_date = SEED_START + timedelta(days=rng.randrange(730))
+    return Policy(
+        policy_number=f"BENCH-{index:07d}",
+        type=rng.choice(list(PolicyType)),
+        status=rng.choice(list(PolicyStatus)),
+        created_at=SEED_START + timedelta(seconds=index),
+        effective_date=effective_date,
+        expiration_date=effective_date + timedelta(days=rng.randrange(30, 730)),
+        policyholder={
+            # about five policies per policyholder
+            "id_number": f"HOLDER-{rng.randrange(max(BENCHMARK_POLICIES // 5, 1))}",
+            "first_name": "Jane",
+            "last_name": f"Doe{index}",
+            "date_of_birth": datetime(1960, 1, 1)
+            + timedelta(days=rng.randrange(15000)),
+            "email": f"jane.doe{index}@example.com",
+            "phone": "555-123-4567",
+            "address": {
+                "street": f"{index} Main St",
+                "city": "Anytown",
+                "state": "CA",
+                "zip_code": "12345",
+                "country": "US",
+            },
+        },
+        coverages=[
+            {
+                "type": "liability",
+                "description": "Bodily injury and property damage liability",
+                "limit": 100000.0,
+                "deductible": 500.0,
+            }
+        ],
+        premium={
+            "amount": 1200.0,
+            "frequency": rng.choice(list(PaymentFrequency)),
+            "method": rng.choice(list(PaymentMethod)),
+            "next_payment_date": effective_date.date() + timedelta(days=30),
+        },
+    )
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ascending samples."""
+    return ordered[max(round(fraction * len(ordered)) - 1, 0)]
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(  # noqa S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class BenchmarkResults:
+    """Latency summaries per benchmark name, written out as one JSON document."""
+
+    def __init__(self):
+        self.results: dict[str, dict] = {}
+
+    def record(self, name: str, latencies: list[float]) -> dict:
+        ordered = sorted(latencies)
+        total = sum(ordered)
+        summary = {
+            "rounds": len(ordered),
+            "throughput_per_s": len(ordered) / total if total else None,
+            "mean_ms": total / len(ordered) * 1000,
+            "p50_ms": _percentile(ordered, 0.50) * 1000,
+            "p95_ms": _percentile(ordered, 0.95) * 1000,
+            "p99_ms": _percentile(ordered, 0.99) * 1000,
+        }
+        self.results[name] = summary
+        return summary
+
+    async def measure(
+        self,
+        name: str,
+        call: Callable[[int], Awaitable],
+        rounds: int = BENCHMARK_ROUNDS,
+        warmup: int = 10,
+    ) -> dict:
+        """Time sequential awaits of call(index), after warmup ones; no index repeats."""
+        for index in range(warmup):
+            await call(index)
+        latencies = []
+        for index in range(warmup, warmup + rounds):
+            start = time.perf_counter()
+            await call(index)
+            latencies.append(time.perf_counter() - start)
+        return self.record(name, latencies)
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "commit": commit(),
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "backend": "memory",
+            "policies": BENCHMARK_POLICIES,
+            "results": dict(sorted(self.results.items())),
+        }
+        path.write_text(json.dumps(document, indent=2))
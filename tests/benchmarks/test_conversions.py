@@ -0,0 +1,66 @@
+"""Cost of the DBO conversions and of Pydantic validation, per 100 policies."""
+
+import random
+
+import pytest
+
+from app.db.models.policy_dbo import PolicyDBO
+from app.models.policy import Policy
+from tests.benchmarks.harness import build_policy
+
+BATCH = 100
+
+
+@pytest.fixture(scope="module")
+def policies() -> list[Policy]:
+    rng = random.Random(BATCH)  # noqa S311
+    return [build_policy(index, rng) for index in range(BATCH)]
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+async def test_dbo_conversions(benchmark_results, policies):
+    dbos = [PolicyDBO.from_model(policy) for policy in policies]
+
+    async def from_model(_: int) -> None:
+        for policy in policies:
+            PolicyDBO.from_model(policy)
+
+    async def to_model(_: int) -> None:
+        for dbo in dbos:
+            dbo.to_model()
+
+    async def construct_model(_: int) -> None:
+        for dbo in dbos:
+            dbo.construct_model()
+
+    await benchmark_results.measure(f"PolicyDBO.from_model x{BATCH}", from_model)
+    await benchmark_results.measure(f"PolicyDBO.to_model x{BATCH}", to_model)
+    await benchmark_results.measure(
+        f"PolicyDBO.construct_model x{BATCH}", construct_model
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+async def test_pydantic_validation(benchmark_results, policies):
+    documents = [policy.model_dump(mode="json") for policy in policies]
+    payloads = [policy.model_dump_json() for policy in policies]
+
+    async def validate_python(_: int) -> None:
+        for document in documents:
+            Policy.model_validate(document)
+
+    async def validate_json(_: int) -> None:
+        for payload in payloads:
+            Policy.model_validate_json(payload)
+
+    async def dump_json(_: int) -> None:
+        for policy in policies:
+            policy.model_dump_json()
+
+    await benchmark_results.measure(f"Policy.model_validate x{BATCH}", validate_python)
+    await benchmark_results.measure(
+        f"Policy.model_validate_json x{BATCH}", validate_json
+    )
+    await benchmark_results.measure(f"Policy.model_dump_json x{BATCH}", dump_json)
@@ -0,0 +1,98 @@
+"""Latency and throughput of the policies endpoints, run with ``pytest -m benchmark``."""
+
+import random
+
+import pytest
+
+from tests.benchmarks.harness import (
+    BENCHMARK_POLICIES,
+    BENCHMARK_ROUNDS,
+    SEED_START,
+    build_policy,
+)
+
+API = "/task/api/v1"
+
+# one of each filter, by its query parameter
+FILTERS = {
+    "none": {},
+    "effective-date-from": {"effective-date-from": "2025-06-01T00:00:00"},
+    "effective-date-to": {"effective-date-to": "2024-03-01T00:00:00"},
+    "expiration-date-from": {"expiration-date-from": "2026-01-01T00:00:00"},
+    "expiration-date-to": {"expiration-date-to": "2024-06-01T00:00:00"},
+    "policyholder-id-number": {"policyholder-id-number": "HOLDER-7"},
+    "policy-number": {"policy-number": "BENCH-00012"},
+    "policy-type": {"policy-type": "AUTO"},
+    "policy-status": {"policy-status": "ACTIVE"},
+}
+PAGE_SIZES = (10, 100)
+DEEP_PAGE = 20
+WARMUP = 10
+
+
+def _policy_number(index: int) -> str:
+    # spread over the seeded policies
+    return f"BENCH-{index * 7919 % BENCHMARK_POLICIES:07d}"
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+@pytest.mark.parametrize("filter_name", FILTERS)
+async def test_list_policies(bench_client, benchmark_results, filter_name, page_size):
+    params = {**FILTERS[filter_name], "page-size": page_size}
+    deep = await bench_client.get(
+        f"{API}/policies", params={**params, "page": DEEP_PAGE - 1}
+    )
+    cursor = deep.json()["next_cursor"]
+    depths = {"page=1": {}, f"page={DEEP_PAGE}": {"page": DEEP_PAGE}}
+    if cursor is not None:
+        depths[f"cursor@{DEEP_PAGE}"] = {"cursor": cursor}
+    for depth, depth_params in depths.items():
+
+        async def call(_: int, depth_params=depth_params) -> None:
+            response = await bench_client.get(
+                f"{API}/policies", params={**params, **depth_params}
+            )
+            assert response.status_code == 200
+
+        await benchmark_results.measure(
+            f"GET /policies {filter_name} size={page_size} {depth}", call
+        )
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+@pytest.mark.parametrize("fields", [None, "policy_number,status"])
+async def test_get_single_policy(bench_client, benchmark_results, fields):
+    params = {"fields": fields} if fields else {}
+
+    async def call(index: int) -> None:
+        response = await bench_client.get(
+            f"{API}/policies/{_policy_number(index)}", params=params
+        )
+        assert response.status_code == 200
+
+    await benchmark_results.measure(
+        f"GET /policies/{{policy_number}} fields={fields or 'all'}", call
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+async def test_create_policy(bench_client, benchmark_results):
+    rng = random.Random(SEED_START.year)  # noqa S311
+    bodies = {}
+
+    async def call(index: int) -> None:
+        response = await bench_client.post(
+            f"{API}/policies",
+            content=bodies[index],
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 201
+
+    # numbers past the seeded ones, serialized up front
+    for index in range(WARMUP + BENCHMARK_ROUNDS):
+        bodies[index] = build_policy(BENCHMARK_POLICIES + index, rng).model_dump_json()
+    await benchmark_results.measure("POST /policies", call, warmup=WARMUP)
@@ -0,0 +1,87 @@
+"""CPU cost of serializing a listing page, run with ``pytest -m benchmark -s``."""
+
+import json
+import time
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.db.models.policy_dbo import PolicyDBO
+from app.models.coverage import Coverage
+from app.schemas.policy import FilteredPoliciesResponse
+from tests.factories import (
+    PolicyFactory,
+    PremiumFactory,
+)
+
+PAGE_SIZE = 100
+ROUNDS = 50
+
+
+def _page() -> list[PolicyDBO]:
+    return [
+        PolicyDBO.from_model(
+            PolicyFactory.build(
+                effective_date=datetime.now(),
+                expiration_date=datetime.now() + timedelta(days=30),
+                premium=PremiumFactory.build(amount=100.0),
+                coverages=[
+                    Coverage(
+                        type="liability", description="d", limit=1.0, deductible=0.1
+                    )
+                ],
+            )
+        )
+        for _ in range(PAGE_SIZE)
+    ]
+
+
+async def _validated(policies: list[PolicyDBO]) -> bytes:
+    """The former path: validated models, response model validation, jsonable_encoder."""
+    content = FilteredPoliciesResponse(
+        policies=[policy.to_model() for policy in policies], total_count=PAGE_SIZE
+    )
+    field = create_model_field(name="Response", type_=FilteredPoliciesResponse)
+    encoded = await serialize_response(
+        field=field, response_content=content, is_coroutine=True
+    )
+    return JSONResponse(encoded).body
+
+
+async def _trusted(policies: list[PolicyDBO]) -> bytes:
+    return FilteredPoliciesResponse.model_construct(
+        policies=[policy.construct_model() for policy in policies],
+        total_count=PAGE_SIZE,
+        next_cursor=None,
+        prev_cursor=None,
+    ).model_dump_json()
+
+
+async def _cpu_per_page(serialize, policies: list[PolicyDBO]) -> float:
+    await serialize(policies)
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        await serialize(policies)
+    return (time.process_time() - start) / ROUNDS
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+async def test_trusted_serialization_is_cheaper():
+    policies = _page()
+    assert json.loads(await _trusted(policies)) == json.loads(
+        await _validated(policies)
+    )
+    validated = await _cpu_per_page(_validated, policies)
+    trusted = await _cpu_per_page(_trusted, policies)
+    print(
+        f"\n{PAGE_SIZE} policies per page, CPU: validated {validated * 1000:.2f} ms, "
+        f"trusted {trusted * 1000:.2f} ms ({validated / trusted:.1f}x)"
+    )
+    assert trusted < validated / 2
@@ -11,6 +11,7 @@ from httpx import (
 )
 from pytest_mock import MockerFixture
 
+from app.db.memory_storage import InMemoryPolicyStorage
 from tests.fake_db import (
     AsyncDBApiMock,
     test_policy_number,
@@ -55,3 +56,24 @@ async def client(
             transport=ASGITransport(app=app), base_url="http://localhost"
         ) as ac:
             yield ac
+
+
+@pytest.fixture
+async def memory_storage() -> InMemoryPolicyStorage:
+    return InMemoryPolicyStorage()
+
+
+@pytest.fixture
+async def memory_client(memory_storage: InMemoryPolicyStorage):
+    """Client of the API served from an in-memory storage, without lifespan."""
+    from app.api.deps import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: memory_storage
+    try:
+        async with AsyncClient(  # noqa S113
+            transport=ASGITransport(app=app), base_url="http://localhost"
+        ) as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_db)
@@ -0,0 +1,27 @@
+from app.core.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_expires_entries(mocker):
+    now = mocker.patch("app.core.cache.time.monotonic", return_value=100.0)
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    now.return_value = 111.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.etag import (
+    etag_matches,
+    make_etag,
+)
+
+
+def test_make_etag():
+    assert make_etag(b"a", "b") == make_etag("a", b"b")
+    assert make_etag("ab") != make_etag("a", "b")
+    assert make_etag("a", weak=True) == f"W/{make_etag('a')}"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ('"other"', False),
+        ('"tag"', True),
+        ('W/"tag"', True),
+        ('"other", "tag"', True),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"tag"') is expected
@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+
+from app.core.metrics import (
+    ARCHIVE_FILE,
+    Histogram,
+    Registry,
+    family_snapshot,
+    merge_snapshots,
+    read_snapshots,
+    render,
+    write_snapshot,
+)
+
+
+def test_histogram_snapshot_is_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 2.65
+
+
+def test_render_labelled_families():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), (0.1,))
+    requests.labels('/a"b').inc()
+    latency.labels("/a").observe(0.05)
+    registry.add_collector(
+        lambda: {"up": family_snapshot("gauge", "Up", (), [((), 1)])}
+    )
+    assert render(registry.snapshot()).splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 1',
+        'latency_seconds_sum{route="/a"} 0.05',
+        'latency_seconds_count{route="/a"} 1',
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 1',
+        "# HELP up Up",
+        "# TYPE up gauge",
+        "up 1",
+    ]
+
+
+def test_merge_snapshots_sums_by_label_values():
+    first, second = Registry(), Registry()
+    for registry, routes in ((first, ["/a", "/b"]), (second, ["/a"])):
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency", (), (0.1,))
+        for route in routes:
+            requests.labels(route).inc()
+            latency.labels().observe(0.5)
+    merged = merge_snapshots([first.snapshot(), second.snapshot()])
+    assert merged["requests_total"]["samples"] == [[["/a"], 2], [["/b"], 1]]
+    [[_, histogram]] = merged["latency_seconds"]["samples"]
+    assert histogram == {"buckets": {"0.1": 0, "+Inf": 3}, "count": 3, "sum": 1.5}
+
+
+def test_snapshots_of_exited_processes_keep_counters_only(tmp_path):
+    exited = subprocess.Popen(["true"])  # noqa S603 S607
+    exited.wait()
+    snapshot = {
+        "requests_total": family_snapshot("counter", "Requests", (), [((), 3)]),
+        "connections": family_snapshot("gauge", "Connections", (), [((), 2)]),
+    }
+    write_snapshot(tmp_path, snapshot)
+    (tmp_path / f"{os.getppid()}-parent.json").write_text(json.dumps(snapshot))
+    (tmp_path / f"{exited.pid}-exited.json").write_text(json.dumps(snapshot))
+    # this process' own file is skipped, its live registry is used instead
+    merged = merge_snapshots(read_snapshots(tmp_path))
+    assert merged["requests_total"]["samples"] == [[[], 6]]
+    assert merged["connections"]["samples"] == [[[], 2]]
+    # the exited process' counters were archived, its file deleted
+    assert not (tmp_path / f"{exited.pid}-exited.json").exists()
+    assert merge_snapshots(read_snapshots(tmp_path)) == merged
+
+
+def test_reused_pids_do_not_overwrite_snapshots(tmp_path):
+    counted = {"requests_total": family_snapshot("counter", "Requests", (), [((), 3)])}
+    # of an exited worker whose pid this process got
+    (tmp_path / f"{os.getpid()}-previous.json").write_text(json.dumps(counted))
+    write_snapshot(tmp_path, counted)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    for _ in range(2):
+        merged = merge_snapshots(read_snapshots(tmp_path))
+        assert merged["requests_total"]["samples"] == [[[], 3]]
+    assert [path.name for path in tmp_path.glob("*.json") if "-" not in path.name] == [
+        ARCHIVE_FILE
+    ]
@@ -0,0 +1,55 @@
+import sys
+import threading
+import time
+
+from app.core.profiling import (
+    ProfileStore,
+    StackSampler,
+)
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_folds_the_thread_stacks():
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    _busy(0.1)
+    sampler.stop()
+
+    assert sampler.samples > 10
+    stacks = [line.rsplit(" ", 1) for line in sampler.folded().splitlines()]
+    assert sum(int(count) for _, count in stacks) == sampler.samples
+    busy = [stack for stack, _ in stacks if stack.endswith("test_profiling:_busy")]
+    assert busy
+    assert "test_profiling:test_sampler_folds_the_thread_stacks;" in busy[0]
+
+
+def test_sampler_restores_the_switch_interval():
+    interval = sys.getswitchinterval()
+    first = StackSampler(threading.get_ident(), interval=interval / 10)
+    second = StackSampler(threading.get_ident(), interval=interval / 20)
+    first.start()
+    assert sys.getswitchinterval() == interval / 10
+    second.start()
+    assert sys.getswitchinterval() == interval / 20
+    # overlapping samplers, the last one to stop restores it
+    first.stop()
+    assert sys.getswitchinterval() == interval / 20
+    second.stop()
+    assert sys.getswitchinterval() == interval
+
+
+def test_store_keeps_the_newest(tmp_path):
+    store = ProfileStore(tmp_path, keep=2)
+    ids = [f"20260101-00000{second}-1-abcdef01" for second in range(3)]
+    for profile_id in ids:
+        store.save(profile_id, "a;b 1\n")
+
+    assert [profile["id"] for profile in store.list()] == ids[:0:-1]
+    assert store.path(ids[0]) is None
+    assert store.path(ids[2]).read_text() == "a;b 1\n"
+    assert store.path("../" + ids[2]) is None
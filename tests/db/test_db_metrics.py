@@ -0,0 +1,40 @@
+import pytest
+
+from app.db.metrics import (
+    DB_CALL_ERRORS,
+    DB_CALL_SECONDS,
+    statement_shape,
+    timed,
+)
+
+
+def test_statement_shape():
+    assert statement_shape("SELECT policy.id FROM policy WHERE x = $1") == (
+        "select policy"
+    )
+    assert statement_shape('INSERT INTO "person" (id) VALUES ($1)') == "insert person"
+    assert statement_shape("UPDATE premium SET amount = $1") == "update premium"
+    assert statement_shape("select pg_advisory_lock($1)") == "select pg_advisory_lock"
+    assert statement_shape("LISTEN policy_changes") == "other"
+
+
+@pytest.mark.anyio
+async def test_timed_counts_calls_and_errors():
+    @timed
+    async def lookup(fail: bool) -> int:
+        if fail:
+            raise KeyError("missing")
+        return 1
+
+    @timed
+    async def scan():
+        yield 1
+        yield 2
+
+    assert await lookup(False) == 1
+    with pytest.raises(KeyError):
+        await lookup(True)
+    assert [item async for item in scan()] == [1, 2]
+    assert DB_CALL_SECONDS.labels("lookup").count == 2
+    assert DB_CALL_ERRORS.labels("lookup", "KeyError").value == 1
+    assert DB_CALL_SECONDS.labels("scan").count == 1
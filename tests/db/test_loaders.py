@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.db.loaders import (
+    BatchLoader,
+    DBLoaders,
+)
+from tests.factories import (
+    CoverageFactory,
+    PolicyFactory,
+    PremiumFactory,
+)
+from tests.fake_db import AsyncDBApiMock
+
+
+class FakeBatch:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.calls.append(keys)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {key: key * 10 for key in keys if key > 0}
+
+
+@pytest.mark.anyio
+async def test_batch_loader_coalesces_concurrent_loads():
+    batch = FakeBatch()
+    loader = BatchLoader(batch)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(1), loader.load(-1)
+    )
+    assert results == [10, 20, 10, None]
+    assert batch.calls == [[1, 2, -1]]
+    assert await loader.load_many([2, 1]) == [20, 10]
+    assert loader.batch_count == 1
+
+
+@pytest.mark.anyio
+async def test_batch_loader_does_not_cache_failures():
+    batch = FakeBatch(fail=True)
+    loader = BatchLoader(batch)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    batch.fail = False
+    assert await loader.load(1) == 10
+    assert len(batch.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_db_loaders_batch_each_lookup():
+    db = AsyncDBApiMock()
+    holder = db.get_single_policy_by_number.return_value.policyholder
+    loaders = DBLoaders(db)
+    policy_ids = [uuid4(), uuid4()]
+    person, unknown, address, premiums, coverages = await asyncio.gather(
+        loaders.person.load(holder.id_number),
+        loaders.person.load("unknown"),
+        loaders.address.load(holder.id),
+        loaders.premium.load_many(policy_ids),
+        loaders.coverages.load_many(policy_ids),
+    )
+    assert (person, unknown, address) == (holder, None, holder.address)
+    assert premiums == [None, None]
+    assert coverages == [[], []]
+    # one query per entity type for all of the keys
+    db.get_persons_by_id_numbers.assert_awaited_once_with([holder.id_number, "unknown"])
+    db.get_addresses_by_person_ids.assert_awaited_once_with([holder.id])
+    db.get_premiums_by_policy_ids.assert_awaited_once_with(policy_ids)
+    db.get_coverages_by_policy_ids.assert_awaited_once_with(policy_ids)
+
+
+@pytest.mark.online
+@pytest.mark.anyio
+async def test_db_loaders_on_postgres(online_db_api):
+    policies = [
+        PolicyFactory.build(
+            policy_number=f"LOAD-{index}",
+            effective_date=datetime(2026, 1, 1),
+            expiration_date=datetime(2027, 1, 1),
+            premium=PremiumFactory.build(amount=100.0),
+            coverages=CoverageFactory.batch(index + 1),
+        )
+        for index in range(2)
+    ]
+    await online_db_api.bulk_create_insurance_policies(policies)
+    rows = [
+        await online_db_api.get_single_policy_by_number(policy.policy_number)
+        for policy in policies
+    ]
+    policy_ids = [row.id for row in rows]
+    loaders = DBLoaders(online_db_api)
+
+    persons, addresses, premiums, coverages = await asyncio.gather(
+        loaders.person.load_many([p.policyholder.id_number for p in policies]),
+        loaders.address.load_many([row.policyholder_id for row in rows]),
+        loaders.premium.load_many([*policy_ids, uuid4()]),
+        loaders.coverages.load_many(policy_ids),
+    )
+    assert [person.id for person in persons] == [row.policyholder_id for row in rows]
+    assert [address.person_id for address in addresses] == [
+        row.policyholder_id for row in rows
+    ]
+    assert [premium.policy_id for premium in premiums[:2]] == policy_ids
+    assert premiums[2] is None
+    assert [len(found) for found in coverages] == [1, 2]
+    assert loaders.person.batch_count == loaders.coverages.batch_count == 1
@@ -0,0 +1,218 @@
+import functools
+import random
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.memory_storage import InMemoryPolicyStorage
+from app.db.pagination import PageCursor
+from app.models.enums import (
+    BulkItemStatus,
+    PolicyStatus,
+    PolicyType,
+    TotalCountMode,
+)
+from app.models.policy import Policy
+from app.models.policy_filter import PolicyFilter
+from tests.factories import (
+    PolicyFactory,
+    PremiumFactory,
+)
+
+START = datetime(2024, 1, 1)
+
+
+def _policies(count: int) -> list[Policy]:
+    rng = random.Random(7)  # noqa S311
+    policies = []
+    for index in range(count):
+        effective_date = START + timedelta(days=rng.randrange(365))
+        policy = PolicyFactory.build(
+            policy_number=f"POL-{index:05d}",
+            type=rng.choice(list(PolicyType)),
+            status=rng.choice(list(PolicyStatus)),
+            # some share a creation time, ties are ordered by id
+            created_at=START + timedelta(minutes=index // 3),
+            effective_date=effective_date,
+            expiration_date=effective_date + timedelta(days=rng.randrange(1, 730)),
+            premium=PremiumFactory.build(amount=100.0),
+        )
+        policy.policyholder.id_number = f"ID-{index % 50}"
+        policies.append(policy)
+    return policies
+
+
+@functools.cache
+def _sample() -> tuple[Policy, ...]:
+    return tuple(_policies(300))
+
+
+@pytest.fixture
+async def storage() -> InMemoryPolicyStorage:
+    storage = InMemoryPolicyStorage()
+    await storage.bulk_create_insurance_policies(list(_sample()))
+    return storage
+
+
+def _expected(storage: InMemoryPolicyStorage, f: PolicyFilter) -> list[str]:
+    """Numbers of the filtered policies newest first, by brute force."""
+    matching = [
+        (policy.created_at, policy_id, policy.policy_number)
+        for policy_id, policy in storage._policies.items()
+        if (
+            f.effective_date_from is None
+            or policy.effective_date >= f.effective_date_from
+        )
+        and (
+            f.effective_date_to is None or policy.effective_date <= f.effective_date_to
+        )
+        and (
+            f.expiration_date_from is None
+            or policy.expiration_date >= f.expiration_date_from
+        )
+        and (
+            f.expiration_date_to is None
+            or policy.expiration_date <= f.expiration_date_to
+        )
+        and (f.policy_status is None or policy.status == f.policy_status)
+        and (f.policy_type is None or policy.type == f.policy_type)
+        and (
+            f.policyholder_id_number is None
+            or policy.policyholder.id_number == f.policyholder_id_number
+        )
+        and (f.policy_number is None or f.policy_number in policy.policy_number)
+    ]
+    return [number for _, _, number in sorted(matching, reverse=True)]
+
+
+FILTERS = [
+    PolicyFilter(),
+    PolicyFilter(policy_status=PolicyStatus.ACTIVE),
+    PolicyFilter(policy_type=PolicyType.AUTO, policy_number="1"),
+    PolicyFilter(
+        effective_date_from=START + timedelta(days=30),
+        effective_date_to=START + timedelta(days=200),
+        expiration_date_to=START + timedelta(days=400),
+    ),
+    PolicyFilter(policyholder_id_number="ID-7"),
+    PolicyFilter(policyholder_id_number="nobody"),
+]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("policy_filter", FILTERS)
+async def test_pages_follow_filter_and_order(storage, policy_filter):
+    expected = _expected(storage, policy_filter)
+    numbers, page = [], 1
+    while True:
+        result = await storage.get_policies_filtered_with_pagination(
+            policy_filter, page=page, page_size=25
+        )
+        assert result.total_count == len(expected)
+        numbers += [policy.policy_number for policy in result.policies]
+        if result.next_cursor is None:
+            break
+        page += 1
+    assert numbers == expected
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("policy_filter", FILTERS[:4])
+async def test_cursors_walk_forth_and_back(storage, policy_filter):
+    expected = _expected(storage, policy_filter)
+    pages, cursor = [], None
+    while True:
+        result = await storage.get_policies_filtered_with_pagination(
+            policy_filter,
+            page=1,
+            page_size=40,
+            cursor=cursor and PageCursor.decode(cursor),
+            include_total=TotalCountMode.NONE,
+        )
+        assert result.total_count is None
+        pages.append([policy.policy_number for policy in result.policies])
+        if result.next_cursor is None:
+            break
+        cursor = result.next_cursor
+    assert sum(pages, []) == expected
+    # back from the last page to the first
+    for previous in reversed(pages[:-1]):
+        result = await storage.get_policies_filtered_with_pagination(
+            policy_filter,
+            page=1,
+            page_size=40,
+            cursor=PageCursor.decode(result.prev_cursor),
+        )
+        assert [policy.policy_number for policy in result.policies] == previous
+    assert result.prev_cursor is None
+
+
+@pytest.mark.anyio
+async def test_version_and_stream(storage):
+    policy_filter = FILTERS[2]
+    expected = _expected(storage, policy_filter)
+    newest, count = await storage.get_policies_version(policy_filter)
+    assert count == len(expected)
+    streamed = [p async for p in storage.stream_policies(policy_filter)]
+    assert [policy.policy_number for policy in streamed] == expected
+    assert newest == streamed[0].created_at
+    page = await storage.get_policies_filtered_with_pagination(
+        policy_filter, page=2, page_size=2
+    )
+    assert page.version == (newest, count)
+
+
+@pytest.mark.anyio
+async def test_single_creates_keep_the_indexes_sorted():
+    storage = InMemoryPolicyStorage()
+    policies = _policies(60)
+    random.Random(3).shuffle(policies)  # noqa S311
+    await storage.bulk_create_insurance_policies(policies[:20])
+    for policy in policies[20:]:
+        await storage.create_insurance_policy(policy)
+    for index in (storage._by_created, storage._by_effective, storage._by_expiration):
+        assert index.keys == sorted(index.keys)
+    policy_filter = PolicyFilter(effective_date_from=START + timedelta(days=100))
+    page = await storage.get_policies_filtered_with_pagination(
+        policy_filter, page=1, page_size=60
+    )
+    assert [p.policy_number for p in page.policies] == _expected(storage, policy_filter)
+
+
+@pytest.mark.anyio
+async def test_writes_conflict_on_taken_numbers(storage):
+    policy = _sample()[0]
+    with pytest.raises(IntegrityError):
+        await storage.create_insurance_policy(policy)
+    fresh = policy.model_copy(update={"policy_number": "NEW-1"})
+    statuses = await storage.bulk_create_insurance_policies([fresh, fresh, policy])
+    assert statuses == [
+        BulkItemStatus.CREATED,
+        BulkItemStatus.CONFLICT,
+        BulkItemStatus.CONFLICT,
+    ]
+    serialized = await storage.get_single_policy_json("NEW-1", {"status"})
+    assert serialized.body == b'{"status":"%s"}' % policy.status.encode()
+
+
+@pytest.mark.anyio
+async def test_known_policyholder_is_reused(storage):
+    page = await storage.get_policies_filtered_with_pagination(
+        PolicyFilter(policyholder_id_number="ID-0"), page=1, page_size=1
+    )
+    policy = PolicyFactory.build(
+        policy_number="NEW-2",
+        effective_date=START,
+        expiration_date=START + timedelta(days=1),
+        premium=PremiumFactory.build(amount=100.0),
+    )
+    policy.policyholder.id_number = "ID-0"
+    await storage.create_insurance_policy(policy)
+    [stored] = [
+        p async for p in storage.stream_policies(PolicyFilter(policy_number="NEW-2"))
+    ]
+    assert stored.policyholder == page.policies[0].policyholder
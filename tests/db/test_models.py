@@ -0,0 +1,95 @@
+import random
+from datetime import (
+    datetime,
+    timedelta,
+)
+from uuid import uuid4
+
+import pytest
+
+from app.db.models.policy_dbo import PolicyDBO
+from app.models.coverage import Coverage
+from app.models.enums import ReadPath
+from app.models.policy_filter import PolicyFilter
+from tests.factories import (
+    PolicyFactory,
+    PremiumFactory,
+)
+
+
+def test_policy_dbo_round_trips_coverages():
+    coverages = [
+        Coverage(type="liability", description="d", limit=10.0, deductible=1.0),
+        Coverage(type="collision", description="d", limit=5.0, deductible=0.5),
+    ]
+    policy = PolicyFactory.build(
+        effective_date=datetime.now(),
+        expiration_date=datetime.now() + timedelta(days=30),
+        premium=PremiumFactory.build(amount=100.0),
+        coverages=coverages,
+    )
+    policy_dbo = PolicyDBO.from_model(policy)
+    assert [coverage.type for coverage in policy_dbo.coverages] == [
+        "liability",
+        "collision",
+    ]
+    assert [coverage.position for coverage in policy_dbo.coverages] == [0, 1]
+    assert policy_dbo.to_model().coverages == coverages
+
+
+@pytest.mark.online
+@pytest.mark.anyio
+@pytest.mark.parametrize("read_path", list(ReadPath))
+async def test_coverages_are_read_in_the_order_they_were_given(
+    online_db_api, read_path
+):
+    coverages = [
+        Coverage(type=f"type-{i}", description="d", limit=10.0, deductible=1.0)
+        for i in range(10)
+    ]
+    random.Random(7).shuffle(coverages)  # noqa S311
+    policy = PolicyFactory.build(
+        policy_number="ORDERED-1",
+        effective_date=datetime.now(),
+        expiration_date=datetime.now() + timedelta(days=30),
+        premium=PremiumFactory.build(amount=100.0),
+        coverages=coverages,
+    )
+    await online_db_api.create_insurance_policy(policy)
+    stored = await online_db_api.get_single_policy_by_number("ORDERED-1")
+    assert stored.to_model().coverages == coverages
+    page = await online_db_api.get_policies_filtered_with_pagination(
+        PolicyFilter(policy_number="ORDERED-1"),
+        page=1,
+        page_size=1,
+        read_path=read_path,
+    )
+    assert page.policies[0].coverages == coverages
+
+
+def test_policy_dbo_reuses_given_policyholder():
+    policy = PolicyFactory.build(
+        effective_date=datetime.now(),
+        expiration_date=datetime.now() + timedelta(days=30),
+        premium=PremiumFactory.build(amount=100.0),
+    )
+    policyholder_id = uuid4()
+    policy_dbo = PolicyDBO.from_model(policy, policyholder_id)
+    assert policy_dbo.policyholder_id == policyholder_id
+    assert policy_dbo.policyholder is None
+
+
+def test_policy_dbo_construct_model_serializes_like_to_model():
+    policy = PolicyFactory.build(
+        effective_date=datetime.now(),
+        expiration_date=datetime.now() + timedelta(days=30),
+        premium=PremiumFactory.build(amount=100.0),
+        coverages=[
+            Coverage(type="liability", description="d", limit=10.0, deductible=1.0)
+        ],
+    )
+    policy_dbo = PolicyDBO.from_model(policy)
+    assert (
+        policy_dbo.construct_model().model_dump_json()
+        == policy_dbo.to_model().model_dump_json()
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.db.pagination import PageCursor
+
+
+def test_page_cursor_round_trip():
+    page_cursor = PageCursor(created_at=datetime.now(), id=uuid4())
+    token = page_cursor.encode()
+    assert "=" not in token
+    assert PageCursor.decode(token) == page_cursor
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "eyJmb28iOiAxfQ"])
+def test_page_cursor_decode_rejects_garbage(token):
+    with pytest.raises(ValueError):
+        PageCursor.decode(token)
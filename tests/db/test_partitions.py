@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import (
+    DBAPIError,
+    IntegrityError,
+)
+
+from app.db.async_db_api import AsyncDBApi
+from app.models.enums import BulkItemStatus
+from tests.factories import (
+    CoverageFactory,
+    PolicyFactory,
+    PremiumFactory,
+)
+
+pytestmark = pytest.mark.online
+
+
+def _policy(policy_number: str, expiration_year: int):
+    return PolicyFactory.build(
+        policy_number=policy_number,
+        effective_date=datetime(expiration_year - 1, 6, 1),
+        expiration_date=datetime(expiration_year, 6, 1),
+        premium=PremiumFactory.build(amount=100.0),
+        coverages=CoverageFactory.batch(2),
+    )
+
+
+async def _scalar(db_api: AsyncDBApi, statement: str):
+    async with db_api.get_engine().connect() as conn:
+        return (await conn.execute(text(statement))).scalar()
+
+
+@pytest.mark.anyio
+async def test_dropping_a_year_purges_its_keys_premiums_and_coverages(online_db_api):
+    statuses = await online_db_api.bulk_create_insurance_policies(
+        [_policy("DROP-1", 2040), _policy("DROP-2", 2040), _policy("KEEP-1", 2041)]
+    )
+    assert statuses == [BulkItemStatus.CREATED] * 3
+    async with online_db_api.schema_lock() as conn:
+        # the years' rows went to the default partition, they move to their own
+        created = await online_db_api.ensure_policy_partitions(conn, 0)
+    assert {"policy_y2040", "policy_y2041"} <= set(created)
+
+    async with online_db_api.get_engine().connect() as conn:
+        with pytest.raises(DBAPIError, match="detach it first"):
+            await conn.execute(text("SELECT policy_purge_detached('policy_y2040')"))
+        await conn.rollback()
+        await conn.execute(text("ALTER TABLE policy DETACH PARTITION policy_y2040"))
+        purged = await conn.execute(
+            text("SELECT policy_purge_detached('policy_y2040')")
+        )
+        assert purged.scalar() == 2
+        await conn.execute(text("DROP TABLE policy_y2040"))
+        await conn.commit()
+
+    assert await _scalar(online_db_api, "SELECT count(*) FROM policy_key") == 1
+    assert await _scalar(online_db_api, "SELECT count(*) FROM premium") == 1
+    assert await _scalar(online_db_api, "SELECT count(*) FROM coverage") == 2
+    assert await online_db_api.get_single_policy_by_number("DROP-1") is None
+    assert (await online_db_api.get_single_policy_by_number("KEEP-1")).coverages
+    # the dropped year's numbers are free again
+    statuses = await online_db_api.bulk_create_insurance_policies(
+        [_policy("DROP-1", 2041)]
+    )
+    assert statuses == [BulkItemStatus.CREATED]
+
+
+@pytest.mark.anyio
+async def test_expiration_may_not_precede_the_effective_date(online_db_api):
+    await online_db_api.bulk_create_insurance_policies([_policy("CHECKED-1", 2041)])
+    async with online_db_api.get_engine().connect() as conn:
+        with pytest.raises(
+            IntegrityError, match="ck_policy_expiration_after_effective"
+        ):
+            await conn.execute(
+                text(
+                    "UPDATE policy SET effective_date = expiration_date + interval '1 day'"
+                )
+            )
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.policy_queries import (
+    PolicyQueries,
+    PolicyQueryKind,
+)
+from app.models.enums import (
+    PolicyStatus,
+    ReadPath,
+)
+from app.models.policy_filter import PolicyFilter
+
+
+def test_same_filters_share_a_statement():
+    queries = PolicyQueries()
+    stmt, params = queries.statement(
+        PolicyQueryKind.PAGE,
+        PolicyFilter(policy_number="12", policy_status=PolicyStatus.ACTIVE),
+    )
+    other_stmt, other_params = queries.statement(
+        PolicyQueryKind.PAGE,
+        PolicyFilter(policy_number="34", policy_status=PolicyStatus.EXPIRED),
+    )
+    assert other_stmt is stmt
+    assert params == {"policy_number": "%12%", "policy_status": PolicyStatus.ACTIVE}
+    assert other_params["policy_number"] == "%34%"
+    assert queries.stats()["statement_cache"] == {"hits": 1, "misses": 1}
+
+
+def test_policy_number_wildcards_match_literally():
+    _, params = PolicyQueries().statement(
+        PolicyQueryKind.PAGE, PolicyFilter(policy_number="A_1%\\")
+    )
+    assert params["policy_number"] == "%A\\_1\\%\\\\%"
+
+
+def test_shape_follows_present_filters():
+    queries = PolicyQueries()
+    stmt, _ = queries.statement(PolicyQueryKind.COUNT, PolicyFilter())
+    ranged, _ = queries.statement(
+        PolicyQueryKind.COUNT, PolicyFilter(effective_date_from=datetime.now())
+    )
+    assert ranged is not stmt
+    sql = str(ranged.compile(dialect=postgresql.dialect()))
+    assert "policy.effective_date >= %(effective_date_from)s" in sql
+    # prunes the partitions of policies expired before
+    assert "policy.expiration_date >= %(effective_date_from)s" in sql
+    assert queries.stats()["shapes"] == 2
+
+
+def test_projection_skips_unrequested_joins():
+    stmt, _ = PolicyQueries().statement(
+        PolicyQueryKind.PAGE, PolicyFilter(), fields={"policy_number", "premium"}
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "premium" in sql
+    assert "person" not in sql
+    assert "policy.notes" not in sql
+
+
+def test_read_path_is_part_of_the_shape():
+    queries = PolicyQueries()
+    orm, _ = queries.statement(PolicyQueryKind.PAGE, PolicyFilter())
+    core, _ = queries.statement(
+        PolicyQueryKind.PAGE, PolicyFilter(), read_path=ReadPath.CORE
+    )
+    assert core is not orm
+    assert "AS address_street" in str(core.compile(dialect=postgresql.dialect()))
+    assert queries.stats()["shapes"] == 2
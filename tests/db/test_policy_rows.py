@@ -0,0 +1,80 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.models.policy_dbo import PolicyDBO
+from app.db.policy_rows import (
+    core_select,
+    policy_from_row,
+)
+from app.models.coverage import Coverage
+from tests.factories import (
+    PolicyFactory,
+    PremiumFactory,
+)
+
+
+def _row(policy_dbo: PolicyDBO) -> SimpleNamespace:
+    """core_select row of a policy, as the database would return it."""
+    holder, address, premium = (
+        policy_dbo.policyholder,
+        policy_dbo.policyholder.address,
+        policy_dbo.premium,
+    )
+    return SimpleNamespace(
+        id=uuid4(),
+        created_at=policy_dbo.created_at,
+        policy_number=policy_dbo.policy_number,
+        type=policy_dbo.type,
+        status=policy_dbo.status,
+        effective_date=policy_dbo.effective_date,
+        expiration_date=policy_dbo.expiration_date,
+        notes=policy_dbo.notes,
+        id_number=holder.id_number,
+        first_name=holder.first_name,
+        last_name=holder.last_name,
+        date_of_birth=holder.date_of_birth,
+        email=holder.email,
+        phone=holder.phone,
+        address_street=address.street,
+        address_city=address.city,
+        address_state=address.state,
+        address_zip_code=address.zip_code,
+        address_country=address.country,
+        premium_amount=premium.amount,
+        premium_frequency=premium.frequency,
+        premium_method=premium.method,
+        premium_next_payment_date=premium.next_payment_date,
+    )
+
+
+def test_policy_from_row_serializes_like_to_model():
+    coverages = [
+        Coverage(type="liability", description="d", limit=10.0, deductible=1.0)
+    ]
+    policy = PolicyFactory.build(
+        effective_date=datetime.now(),
+        expiration_date=datetime.now() + timedelta(days=30),
+        premium=PremiumFactory.build(amount=100.0),
+        coverages=coverages,
+    )
+    policy_dbo = PolicyDBO.from_model(policy)
+    assert (
+        policy_from_row(_row(policy_dbo), coverages=coverages).model_dump_json()
+        == policy_dbo.to_model().model_dump_json()
+    )
+
+
+def test_core_select_joins_only_requested_relationships():
+    sql = str(
+        core_select({"policy_number", "premium"}).compile(dialect=postgresql.dialect())
+    )
+    assert "premium.amount AS premium_amount" in sql
+    assert "policy.created_at" in sql
+    assert "person" not in sql
+    assert "policy.notes" not in sql
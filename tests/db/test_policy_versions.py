@@ -0,0 +1,65 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pytest
+
+from app.db.pagination import PageCursor
+from app.models.enums import (
+    ReadPath,
+    TotalCountMode,
+)
+from app.models.policy_filter import PolicyFilter
+from tests.factories import (
+    CoverageFactory,
+    PolicyFactory,
+    PremiumFactory,
+)
+
+pytestmark = pytest.mark.online
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("read_path", list(ReadPath))
+async def test_pages_carry_the_version_of_the_filtered_policies(
+    online_db_api, read_path
+):
+    start = datetime(2030, 1, 1)
+    policies = [
+        PolicyFactory.build(
+            policy_number=f"VERSION-{i}",
+            created_at=start + timedelta(minutes=i),
+            effective_date=start,
+            expiration_date=start + timedelta(days=365),
+            premium=PremiumFactory.build(amount=100.0),
+            coverages=CoverageFactory.batch(1),
+        )
+        for i in range(5)
+    ]
+    await online_db_api.bulk_create_insurance_policies(policies)
+    policy_filter = PolicyFilter(policy_number="VERSION-")
+    version = await online_db_api.get_policies_version(policy_filter)
+    assert version == (policies[-1].created_at, 5)
+
+    first = await online_db_api.get_policies_filtered_with_pagination(
+        policy_filter, page=1, page_size=2, read_path=read_path
+    )
+    assert first.version == version
+    after = await online_db_api.get_policies_filtered_with_pagination(
+        policy_filter,
+        page=1,
+        page_size=2,
+        cursor=PageCursor.decode(first.next_cursor),
+        read_path=read_path,
+    )
+    assert after.version == version
+    assert after.total_count == 5
+    estimated = await online_db_api.get_policies_filtered_with_pagination(
+        policy_filter,
+        page=1,
+        page_size=2,
+        include_total=TotalCountMode.ESTIMATED,
+        read_path=read_path,
+    )
+    assert estimated.version is None
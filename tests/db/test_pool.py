@@ -0,0 +1,27 @@
+import pytest
+
+from app.db.pool import worker_pool_limits
+
+
+def test_pool_limits_unchanged_without_budget():
+    assert worker_pool_limits(5, 10, workers=4, connection_budget=None) == (5, 10)
+
+
+def test_pool_limits_split_budget_between_workers():
+    assert worker_pool_limits(5, 10, workers=4, connection_budget=40) == (5, 5)
+    assert worker_pool_limits(5, 10, workers=4, connection_budget=20, reserved=1) == (
+        4,
+        0,
+    )
+    assert worker_pool_limits(5, 10, workers=4, connection_budget=8, reserved=1) == (
+        1,
+        0,
+    )
+
+
+def test_pool_limits_never_exceed_the_share():
+    # a pooled connection and the reserved one need a share of two
+    with pytest.raises(ValueError):
+        worker_pool_limits(5, 10, workers=4, connection_budget=4, reserved=1)
+    with pytest.raises(ValueError):
+        worker_pool_limits(5, 10, workers=8, connection_budget=4)
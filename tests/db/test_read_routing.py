@@ -0,0 +1,50 @@
+import pytest
+
+from app.db.async_db_api import (
+    READ_FROM_PRIMARY,
+    AsyncDBApi,
+)
+
+
+@pytest.fixture
+async def db_api():
+    # nothing listens on these ports, so the replicas start out unhealthy
+    db_api = AsyncDBApi(
+        db_server="127.0.0.1:1",
+        database="postgres",
+        user_name="postgres",
+        password="postgres",  # noqa S106
+        replica_servers=["127.0.0.1:2", "127.0.0.1:3"],
+        replica_health_check_interval=60,
+    )
+    await db_api.connect()
+    yield db_api
+    await db_api.close()
+
+
+@pytest.mark.anyio
+async def test_reads_fall_back_to_primary(db_api):
+    assert not any(replica.healthy for replica in db_api._replicas)
+    assert db_api._read_session().bind is db_api.get_engine()
+
+
+@pytest.mark.anyio
+async def test_reads_round_robin_healthy_replicas(db_api):
+    first, second = db_api._replicas
+    first.healthy = second.healthy = True
+    binds = [db_api._read_session().bind for _ in range(4)]
+    assert binds.count(first.engine) == binds.count(second.engine) == 2
+
+    second.healthy = False
+    assert {db_api._read_session().bind for _ in range(3)} == {first.engine}
+
+
+@pytest.mark.anyio
+async def test_read_your_writes_uses_primary(db_api):
+    for replica in db_api._replicas:
+        replica.healthy = True
+    token = READ_FROM_PRIMARY.set(True)
+    try:
+        assert db_api._read_session().bind is db_api.get_engine()
+    finally:
+        READ_FROM_PRIMARY.reset(token)
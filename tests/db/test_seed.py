@@ -0,0 +1,90 @@
+import json
+from collections import Counter
+
+from app.db.models.premium_dbo import payment_date
+from app.db.seed import (
+    COVERAGE_COLUMNS,
+    PERSON_COLUMNS,
+    POLICY_COLUMNS,
+    PREMIUM_COLUMNS,
+    expiration_years,
+    generate_chunk,
+)
+from app.models.policy import Policy
+
+
+def _policies(chunk) -> list[Policy]:
+    """Chunk records as validated policies."""
+    persons = {row[0]: dict(zip(PERSON_COLUMNS, row)) for row in chunk.person}
+    for row in chunk.address:
+        street, city, state, zip_code, country, person_id = row[1:]
+        persons[person_id]["address"] = {
+            "street": street,
+            "city": city,
+            "state": state,
+            "zip_code": zip_code,
+            "country": country,
+        }
+    premiums = {row[-1]: dict(zip(PREMIUM_COLUMNS, row)) for row in chunk.premium}
+    coverages = {}
+    for row in chunk.coverage:
+        coverages.setdefault(row[-1], []).append(dict(zip(COVERAGE_COLUMNS, row)))
+    policies = []
+    for row in chunk.policy:
+        policy = dict(zip(POLICY_COLUMNS, row))
+        premium = premiums.get(policy["id"])
+        if premium:
+            premium["next_payment_date"] = payment_date(premium["next_payment_date"])
+        policies.append(
+            Policy.model_validate(
+                {
+                    **policy,
+                    "policyholder": persons[policy["policyholder_id"]],
+                    "premium": premium,
+                    "coverages": [
+                        {**coverage, "exclusions": json.loads(coverage["exclusions"])}
+                        for coverage in coverages.get(policy["id"], [])
+                    ],
+                }
+            )
+        )
+    return policies
+
+
+def test_chunks_are_deterministic():
+    assert generate_chunk(7, 3, 500, 10000) == generate_chunk(7, 3, 500, 10000)
+    assert generate_chunk(7, 3, 500, 10000) != generate_chunk(8, 3, 500, 10000)
+
+
+def test_chunks_cover_their_policy_range():
+    first, last = generate_chunk(1, 0, 500, 1200), generate_chunk(1, 2, 500, 1200)
+    assert [row[1][4:13] for row in first.policy] == [
+        f"{index:09d}" for index in range(500)
+    ]
+    assert len(last.policy) == 200
+    assert last.policy[0][1].startswith("POL-000001000-")
+    # holders are never shared between chunks
+    assert not {row[1] for row in first.person} & {row[1] for row in last.person}
+
+
+def test_chunk_records_are_valid_policies():
+    chunk = generate_chunk(1, 0, 300, 300)
+    policies = _policies(chunk)
+    assert len(policies) == 300
+    assert len({policy.policy_number for policy in policies}) == 300
+    assert all(policy.coverages for policy in policies)
+
+
+def test_policies_per_holder_are_skewed():
+    chunk = generate_chunk(1, 0, 5000, 5000)
+    per_holder = Counter(row[7] for row in chunk.policy)
+    assert len(per_holder) == len(chunk.person)
+    counts = Counter(per_holder.values())
+    assert counts[1] > len(per_holder) / 2
+    assert max(per_holder.values()) >= 20
+
+
+def test_expirations_fall_in_the_partitioned_years():
+    chunk = generate_chunk(1, 0, 5000, 5000)
+    years = {row[POLICY_COLUMNS.index("expiration_date")].year for row in chunk.policy}
+    assert years <= set(expiration_years())
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from app.db.slow_queries import (
+    SlowQueryLog,
+    redact_parameters,
+    redact_plan,
+)
+
+PAGE = "SELECT policy.id FROM policy WHERE policy.status = $1 LIMIT $2"
+
+
+def test_redact_parameters():
+    assert redact_parameters(("ACTIVE", 10)) == "(str, int)"
+    assert redact_parameters([("a", 1), ("b", 2)]) == "2 x (str, int)"
+    assert redact_parameters({"id": datetime(2024, 1, 1)}) == "{id: datetime}"
+    assert redact_parameters(()) == "()"
+
+
+def test_redact_plan():
+    plan = {
+        "Node Type": "Seq Scan",
+        "Filter": "((policy_number ~~ '%12%'::text) AND (notes = 'it''s'::text))",
+        "Plans": [{"Index Cond": "(id = 'abc'::uuid)", "Actual Rows": 3}],
+    }
+    assert redact_plan(plan) == {
+        "Node Type": "Seq Scan",
+        "Filter": "((policy_number ~~ '?'::text) AND (notes = '?'::text))",
+        "Plans": [{"Index Cond": "(id = '?'::uuid)", "Actual Rows": 3}],
+    }
+
+
+def test_record_keeps_statements_per_shape_slowest_first():
+    log = SlowQueryLog(threshold=0.1, explain_sample_rate=1.0)
+    assert log.record("orm:page:policy_status", PAGE, ("ACTIVE", 10), 0.2)
+    log.record("orm:page:policy_status", PAGE, ("EXPIRED", 10), 0.4)
+    log.record(None, "SELECT person.id FROM person WHERE id = $1", ("x",), 0.3)
+    top = log.top(10)
+    assert [(s["shape"], s["count"]) for s in top] == [
+        ("orm:page:policy_status", 2),
+        ("select person", 1),
+    ]
+    assert top[0]["max_seconds"] == 0.4
+    assert top[0]["parameters"] == "(str, int)"
+    assert log.top(1) == top[:1]
+
+
+def test_record_explains_sampled_reads_of_own_tables_only():
+    log = SlowQueryLog(threshold=0.1, explain_sample_rate=1.0)
+    assert not log.record(None, "INSERT INTO policy (id) VALUES ($1)", ("x",), 1.0)
+    assert not log.record(None, "SELECT pg_advisory_lock($1)", (1,), 1.0)
+    assert not SlowQueryLog(0.1, explain_sample_rate=0.0).record(None, PAGE, (), 1.0)
+
+
+def test_record_evicts_the_fastest_statement_when_full():
+    log = SlowQueryLog(threshold=0.1, max_statements=2)
+    log.record("a", PAGE, (), 0.5)
+    log.record("b", PAGE, (), 0.2)
+    log.record("c", PAGE, (), 0.3)
+    log.record("d", PAGE, (), 0.1)
+    assert [s["shape"] for s in log.top(10)] == ["a", "c"]
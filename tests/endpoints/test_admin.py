@@ -0,0 +1,87 @@
+import pytest
+
+from app.api import deps
+from app.core.config import settings
+from app.schemas.status import SlowQueriesStatus
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "test-admin-token")
+    return "test-admin-token"
+
+
+@pytest.mark.anyio
+async def test_slow_queries(api_base_url, client, admin_token):
+    response = await client.get(
+        f"{api_base_url}/admin/slow-queries",
+        params={"limit": 5},
+        headers={"X-Admin-Token": admin_token},
+    )
+    assert response.status_code == 200
+    slow_queries = SlowQueriesStatus(**response.json())
+    assert slow_queries.statements[0].shape == "orm:page_counted:policy_status"
+    assert slow_queries.statements[0].plan["Plan"]["Node Type"] == "Limit"
+
+
+@pytest.mark.anyio
+async def test_slow_queries_require_admin_token(api_base_url, client, admin_token):
+    response = await client.get(
+        f"{api_base_url}/admin/slow-queries", headers={"X-Admin-Token": "wrong"}
+    )
+    assert response.status_code == 403
+    response = await client.get(f"{api_base_url}/admin/slow-queries")
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_admin_endpoints_disabled_without_token(api_base_url, client):
+    assert settings.ADMIN_TOKEN is None
+    response = await client.get(
+        f"{api_base_url}/admin/slow-queries", headers={"X-Admin-Token": ""}
+    )
+    assert response.status_code == 403
+
+
+@pytest.fixture
+def profile_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(deps.profile_store, "directory", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_profile_on_demand(api_base_url, client, admin_token, profile_dir):
+    response = await client.get(
+        f"{api_base_url}/policies", headers={"X-Profile": admin_token}
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    headers = {"X-Admin-Token": admin_token}
+    response = await client.get(f"{api_base_url}/admin/profiles", headers=headers)
+    assert [profile["id"] for profile in response.json()] == [profile_id]
+    response = await client.get(
+        f"{api_base_url}/admin/profiles/{profile_id}", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.text == (profile_dir / f"{profile_id}.folded").read_text()
+
+
+@pytest.mark.anyio
+async def test_profile_requires_admin_token(
+    api_base_url, client, admin_token, profile_dir
+):
+    response = await client.get(f"{api_base_url}/policies", headers={"X-Profile": "x"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert not list(profile_dir.iterdir())
+
+
+@pytest.mark.anyio
+async def test_unknown_profile(api_base_url, client, admin_token, profile_dir):
+    for profile_id in ("20260101-000000-1-00000000", "..%2Fsecrets"):
+        response = await client.get(
+            f"{api_base_url}/admin/profiles/{profile_id}",
+            headers={"X-Admin-Token": admin_token},
+        )
+        assert response.status_code == 404
@@ -1,12 +1,30 @@
+import csv
+import io
 from datetime import (
     datetime,
     timedelta,
 )
+from unittest.mock import AsyncMock
+from uuid import uuid4
 
 import pytest
+from sqlalchemy.exc import DBAPIError
 
+from app.db.async_db_api import READ_FROM_PRIMARY
+from app.db.pagination import (
+    PageCursor,
+    PolicyPage,
+    PolicyVersion,
+)
+from app.models.enums import (
+    BulkItemStatus,
+    TotalCountMode,
+)
 from app.models.policy import Policy
-from app.schemas.policy import FilteredPoliciesResponse
+from app.schemas.policy import (
+    BulkPoliciesResponse,
+    FilteredPoliciesResponse,
+)
 from tests.factories import (
     PolicyFactory,
     PremiumFactory,
@@ -22,6 +40,82 @@ async def test_get_all_policies(api_base_url, client):
     assert isinstance(rsp_model_instance, FilteredPoliciesResponse)
 
 
+@pytest.mark.anyio
+async def test_get_policies_with_cursor(api_base_url, client, async_db_api_mock):
+    page_cursor = PageCursor(created_at=datetime.now(), id=uuid4(), backward=True)
+    response = await client.get(
+        f"{api_base_url}/policies", params={"cursor": page_cursor.encode()}
+    )
+    assert response.status_code == 200
+    call = async_db_api_mock.get_policies_filtered_with_pagination.await_args
+    assert call.kwargs["cursor"] == page_cursor
+
+
+@pytest.mark.anyio
+async def test_get_policies_with_invalid_cursor(api_base_url, client):
+    response = await client.get(f"{api_base_url}/policies", params={"cursor": "nope"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("include_total", list(TotalCountMode))
+async def test_get_policies_include_total(
+    api_base_url, client, async_db_api_mock, include_total
+):
+    response = await client.get(
+        f"{api_base_url}/policies", params={"include-total": include_total}
+    )
+    assert response.status_code == 200
+    call = async_db_api_mock.get_policies_filtered_with_pagination.await_args
+    assert call.kwargs["include_total"] == include_total
+
+
+@pytest.mark.anyio
+async def test_get_policies_fields(api_base_url, client, async_db_api_mock):
+    response = await client.get(
+        f"{api_base_url}/policies", params={"fields": "policy_number, status"}
+    )
+    assert response.status_code == 200
+    assert [set(policy) for policy in response.json()["policies"]] == [
+        {"policy_number", "status"}
+    ]
+    call = async_db_api_mock.get_policies_filtered_with_pagination.await_args
+    assert call.kwargs["fields"] == {"policy_number", "status"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fields", ["", "policy_number,password"])
+async def test_get_policies_invalid_fields(api_base_url, client, fields):
+    response = await client.get(f"{api_base_url}/policies", params={"fields": fields})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_export_policies_ndjson(api_base_url, client, async_db_api_mock):
+    response = await client.get(
+        f"{api_base_url}/policies/export", params={"policy-status": "ACTIVE"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert isinstance(Policy.model_validate_json(lines[0]), Policy)
+    policy_filter = async_db_api_mock.stream_policies.call_args.args[0]
+    assert policy_filter.policy_status == "ACTIVE"
+
+
+@pytest.mark.anyio
+async def test_export_policies_csv(api_base_url, client, policy_number):
+    response = await client.get(
+        f"{api_base_url}/policies/export", params={"format": "csv"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["policy_number"] for row in rows] == [policy_number]
+    assert rows[0]["policyholder.address.city"]
+
+
 @pytest.mark.anyio
 async def test_get_single_policy(api_base_url, client, policy_number):
     response = await client.get(f"{api_base_url}/policies/{policy_number}")
@@ -31,6 +125,92 @@ async def test_get_single_policy(api_base_url, client, policy_number):
     assert isinstance(rsp_model_instance, Policy)
 
 
+@pytest.mark.anyio
+async def test_get_single_policy_not_modified(api_base_url, client, policy_number):
+    response = await client.get(f"{api_base_url}/policies/{policy_number}")
+    etag = response.headers["etag"]
+    response = await client.get(
+        f"{api_base_url}/policies/{policy_number}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_the_primary_only_when_asked(
+    api_base_url, client, async_db_api_mock, mocker
+):
+    read_from_primary = []
+
+    async def read_page(*args, **kwargs):
+        read_from_primary.append(READ_FROM_PRIMARY.get())
+        return PolicyPage(policies=[], total_count=0)
+
+    mocker.patch.object(
+        async_db_api_mock,
+        "get_policies_filtered_with_pagination",
+        AsyncMock(side_effect=read_page),
+    )
+    payload = PolicyFactory.build(
+        expiration_date=datetime.now() + timedelta(days=30),
+        effective_date=datetime.now(),
+        premium=PremiumFactory.build(amount=100.0),
+    )
+    await client.post(f"{api_base_url}/policies", content=payload.model_dump_json())
+    await client.get(f"{api_base_url}/policies")
+    await client.get(f"{api_base_url}/policies", headers={"X-Read-Your-Writes": "true"})
+    assert read_from_primary == [False, True]
+
+
+@pytest.mark.anyio
+async def test_get_policies_not_modified(
+    api_base_url, client, async_db_api_mock, mocker
+):
+    params = {"page-size": 5}
+    read_page = async_db_api_mock.get_policies_filtered_with_pagination
+    response = await client.get(f"{api_base_url}/policies", params=params)
+    etag = response.headers["etag"]
+    reads = read_page.await_count
+    response = await client.get(
+        f"{api_base_url}/policies", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    # revalidated by the version alone, the page is not read
+    assert read_page.await_count == reads
+    # another page of the same policies is another entity
+    other = await client.get(
+        f"{api_base_url}/policies",
+        params={"page-size": 5, "page": 2},
+        headers={"If-None-Match": etag},
+    )
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+    # a policy created since changes the version of the filtered policies
+    version = PolicyVersion(datetime.now(), 2)
+    mocker.patch.object(
+        async_db_api_mock,
+        "get_policies_filtered_with_pagination",
+        AsyncMock(return_value=PolicyPage([], 2, version=version)),
+    )
+    mocker.patch.object(
+        async_db_api_mock, "get_policies_version", AsyncMock(return_value=version)
+    )
+    changed = await client.get(
+        f"{api_base_url}/policies", params=params, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    # tagged alike whether or not the page was read along with its version
+    async_db_api_mock.get_policies_filtered_with_pagination.return_value = PolicyPage(
+        [], 2
+    )
+    unconditional = await client.get(f"{api_base_url}/policies", params=params)
+    assert unconditional.headers["etag"] == changed.headers["etag"]
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "expiration_date, effective_date, expected",
@@ -52,3 +232,96 @@ async def test_create_policy(
         f"{api_base_url}/policies", content=payload.model_dump_json()
     )
     assert response.status_code == expected
+
+
+@pytest.mark.anyio
+async def test_create_policies_bulk(api_base_url, client):
+    policies = [
+        PolicyFactory.build(
+            expiration_date=datetime.now() + timedelta(days=30),
+            effective_date=datetime.now(),
+            premium=PremiumFactory.build(amount=100.0),
+        ).model_dump(mode="json")
+        for _ in range(3)
+    ]
+    policies[1]["expiration_date"] = policies[1]["effective_date"]
+    response = await client.post(
+        f"{api_base_url}/policies/bulk", params={"chunk-size": 1}, json=policies
+    )
+    assert response.status_code == 200
+    results = BulkPoliciesResponse(**response.json()).results
+    assert [r.index for r in results] == [0, 1, 2]
+    assert [r.status for r in results] == [
+        BulkItemStatus.CREATED,
+        BulkItemStatus.INVALID,
+        BulkItemStatus.CREATED,
+    ]
+    assert results[1].policy_number == policies[1]["policy_number"]
+    assert results[1].errors
+
+
+@pytest.mark.anyio
+async def test_create_policies_bulk_failed_chunk(
+    api_base_url, client, async_db_api_mock, mocker
+):
+    policies = [
+        PolicyFactory.build(
+            expiration_date=datetime.now() + timedelta(days=30),
+            effective_date=datetime.now(),
+            premium=PremiumFactory.build(amount=100.0),
+        ).model_dump(mode="json")
+        for _ in range(5)
+    ]
+    mocker.patch.object(
+        async_db_api_mock,
+        "bulk_create_insurance_policies",
+        AsyncMock(
+            side_effect=[
+                [BulkItemStatus.CREATED, BulkItemStatus.CONFLICT],
+                DBAPIError("INSERT", {}, ConnectionError("connection lost")),
+            ]
+        ),
+    )
+    response = await client.post(
+        f"{api_base_url}/policies/bulk", params={"chunk-size": 2}, json=policies
+    )
+    assert response.status_code == 200
+    results = BulkPoliciesResponse(**response.json()).results
+    # a result for every input, those past the failed chunk not attempted
+    assert [(r.index, r.status) for r in results] == [
+        (0, BulkItemStatus.CREATED),
+        (1, BulkItemStatus.CONFLICT),
+        (2, BulkItemStatus.ERROR),
+        (3, BulkItemStatus.ERROR),
+        (4, BulkItemStatus.SKIPPED),
+    ]
+    assert [r.policy_number for r in results] == [
+        policy["policy_number"] for policy in policies
+    ]
+    assert async_db_api_mock.bulk_create_insurance_policies.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_create_policies_bulk_ndjson(api_base_url, client):
+    lines = [
+        PolicyFactory.build(
+            expiration_date=datetime.now() + timedelta(days=30),
+            effective_date=datetime.now(),
+            premium=PremiumFactory.build(amount=100.0),
+        ).model_dump_json()
+        for _ in range(2)
+    ]
+    response = await client.post(
+        f"{api_base_url}/policies/bulk",
+        content="\n".join([lines[0], "{not json", "", lines[1]]) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created", "invalid", "created"]
+
+
+@pytest.mark.anyio
+async def test_create_policies_bulk_requires_array(api_base_url, client):
+    response = await client.post(f"{api_base_url}/policies/bulk", json={"a": 1})
+    assert response.status_code == 422
@@ -0,0 +1,57 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pytest
+
+from app.models.enums import (
+    BulkItemStatus,
+    PolicyStatus,
+)
+from tests.factories import (
+    PolicyFactory,
+    PremiumFactory,
+)
+
+
+def _payload(index: int, status: PolicyStatus) -> dict:
+    return PolicyFactory.build(
+        policy_number=f"MEM-{index:03d}",
+        status=status,
+        created_at=datetime(2025, 1, 1) + timedelta(hours=index),
+        effective_date=datetime(2025, 1, 1),
+        expiration_date=datetime(2026, 1, 1),
+        premium=PremiumFactory.build(amount=100.0),
+    ).model_dump(mode="json")
+
+
+@pytest.mark.anyio
+async def test_filter_and_page_through_stored_policies(api_base_url, memory_client):
+    policies = [
+        _payload(index, PolicyStatus.ACTIVE if index % 2 else PolicyStatus.EXPIRED)
+        for index in range(25)
+    ]
+    response = await memory_client.post(f"{api_base_url}/policies/bulk", json=policies)
+    assert {r["status"] for r in response.json()["results"]} == {BulkItemStatus.CREATED}
+    response = await memory_client.post(f"{api_base_url}/policies", json=policies[0])
+    assert response.status_code == 409
+
+    numbers, params = [], {"policy-status": "ACTIVE", "page-size": 5}
+    while True:
+        page = (
+            await memory_client.get(f"{api_base_url}/policies", params=params)
+        ).json()
+        assert page["total_count"] == 12
+        numbers += [policy["policy_number"] for policy in page["policies"]]
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert numbers == [f"MEM-{index:03d}" for index in range(23, 0, -2)]
+
+    response = await memory_client.get(
+        f"{api_base_url}/policies/MEM-003", params={"fields": "status"}
+    )
+    assert response.json() == {"status": "ACTIVE"}
+    response = await memory_client.get(f"{api_base_url}/policies/MEM-999")
+    assert response.status_code == 404
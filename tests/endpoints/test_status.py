@@ -0,0 +1,45 @@
+import pytest
+
+from app.schemas.status import (
+    DBPoolsStatus,
+    QueryCacheStatus,
+)
+
+
+@pytest.mark.anyio
+async def test_healthcheck(api_base_url, client):
+    response = await client.get(f"{api_base_url}/status")
+    assert response.status_code == 200
+    assert response.json() == {"msg": "OK"}
+
+
+@pytest.mark.anyio
+async def test_pool_status(api_base_url, client):
+    response = await client.get(f"{api_base_url}/status/pool")
+    assert response.status_code == 200
+    pools = DBPoolsStatus(**response.json())
+    assert pools.primary.checked_out == 1
+    assert pools.replicas == {}
+
+
+@pytest.mark.anyio
+async def test_query_cache_status(api_base_url, client):
+    response = await client.get(f"{api_base_url}/status/query-cache")
+    assert response.status_code == 200
+    query_cache = QueryCacheStatus(**response.json())
+    assert query_cache.statement_cache.hits == 3
+
+
+@pytest.mark.anyio
+async def test_metrics(api_base_url, client):
+    await client.get(f"{api_base_url}/status")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        f'http_requests_total{{method="GET",route="{api_base_url}/status",status="200"}}'
+        in response.text
+    )
+    assert 'db_pool_connections{engine="primary",state="checked_out"} 1' in (
+        response.text
+    )
@@ -4,6 +4,7 @@ from polyfactory.factories.sqlalchemy_factory import SQLAlchemyFactory
 from app.db.models.address_dbo import AddressDBO
 from app.db.models.person_dbo import PersonDBO
 from app.db.models.policy_dbo import PolicyDBO
+from app.models.coverage import Coverage
 from app.models.policy import Policy
 from app.models.premium import Premium
 
@@ -21,3 +22,6 @@ class PolicyFactory(ModelFactory[Policy]): ...
 
 
 class PremiumFactory(ModelFactory[Premium]): ...
+
+
+class CoverageFactory(ModelFactory[Coverage]): ...
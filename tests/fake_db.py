@@ -7,6 +7,14 @@ from unittest.mock import (
     MagicMock,
 )
 
+from app.core.etag import make_etag
+from app.core.metrics import Histogram
+from app.db.pagination import (
+    PolicyPage,
+    PolicyVersion,
+)
+from app.db.storage import SerializedPolicy
+from app.models.enums import BulkItemStatus
 from tests.factories import (
     AddressDBOFactory,
     PersonDBOFactory,
@@ -16,11 +24,20 @@ from tests.factories import (
 test_policy_number = "TestPolicy123"
 
 
+async def _stream(items):
+    for item in items:
+        yield item
+
+
 class AsyncDBApiMock:
     def __init__(self):
         self.close = AsyncMock()
         self.connect = AsyncMock()
         self.create_all = AsyncMock()
+        self.schema_lock = MagicMock()
+        self.schema_revisions = AsyncMock(return_value=set())
+        self.prewarm = AsyncMock()
+        self.ensure_policy_partitions = AsyncMock(return_value=[])
         some_policy = PolicyDBOFactory.build(
             policy_number=test_policy_number,
             created_at=datetime.now(),
@@ -32,13 +49,98 @@ class AsyncDBApiMock:
                 address=AddressDBOFactory.build(),
             ),
         )
+        some_version = PolicyVersion(some_policy.created_at, 1)
         self.get_policies_filtered_with_pagination = AsyncMock(
-            return_value=(
-                [some_policy.to_model()],
-                1,
+            return_value=PolicyPage(
+                policies=[some_policy.to_model()],
+                total_count=1,
+                version=some_version,
             )
         )
+        self.get_policies_version = AsyncMock(return_value=some_version)
         self.create_insurance_policy = AsyncMock()
+        self.bulk_create_insurance_policies = AsyncMock(
+            side_effect=lambda policies: [BulkItemStatus.CREATED] * len(policies)
+        )
+        self.stream_policies = MagicMock(
+            side_effect=lambda *args, **kwargs: _stream([some_policy.to_model()])
+        )
         self.get_all_policies = AsyncMock(return_value=[some_policy])
         self.get_single_policy_by_number = AsyncMock(return_value=some_policy)
+        some_policy_json = some_policy.to_model().model_dump_json().encode()
+        self.get_single_policy_json = AsyncMock(
+            return_value=SerializedPolicy(
+                body=some_policy_json, etag=make_etag(some_policy_json)
+            )
+        )
+        # batched lookups of the loaders, returning the keys they find
+        holder = some_policy.policyholder
+        self.get_persons_by_id_numbers = AsyncMock(
+            side_effect=lambda id_numbers: {
+                id_number: holder
+                for id_number in id_numbers
+                if id_number == holder.id_number
+            }
+        )
+        self.get_addresses_by_person_ids = AsyncMock(
+            side_effect=lambda person_ids: {
+                person_id: holder.address
+                for person_id in person_ids
+                if person_id == holder.id
+            }
+        )
+        self.get_premiums_by_policy_ids = AsyncMock(side_effect=lambda policy_ids: {})
+        self.get_coverages_by_policy_ids = AsyncMock(
+            side_effect=lambda policy_ids: {policy_id: [] for policy_id in policy_ids}
+        )
         self.get_engine = MagicMock()
+        self.pool_status = MagicMock(
+            return_value={
+                "pid": 1,
+                "primary": {
+                    "size": 5,
+                    "checked_out": 1,
+                    "idle": 2,
+                    "overflow": 0,
+                    "max_overflow": 10,
+                    "checkout_timeouts": 0,
+                    "checkout_wait_seconds": Histogram().snapshot(),
+                },
+            }
+        )
+        self.slow_queries = MagicMock(
+            return_value={
+                "pid": 1,
+                "threshold_seconds": 1.0,
+                "statements": [
+                    {
+                        "shape": "orm:page_counted:policy_status",
+                        "statement": "SELECT policy.id FROM policy WHERE status = $1",
+                        "parameters": "(str, int, int)",
+                        "count": 2,
+                        "total_seconds": 3.5,
+                        "max_seconds": 2.0,
+                        "last_seconds": 1.5,
+                        "last_seen": datetime(2025, 1, 1),
+                        "plan": {"Plan": {"Node Type": "Limit"}},
+                        "plan_captured_at": datetime(2025, 1, 1),
+                    }
+                ],
+            }
+        )
+        self.query_cache_status = MagicMock(
+            return_value={
+                "pid": 1,
+                "shapes": 1,
+                "statement_cache": {"hits": 3, "misses": 1},
+                "compiled_cache": {"hits": 3, "misses": 1},
+                "policy_cache": {
+                    "size": 1,
+                    "maxsize": 10,
+                    "hits": 2,
+                    "misses": 1,
+                    "evictions": 0,
+                    "live": True,
+                },
+            }
+        )
@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import utils
+
+
+@pytest.fixture
+def build_info_path(tmp_path, monkeypatch):
+    path = tmp_path / "build_info.json"
+    monkeypatch.setattr(utils, "BUILD_INFO_PATH", path)
+    utils.read_build_info.cache_clear()
+    yield path
+    utils.read_build_info.cache_clear()
+
+
+def test_baked_build_info_is_used(build_info_path):
+    build_info_path.write_text(
+        json.dumps({"version": "9.9.9", "alembic_heads": ["abc123"]})
+    )
+    assert utils.get_version() == "9.9.9"
+    assert utils.get_alembic_heads() == {"abc123"}
+
+
+def test_written_build_info_matches_sources(build_info_path):
+    utils.write_build_info()
+    build_info = utils.read_build_info()
+    assert build_info["version"] == utils.get_version_from_pyproject()
+    [head] = build_info["alembic_heads"]
+    assert list(Path("alembic/versions").glob(f"{head}_*.py"))